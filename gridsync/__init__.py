@@ -26,6 +26,12 @@ default_settings = {
         'provider_name': None,
         'provider_icon': None
     },
+    'tahoe': {
+        'max_concurrent_commands': None,
+        'max_concurrent_checks': None,
+        'webport': None,
+        'rootcap_layout': None
+    },
     'help': {
         'docs_url': 'docs.gridsync.io',
         'issues_url': 'https://github.com/gridsync/gridsync/issues'
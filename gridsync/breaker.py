@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+from twisted.internet import reactor
+from twisted.internet.defer import fail, maybeDeferred, TimeoutError
+
+from gridsync.errors import GridsyncError
+
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class CircuitOpenError(GridsyncError):
+    pass
+
+
+class CircuitBreaker(object):
+    # Stops calls to a service after 'threshold' consecutive failures. Once
+    # 'reset_timeout' seconds have passed, calls are allowed through again as
+    # probes; the first successful probe closes the circuit while a failed
+    # one opens it for another 'reset_timeout' seconds.
+    def __init__(self, name='breaker', threshold=3, reset_timeout=10,
+                 failure_types=(TimeoutError,), clock=None):
+        self.name = name
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failure_types = failure_types
+        self.clock = clock or reactor
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+
+    def is_open(self):
+        return self.state == OPEN
+
+    def allow_request(self):
+        if self.state == OPEN:
+            if self.clock.seconds() - self.opened_at < self.reset_timeout:
+                return False
+            logging.debug("%s: Circuit half-open; probing...", self.name)
+            self.state = HALF_OPEN
+        return True
+
+    def record_success(self):
+        self.failures = 0
+        if self.state != CLOSED:
+            logging.debug("%s: Circuit closed", self.name)
+            self.state = CLOSED
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.threshold:
+            if self.state != OPEN:
+                logging.warning("%s: Circuit opened after %i failure(s)",
+                                self.name, self.failures)
+            self.state = OPEN
+            self.opened_at = self.clock.seconds()
+
+    def _on_success(self, result):
+        self.record_success()
+        return result
+
+    def _on_failure(self, failure):
+        if failure.check(*self.failure_types):
+            self.record_failure()
+        return failure
+
+    def call(self, f, *args, **kwargs):
+        if not self.allow_request():
+            return fail(CircuitOpenError(
+                "{} is not responding".format(self.name)))
+        d = maybeDeferred(f, *args, **kwargs)
+        d.addCallbacks(self._on_success, self._on_failure)
+        return d
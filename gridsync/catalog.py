@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import sqlite3
+
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS files (
+    folder TEXT NOT NULL,
+    member TEXT NOT NULL,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    cap TEXT,
+    mtime INTEGER,
+    version INTEGER,
+    PRIMARY KEY (folder, member, path)
+);
+CREATE INDEX IF NOT EXISTS files_by_mtime ON files (folder, mtime);
+'''
+
+
+class Catalog(object):
+    # A persistent index of the remote files in every magic folder, per
+    # member, that is kept up to date from the results of remote scans so
+    # that questions like "how big is this folder?" or "what changed since
+    # T?" can be answered without walking the grid again.
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def get_files(self, folder, member):
+        cursor = self.connection.execute(
+            'SELECT path, size, cap, mtime, version FROM files '
+            'WHERE folder = ? AND member = ?', (folder, member))
+        return {row[0]: tuple(row[1:]) for row in cursor}
+
+    def update_member(self, folder, member, files):
+        # 'files' maps each of the member's paths to a (size, cap, mtime,
+        # version) tuple (see gridsync.decoder.summarize_listing); only
+        # the rows that differ from those already stored are written.
+        # Returns the lists of changed (i.e., new or modified) and removed
+        # paths.
+        current = self.get_files(folder, member)
+        changed = [p for p, entry in files.items() if current.get(p) != entry]
+        removed = [p for p in current if p not in files]
+        if not changed and not removed:
+            return changed, removed
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(folder, member, p) + tuple(files[p]) for p in changed])
+            self.connection.executemany(
+                'DELETE FROM files WHERE folder = ? AND member = ? '
+                'AND path = ?', [(folder, member, p) for p in removed])
+        logging.debug("Updated catalog for %s (%s): %i changed, %i removed",
+                      folder, member, len(changed), len(removed))
+        return changed, removed
+
+    def remove_member(self, folder, member):
+        with self.connection:
+            self.connection.execute(
+                'DELETE FROM files WHERE folder = ? AND member = ?',
+                (folder, member))
+
+    def remove_folder(self, folder):
+        with self.connection:
+            self.connection.execute(
+                'DELETE FROM files WHERE folder = ?', (folder,))
+
+    def get_members(self, folder):
+        cursor = self.connection.execute(
+            'SELECT DISTINCT member FROM files WHERE folder = ?', (folder,))
+        return [row[0] for row in cursor]
+
+    def get_total_size(self, folder):
+        cursor = self.connection.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM files WHERE folder = ?',
+            (folder,))
+        return cursor.fetchone()[0]
+
+    def get_latest_mtime(self, folder):
+        cursor = self.connection.execute(
+            'SELECT COALESCE(MAX(mtime), 0) FROM files WHERE folder = ?',
+            (folder,))
+        return cursor.fetchone()[0]
+
+    def get_member_usage(self, folder):
+        cursor = self.connection.execute(
+            'SELECT member, SUM(size) FROM files WHERE folder = ? '
+            'GROUP BY member', (folder,))
+        return dict(cursor.fetchall())
+
+    def get_changed_since(self, folder, timestamp):
+        cursor = self.connection.execute(
+            'SELECT member, path, size, mtime FROM files '
+            'WHERE folder = ? AND mtime > ? ORDER BY mtime',
+            (folder, timestamp))
+        return cursor.fetchall()
@@ -3,6 +3,7 @@
 
 import argparse
 import logging
+import multiprocessing
 import sys
 
 from twisted.internet.error import CannotListenError
@@ -10,8 +11,6 @@ from twisted.internet.error import CannotListenError
 from gridsync import APP_NAME
 from gridsync import __doc__ as description
 from gridsync._version import __version__
-from gridsync.core import Core
-from gridsync import msg
 
 
 class TahoeVersion(argparse.Action):
@@ -53,6 +52,13 @@ def main():
     #        format='%(asctime)s %(levelname)s %(funcName)s %(message)s',
     #        level=logging.INFO, filename=logfile)
 
+    # Imported here rather than at the top of this module since importing
+    # gridsync.core creates the QApplication and installs the reactor --
+    # which the decoder's worker processes (which, when frozen, re-import
+    # this module; see below) mustn't do
+    from gridsync.core import Core
+    from gridsync import msg
+
     try:
         core = Core(args)
         core.start()
@@ -64,4 +70,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Needed by the worker processes in gridsync.decoder when frozen
+    multiprocessing.freeze_support()
     sys.exit(main())
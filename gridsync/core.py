@@ -17,10 +17,12 @@ from twisted.internet import reactor
 from twisted.internet.defer import DeferredList, inlineCallbacks
 from twisted.internet.protocol import Protocol, Factory
 
-from gridsync import config_dir, resource, settings
-from gridsync import msg
+from gridsync import config_dir, resource, settings, APP_NAME
+from gridsync import decoder, msg
 from gridsync.gui import Gui
-from gridsync.tahoe import get_nodedirs, Tahoe, select_executable
+from gridsync.preferences import get_preference, set_preference
+from gridsync.tahoe import (
+    get_nodedirs, get_rootcap_layout, Tahoe, select_executable)
 
 
 app.setWindowIcon(QIcon(resource(settings['application']['tray_icon'])))
@@ -59,10 +61,35 @@ class Core(object):
 
     @inlineCallbacks
     def stop(self):
+        self.gui.main_window.save_snapshots()
         self.gui.hide()
         yield self.stop_gateways()
+        decoder.shutdown()
         logging.debug("Stopping reactor...")
 
+    @inlineCallbacks
+    def offer_subclient_migration(self, gateway):
+        subclients = gateway.get_magic_folder_subclients()
+        if not subclients:
+            return
+        if get_preference('magic_folders', 'migrate_subclients') == 'false':
+            return
+        supported = yield gateway.supports_multiple_magic_folders()
+        if not supported:
+            return
+        if msg.question(
+                None, "Migrate folders?",
+                "The installed version of Tahoe-LAFS can synchronize "
+                "multiple folders using a single process. Would you like {} "
+                "to migrate the {} folder(s) connected to {} now? This will "
+                "reduce the amount of memory and network resources needed "
+                "to keep your folders synchronized.".format(
+                    APP_NAME, len(subclients), gateway.name),
+                "\n".join(subclients)):
+            yield gateway.migrate_magic_folder_subclients()
+        else:
+            set_preference('magic_folders', 'migrate_subclients', 'false')
+
     @inlineCallbacks
     def start_gateways(self):
         nodedirs = get_nodedirs(config_dir)
@@ -72,7 +99,16 @@ class Core(object):
             for nodedir in nodedirs:
                 gateway = Tahoe(nodedir, executable=self.executable)
                 self.gateways.append(gateway)
-                gateway.start()
+                d = gateway.start()
+                d.addCallback(
+                    lambda _, g=gateway: self.offer_subclient_migration(g))
+                if get_rootcap_layout() == 'sharded':
+                    # The rootcap can't be listed until enough servers are
+                    # connected; see Tahoe.get_rootcap_shards
+                    d.addCallback(lambda _, g=gateway: g.await_ready())
+                    d.addCallback(lambda _, g=gateway: g.shard_rootcap())
+                    d.addErrback(lambda f, g=gateway: logging.warning(
+                        "Could not shard %s rootcap: %s", g.name, f.value))
             self.gui.populate(self.gateways)
         else:
             defaults = settings['default']
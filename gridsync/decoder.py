@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from twisted.internet import reactor
+from twisted.internet.defer import Deferred, maybeDeferred
+try:
+    import ijson
+except ImportError:  # Streaming is optional; see ServersSummary
+    ijson = None
+
+
+# Payloads larger than this (in bytes) are decoded in a worker process so
+# that the event loop (and, with it, the GUI) isn't blocked while they are.
+# Threads wouldn't help here since json.loads holds the GIL throughout.
+THRESHOLD = 256 * 1024
+
+_executor = None
+
+
+def get_executor():
+    global _executor  # pylint: disable=global-statement
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=2)
+    return _executor
+
+
+def shutdown():
+    global _executor  # pylint: disable=global-statement
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
+
+
+def _run_in_executor(f, *args):
+    d = Deferred()
+
+    def _fire(future):
+        try:
+            result = future.result()
+        except Exception as e:  # pylint: disable=broad-except
+            d.errback(e)
+        else:
+            d.callback(result)
+
+    future = get_executor().submit(f, *args)
+    future.add_done_callback(
+        lambda future: reactor.callFromThread(_fire, future))
+    return d
+
+
+def run(f, data):
+    # Calls f(data) in a worker process if 'data' is large, returning a
+    # Deferred either way. 'f' must be a module-level (i.e., picklable)
+    # function, as must its return value -- which should be much smaller
+    # than 'data'; unpickling a result that is about as large as 'data'
+    # (e.g., that of loads()) blocks the event loop longer than decoding
+    # 'data' inline would.
+    if len(data) > THRESHOLD:
+        logging.debug("Decoding %i bytes in a worker process...", len(data))
+        return _run_in_executor(f, data)
+    return maybeDeferred(f, data)
+
+
+def loads(data):
+    return json.loads(data.decode('utf-8'))
+
+
+def summarize_servers(content):
+    servers_connected = 0
+    servers_known = 0
+    available_space = 0
+    if 'servers' in content:
+        servers = content['servers']
+        servers_known = len(servers)
+        for server in servers:
+            if server['connection_status'].startswith('Connected'):
+                servers_connected += 1
+                if server['available_space']:
+                    available_space += server['available_space']
+    return servers_connected, servers_known, available_space
+
+
+def get_server_states(content):
+    # Returns whether or not each server (by nodeid) is connected
+    states = {}
+    for server in content.get('servers', []):
+        if server.get('nodeid'):
+            states[server['nodeid']] = server['connection_status'].startswith(
+                'Connected')
+    return states
+
+
+def load_grid_status(data):
+    # Returns the result of summarize_servers() along with the server states
+    content = loads(data)
+    return summarize_servers(content) + (get_server_states(content),)
+
+
+class ServersSummary(object):
+    # Computes the same result as summarize_servers() from the events of an
+    # ijson parser, i.e., while the response body is still arriving and
+    # without ever holding all of it in memory.
+    def __init__(self):
+        self.connected = 0
+        self.known = 0
+        self.available_space = 0
+        self.server_states = {}
+        self._connected = False
+        self._space = 0
+        self._nodeid = None
+
+    def send(self, event):
+        prefix, kind, value = event
+        if prefix == 'servers.item':
+            if kind == 'start_map':
+                self._connected = False
+                self._space = 0
+                self._nodeid = None
+            elif kind == 'end_map':
+                self.known += 1
+                if self._connected:
+                    self.connected += 1
+                    self.available_space += self._space
+                if self._nodeid:
+                    self.server_states[self._nodeid] = self._connected
+        elif prefix == 'servers.item.connection_status' and kind == 'string':
+            self._connected = value.startswith('Connected')
+        elif prefix == 'servers.item.available_space' and kind == 'number':
+            self._space = int(value)
+        elif prefix == 'servers.item.nodeid' and kind == 'string':
+            self._nodeid = value
+
+    def result(self):
+        return self.connected, self.known, self.available_space
+
+
+def summarize_listing(content):
+    # Returns the (size, cap, linkmotime, version) of each of a magic-folder
+    # member's files along with their total size and the most recent
+    # 'linkmotime' among them
+    files = {}
+    total_size = 0
+    latest_mtime = 0
+    for filenode, data in content[1]['children'].items():
+        filepath = filenode.replace('@_', os.path.sep)
+        metadata = data[1]
+        try:
+            size = int(metadata['size'])
+        except KeyError:  # if linked manually
+            continue
+        cap = metadata.get('ro_uri') or metadata.get('rw_uri')
+        version = metadata.get('metadata', {}).get('version')
+        total_size += size
+        try:
+            mt = int(metadata['metadata']['tahoe']['linkmotime'])
+        except KeyError:
+            files[filepath] = (size, cap, None, version)
+            continue
+        files[filepath] = (size, cap, mt, version)
+        if mt > latest_mtime:
+            latest_mtime = mt
+    return files, total_size, latest_mtime
+
+
+def load_listing_summary(data):
+    # Not for run(); the result of summarize_listing() is a large share of
+    # 'data', so unpickling it would cost about as much as decoding 'data'
+    # inline. Large listings are streamed instead (see ListingSummary)
+    return summarize_listing(loads(data))
+
+
+class ListingSummary(object):
+    # Like ServersSummary but computes the result of summarize_listing()
+    numbers = {
+        '.item.size': 'size',
+        '.item.metadata.tahoe.linkmotime': 'mtime',
+        '.item.metadata.version': 'version'
+    }
+    strings = {
+        '.item.ro_uri': 'ro_uri',
+        '.item.rw_uri': 'rw_uri'
+    }
+
+    def __init__(self):
+        self.files = {}
+        self.total_size = 0
+        self.latest_mtime = 0
+        self._child = None
+        self._file = {}
+
+    def _add_child(self, name):
+        size = self._file.get('size')
+        if size is None:  # if linked manually
+            return
+        mtime = self._file.get('mtime')
+        self.files[name.replace('@_', os.path.sep)] = (
+            size,
+            self._file.get('ro_uri') or self._file.get('rw_uri'),
+            mtime,
+            self._file.get('version'))
+        self.total_size += size
+        if mtime is not None and mtime > self.latest_mtime:
+            self.latest_mtime = mtime
+
+    def send(self, event):
+        prefix, kind, value = event
+        if prefix == 'item.children':
+            if kind == 'map_key':
+                self._child = value
+                self._file = {}
+            elif kind == 'end_map':
+                self._child = None
+            return
+        if self._child is None:
+            return
+        child_prefix = 'item.children.' + self._child
+        if prefix == child_prefix:
+            if kind == 'end_array':
+                self._add_child(self._child)
+            return
+        if not prefix.startswith(child_prefix):
+            return
+        key = prefix[len(child_prefix):]
+        if kind == 'number' and key in self.numbers:
+            self._file[self.numbers[key]] = int(value)
+        elif kind == 'string' and key in self.strings:
+            self._file[self.strings[key]] = value
+
+    def result(self):
+        return self.files, self.total_size, self.latest_mtime
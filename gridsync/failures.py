@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import time
+
+
+class FailureTracker(object):
+    # Keeps track of the paths in a magic-folder whose uploads or downloads
+    # have failed -- when they first and last failed and how many times --
+    # until they succeed again, along with the paths whose downloads have
+    # conflicted with local changes (and which Tahoe-LAFS has thus written
+    # to "<path>.conflict") until those conflicts are resolved.
+    def __init__(self, name=''):
+        self.name = name
+        self.failures = {}
+        self.conflicts = set()
+
+    def __len__(self):
+        return len(self.failures)
+
+    def __contains__(self, path):
+        return path in self.failures
+
+    def add(self, path, now=None):
+        # Returns True if 'path' was not already failing
+        now = now or time.time()
+        failure = self.failures.get(path)
+        if failure:
+            failure['last_failed'] = now
+            failure['count'] += 1
+        else:
+            self.failures[path] = {
+                'first_failed': now,
+                'last_failed': now,
+                'count': 1
+            }
+            logging.debug("Added %s to %s failures", path, self.name)
+        return failure is None
+
+    def resolve(self, path):
+        # Returns True if 'path' was failing
+        if self.failures.pop(path, None) is None:
+            return False
+        logging.debug("Removed %s from %s failures", path, self.name)
+        return True
+
+    def get_failures(self):
+        return self.failures.copy()
+
+    def add_conflict(self, path):
+        # Returns True if 'path' was not already conflicted
+        if path in self.conflicts:
+            return False
+        self.conflicts.add(path)
+        logging.debug("Added %s to %s conflicts", path, self.name)
+        return True
+
+    def resolve_conflict(self, path):
+        # Returns True if 'path' was conflicted
+        if path not in self.conflicts:
+            return False
+        self.conflicts.discard(path)
+        logging.debug("Removed %s from %s conflicts", path, self.name)
+        return True
+
+    def get_conflicts(self):
+        return sorted(self.conflicts)
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+import os
+
+from PyQt5.QtWidgets import (
+    QFileDialog, QGridLayout, QMessageBox, QPushButton, QTreeWidget,
+    QTreeWidgetItem, QWidget)
+
+from gridsync import APP_NAME
+
+
+def format_seconds(seconds):
+    if seconds is None:
+        return ''
+    if seconds < 10:
+        return "{:.2f} s".format(seconds)
+    return "{:.0f} s".format(seconds)
+
+
+class DiagnosticsWidget(QWidget):
+    # Shows the sync latency histograms recorded by a gateway's Monitor
+    headers = ["Folder", "Direction", "Metric", "Count", "Median", "90th %",
+               "99th %", "Max"]
+
+    def __init__(self, monitor):
+        super(DiagnosticsWidget, self).__init__()
+        self.monitor = monitor
+        self.setWindowTitle("{} - {} - Diagnostics".format(
+            APP_NAME, monitor.gateway.name))
+        self.resize(700, 300)
+
+        self.tree = QTreeWidget(self)
+        self.tree.setHeaderLabels(self.headers)
+        self.tree.setRootIsDecorated(False)
+
+        self.refresh_button = QPushButton("Refresh", self)
+        self.refresh_button.clicked.connect(self.populate)
+
+        self.export_button = QPushButton("Export...", self)
+        self.export_button.clicked.connect(self.select_export_location)
+
+        layout = QGridLayout(self)
+        layout.addWidget(self.tree, 1, 1, 1, 3)
+        layout.addWidget(self.refresh_button, 2, 2)
+        layout.addWidget(self.export_button, 2, 3)
+
+        self.populate()
+
+    def populate(self):
+        self.tree.clear()
+        stats = self.monitor.get_latency_stats()
+        for folder in sorted(stats):
+            for kind in sorted(stats[folder]):
+                for metric in sorted(stats[folder][kind]):
+                    h = stats[folder][kind][metric]
+                    self.tree.addTopLevelItem(QTreeWidgetItem([
+                        folder, kind, metric.replace('_', ' '),
+                        str(h['count']), format_seconds(h['p50']),
+                        format_seconds(h['p90']), format_seconds(h['p99']),
+                        format_seconds(h['max'])]))
+        for i in range(len(self.headers)):
+            self.tree.resizeColumnToContents(i)
+
+    def export(self, path):
+        with open(path, 'w') as f:
+            json.dump({
+                'gateway': self.monitor.gateway.name,
+                'latency': self.monitor.get_latency_stats()
+            }, f, indent=2, sort_keys=True)
+
+    def select_export_location(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export diagnostics",
+            os.path.join(os.path.expanduser('~'), 'Diagnostics.json'))
+        if not path:
+            return
+        try:
+            self.export(path)
+        except OSError as e:
+            logging.error("Error exporting diagnostics: %s", str(e))
+            QMessageBox.critical(
+                self, "Error exporting diagnostics", str(e))
@@ -4,10 +4,12 @@ from datetime import datetime
 import json
 import logging
 import os
+import time
 
-from humanize import naturalsize, naturaltime
+from humanize import naturaldelta, naturalsize, naturaltime
 from PyQt5.QtCore import (
-    pyqtSlot, QEvent, QFileInfo, QPoint, QSize, Qt, QThread)
+    pyqtSlot, QEvent, QFileInfo, QModelIndex, QPersistentModelIndex, QPoint,
+    QSize, Qt, QThread)
 from PyQt5.QtGui import (
     QColor, QFont, QIcon, QKeySequence, QMovie, QPixmap, QStandardItem,
     QStandardItemModel)
@@ -21,11 +23,15 @@ from twisted.internet import reactor
 from gridsync import resource, APP_NAME, config_dir
 from gridsync.crypto import Crypter
 from gridsync.desktop import open_folder
+from gridsync.gui.diagnostics import DiagnosticsWidget
 from gridsync.gui.password import PasswordDialog
+from gridsync.gui.sparkline import Sparkline
+from gridsync.gui.transfers import get_ranges, TransferWidget
 from gridsync.gui.widgets import (
     CompositePixmap, InviteReceiver, PreferencesWidget, ShareWidget)
 from gridsync.monitor import Monitor
 from gridsync.preferences import get_preference
+from gridsync.snapshot import Snapshot
 from gridsync.util import humanized_list
 
 
@@ -110,8 +116,29 @@ class Model(QStandardItemModel):
         self.gateway = self.view.gateway
         self.monitor = Monitor(self.gateway)
         self.status_dict = {}
+        self.folder_index = {}  # Folder name -> QPersistentModelIndex
+        # While the main window is hidden, updates are only recorded (in
+        # 'pending_updates' and 'folder_state') and applied when it is shown
+        self.visible = bool(self.gui.main_window.isVisible())
+        self.pending_updates = {}
         self.grid_status = ''
         self.available_space = 0
+        self.num_connected = 0
+        self.num_happy = 0
+        self.folder_state = {}
+        self.issues = {}  # Folder name -> {'failures': n, 'conflicts': n}
+        self.failure_counts = {}
+        self.conflicts = {}
+        self.snapshot = Snapshot(
+            os.path.join(self.gateway.nodedir, 'private', 'snapshot.json'))
+        self.history_snapshots = {
+            step: Snapshot(os.path.join(
+                self.gateway.nodedir, 'private', 'history_{}.json'.format(step)
+            )) for step, _ in self.monitor.history.resolutions
+        }
+        self.history_saved = {}  # Resolution -> interval last saved
+        self.snapshot_interval = 60
+        self.snapshot_saved = 0
         self.setHeaderData(0, Qt.Horizontal, "Name")
         self.setHeaderData(1, Qt.Horizontal, "Status")
         self.setHeaderData(2, Qt.Horizontal, "Last modified")
@@ -128,25 +155,31 @@ class Model(QStandardItemModel):
 
         self.monitor.connected.connect(self.on_connected)
         self.monitor.disconnected.connect(self.on_disconnected)
+        self.monitor.unresponsive.connect(self.on_unresponsive)
+        self.monitor.responsive.connect(self.on_responsive)
         self.monitor.nodes_updated.connect(self.on_nodes_updated)
         self.monitor.space_updated.connect(self.on_space_updated)
         self.monitor.data_updated.connect(self.set_data)
-        self.monitor.status_updated.connect(self.set_status)
-        self.monitor.mtime_updated.connect(self.set_mtime)
-        self.monitor.size_updated.connect(self.set_size)
+        self.monitor.batch_updated.connect(self.apply_updates)
         self.monitor.member_added.connect(self.add_member)
         self.monitor.first_sync_started.connect(self.on_first_sync)
         self.monitor.sync_started.connect(self.on_sync_started)
         self.monitor.sync_finished.connect(self.on_sync_finished)
         self.monitor.files_updated.connect(self.on_updated_files)
+        self.monitor.failures_updated.connect(self.on_failures_updated)
+        self.monitor.conflicts_updated.connect(self.on_conflicts_updated)
         self.monitor.check_finished.connect(self.update_natural_times)
+        self.monitor.check_finished.connect(self.save_snapshot_periodically)
+        self.monitor.check_finished.connect(self.on_check_finished)
         self.monitor.remote_folder_added.connect(self.add_remote_folder)
+        self.monitor.remote_folder_removed.connect(self.remove_folder)
 
     def on_space_updated(self, size):
         self.available_space = size
 
-    @pyqtSlot(int, int)
-    def on_nodes_updated(self, num_connected, num_happy):
+    def update_grid_status(self, num_connected, num_happy):
+        self.num_connected = num_connected
+        self.num_happy = num_happy
         if num_connected < num_happy:
             self.grid_status = "Connecting ({}/{} nodes)...".format(
                 num_connected, num_happy)
@@ -154,6 +187,10 @@ class Model(QStandardItemModel):
             obj = ('node' if num_connected == 1 else 'nodes')
             self.grid_status = "Connected to {} {}; {} available".format(
                 num_connected, obj, naturalsize(self.available_space))
+
+    @pyqtSlot(int, int)
+    def on_nodes_updated(self, num_connected, num_happy):
+        self.update_grid_status(num_connected, num_happy)
         self.gui.main_window.set_current_grid_status()  # TODO: Use pyqtSignal?
 
     @pyqtSlot(str)
@@ -168,6 +205,16 @@ class Model(QStandardItemModel):
             self.gui.show_message(
                 grid_name, "Disconnected from {}".format(grid_name))
 
+    @pyqtSlot(str)
+    def on_unresponsive(self, grid_name):
+        self.grid_status = "{} is not responding".format(grid_name)
+        self.gui.main_window.set_current_grid_status()
+
+    @pyqtSlot(str)
+    def on_responsive(self, _):
+        self.on_nodes_updated(self.monitor.num_connected,
+                              self.monitor.num_happy)
+
     @pyqtSlot(str, list)
     def on_updated_files(self, folder_name, files_list):
         if get_preference('notifications', 'folder') != 'false':
@@ -175,15 +222,46 @@ class Model(QStandardItemModel):
                 folder_name + " updated and encrypted",
                 "Updated " + humanized_list(files_list))
 
+    @pyqtSlot(str, int)
+    def on_failures_updated(self, folder_name, count):
+        # Only an increase is notified; a failure that Tahoe-LAFS keeps
+        # reporting is only counted once (see Monitor.track_failures)
+        previous = self.failure_counts.get(folder_name, 0)
+        self.failure_counts[folder_name] = count
+        if count > previous and get_preference(
+                'notifications', 'folder') != 'false':
+            self.gui.show_message(
+                folder_name + " failed to sync",
+                "{} file{} could not be synced".format(
+                    count, '' if count == 1 else 's'))
+
+    @pyqtSlot(str, list)
+    def on_conflicts_updated(self, folder_name, conflicts):
+        new = sorted(set(conflicts) - self.conflicts.get(folder_name, set()))
+        self.conflicts[folder_name] = set(conflicts)
+        if new and get_preference('notifications', 'folder') != 'false':
+            self.gui.show_message(
+                folder_name + " has conflicts",
+                "Conflicting versions of {} were saved as \".conflict\" "
+                "files".format(humanized_list(new)))
+
     def data(self, index, role):
         value = super(Model, self).data(index, role)
         if role == Qt.SizeHintRole:
             return QSize(0, 30)
         return value
 
+    def find_item(self, folder):
+        # Returns the (top-level) item for the named folder, or None, without
+        # searching through every row as findItems() does
+        index = self.folder_index.get(folder)
+        if index is None or not index.isValid():
+            return None
+        return self.itemFromIndex(QModelIndex(index))
+
     def add_folder(self, path, name_data=None, status_data=0):
         basename = os.path.basename(os.path.normpath(path))
-        if self.findItems(basename):
+        if self.find_item(basename):
             logging.warning(
                 "Tried to add a folder (%s) that already exists", basename)
             return
@@ -195,6 +273,7 @@ class Model(QStandardItemModel):
         size = QStandardItem()
         #action = QStandardItem()
         self.appendRow([name, status, mtime, size])
+        self.folder_index[basename] = QPersistentModelIndex(name.index())
         #action_bar = ActionBar(self, basename)
         #self.view.setIndexWidget(action.index(), action_bar)
         #action.setData(action_bar, Qt.UserRole)
@@ -204,38 +283,123 @@ class Model(QStandardItemModel):
 
     @pyqtSlot(str, str)
     def add_member(self, folder, member):
-        items = self.findItems(folder)
-        if items:
-            items[0].appendRow([QStandardItem(self.icon_user, member)])
+        item = self.find_item(folder)
+        if not item:
+            return
+        for row in range(item.rowCount()):
+            if item.child(row).text() == member:
+                return
+        item.appendRow([QStandardItem(self.icon_user, member)])
+        self._update_state(folder, members=self.get_members(folder))
+
+    def get_members(self, folder):
+        item = self.find_item(folder)
+        if not item:
+            return []
+        return [item.child(i).text() for i in range(item.rowCount())]
+
+    @pyqtSlot(str)
+    def remove_folder(self, folder):
+        item = self.find_item(folder)
+        if item:
+            self.removeRow(item.row())
+        self.folder_index.pop(folder, None)
+        self.folder_state.pop(folder, None)
+
+    def _update_state(self, folder, **kwargs):
+        if self.find_item(folder):
+            self.folder_state.setdefault(folder, {}).update(kwargs)
+
+    def get_state(self):
+        return {
+            'folders': self.folder_state,
+            'available_space': self.available_space,
+            'num_connected': self.num_connected,
+            'num_happy': self.num_happy
+        }
+
+    def save_history(self, final=False):
+        # Each resolution is saved to a file of its own, and only once one
+        # of its intervals has been completed since it was last saved -- or,
+        # to keep the interval in progress, when 'final' (i.e., on exit)
+        history = self.monitor.history
+        for step, snapshot in self.history_snapshots.items():
+            interval = history.get_interval(step)
+            if final or interval != self.history_saved.get(step):
+                snapshot.save(history.to_dict([step]))
+                self.history_saved[step] = interval
+
+    def save_snapshot(self, final=False):
+        self.snapshot.save(self.get_state())
+        self.save_history(final)
+        self.snapshot_saved = time.time()
+
+    @pyqtSlot()
+    def save_snapshot_periodically(self):
+        if time.time() - self.snapshot_saved >= self.snapshot_interval:
+            self.save_snapshot()
+
+    def restore_snapshot(self):
+        # Shows the last-known state of every folder (and of the grid) until
+        # the Monitor has fresher data; see gridsync.snapshot
+        state = self.snapshot.load()
+        for folder, folder_state in state.get('folders', {}).items():
+            if not self.find_item(folder):
+                continue
+            if 'status' in folder_state:
+                self.set_status(folder, folder_state['status'])
+            if folder_state.get('mtime'):
+                self.set_mtime(folder, folder_state['mtime'])
+            if 'size' in folder_state:
+                self.set_size(folder, folder_state['size'])
+            for member in folder_state.get('members', []):
+                self.add_member(folder, member)
+        if state.get('num_happy'):
+            self.available_space = state.get('available_space', 0)
+            self.update_grid_status(
+                state.get('num_connected', 0), state['num_happy'])
+        history = self.monitor.history
+        for step, snapshot in self.history_snapshots.items():
+            if history.restore(snapshot.load()):
+                self.history_saved[step] = history.get_interval(step)
+
+    @pyqtSlot()
+    def on_check_finished(self):
+        self.gui.main_window.update_sparkline()
 
     def populate(self):
         for magic_folder in list(self.gateway.load_magic_folders().keys()):
             self.add_folder(magic_folder)
+        self.restore_snapshot()
         self.monitor.start()
 
     def update_folder_icon(self, folder_name, folder_path, overlay_file=None):
-        items = self.findItems(folder_name)
-        if items:
+        item = self.find_item(folder_name)
+        if item:
             folder_icon = QFileIconProvider().icon(QFileInfo(folder_path))
             folder_pixmap = folder_icon.pixmap(256, 256)
             if overlay_file:
                 pixmap = CompositePixmap(folder_pixmap, resource(overlay_file))
             else:
                 pixmap = CompositePixmap(folder_pixmap)
-            items[0].setIcon(QIcon(pixmap))
+            item.setIcon(QIcon(pixmap))
 
     @pyqtSlot(str, object)
     def set_data(self, folder_name, data):
-        items = self.findItems(folder_name)
-        if items:
-            items[0].setData(data, Qt.UserRole)
+        item = self.find_item(folder_name)
+        if item:
+            item.setData(data, Qt.UserRole)
 
     @pyqtSlot(str, int)
     def set_status(self, name, status):
-        items = self.findItems(name)
-        if not items:
-            return
-        item = self.item(items[0].row(), 1)
+        # Returns True if the status changed (as do set_mtime, etc.)
+        folder_item = self.find_item(name)
+        if not folder_item:
+            return False
+        item = self.item(folder_item.row(), 1)
+        self._update_state(name, status=status)
+        if item.data(Qt.UserRole) == status:
+            return False
         if not status:
             item.setIcon(self.icon_blank)
             item.setText("Initializing...")
@@ -245,11 +409,110 @@ class Model(QStandardItemModel):
         elif status == 2:
             item.setIcon(self.icon_up_to_date)
             item.setText("Up to date")
+        elif status == 4:
+            item.setIcon(self.icon_blank)
+            item.setText("Paused")
         item.setData(status, Qt.UserRole)
         self.status_dict[name] = status
+        return True
+
+    def set_eta(self, name, eta):
+        folder_item = self.find_item(name)
+        if not folder_item:
+            return False
+        item = self.item(folder_item.row(), 1)
+        if item.data(Qt.UserRole) != 1:
+            return False
+        if eta is None:
+            text = "Syncing"
+        else:
+            text = "Syncing ({} left)".format(naturaldelta(eta))
+        if item.text() == text:
+            return False
+        item.setText(text)
+        return True
+
+    def set_issues(self, name, **counts):
+        # Lists the folder's failures and/or conflicts in the tooltip of its
+        # "Status" column
+        folder_item = self.find_item(name)
+        if not folder_item:
+            return False
+        issues = self.issues.setdefault(name, {})
+        issues.update(counts)
+        lines = []
+        if issues.get('failures'):
+            lines.append("{} file(s) failed to sync".format(
+                issues['failures']))
+        if issues.get('conflicts'):
+            lines.append("{} file(s) in conflict".format(issues['conflicts']))
+        tooltip = '\n'.join(lines)
+        item = self.item(folder_item.row(), 1)
+        if item.toolTip() == tooltip:
+            return False
+        item.setToolTip(tooltip)
+        return True
+
+    def _apply_folder_updates(self, name, updates):
+        changed = False
+        if 'status' in updates:
+            changed = self.set_status(name, updates['status']) or changed
+        if 'eta' in updates:
+            changed = self.set_eta(name, updates['eta']) or changed
+        if 'mtime' in updates:
+            changed = self.set_mtime(name, updates['mtime']) or changed
+        if 'size' in updates:
+            changed = self.set_size(name, updates['size']) or changed
+        for key in ('failures', 'conflicts'):
+            if key in updates:
+                changed = self.set_issues(
+                    name, **{key: updates[key]}) or changed
+        return changed
+
+    def _store_updates(self, updates):
+        for name, folder_updates in updates.items():
+            if name not in self.folder_index:
+                continue
+            self.pending_updates.setdefault(name, {}).update(folder_updates)
+            self._update_state(name, **{
+                k: v for k, v in folder_updates.items()
+                if k in ('status', 'mtime', 'size')})
+
+    @pyqtSlot(object)
+    def apply_updates(self, updates):
+        # Applies a batch of updates (see Monitor.queue_update) with the
+        # model's signals blocked and then signals the views once for each
+        # contiguous range of changed rows
+        if any('eta' in u for u in updates.values()):
+            self.gui.systray.set_eta(
+                self.gateway.name, self.monitor.get_eta())
+        if not self.visible:
+            self._store_updates(updates)
+            return
+        changed_rows = []
+        self.blockSignals(True)
+        try:
+            for name, folder_updates in updates.items():
+                if self._apply_folder_updates(name, folder_updates):
+                    changed_rows.append(self.find_item(name).row())
+        finally:
+            self.blockSignals(False)
+        for first, last in get_ranges(changed_rows):
+            self.dataChanged.emit(
+                self.index(first, 0), self.index(last, self.columnCount() - 1))
+
+    def set_visible(self, visible):
+        if visible == self.visible:
+            return
+        self.visible = visible
+        if visible:
+            updates, self.pending_updates = self.pending_updates, {}
+            if updates:
+                self.apply_updates(updates)
+            self.update_natural_times()
 
     def fade_row(self, folder_name, overlay_file=None):
-        folder_item = self.findItems(folder_name)[0]
+        folder_item = self.find_item(folder_name)
         if overlay_file:
             folder_pixmap = self.icon_folder_gray.pixmap(256, 256)
             pixmap = CompositePixmap(folder_pixmap, resource(overlay_file))
@@ -266,7 +529,7 @@ class Model(QStandardItemModel):
 
     def unfade_row(self, folder_name):
         default_foreground = QStandardItem().foreground()
-        folder_item = self.findItems(folder_name)[0]
+        folder_item = self.find_item(folder_name)
         row = folder_item.row()
         for i in range(4):
             item = self.item(row, i)
@@ -295,17 +558,31 @@ class Model(QStandardItemModel):
             'lock-closed-green.svg')
 
     @pyqtSlot(str, int)
-    def set_mtime(self, name, time):
-        item = self.item(self.findItems(name)[0].row(), 2)
-        item.setData(time, Qt.UserRole)
+    def set_mtime(self, name, mtime):
+        folder_item = self.find_item(name)
+        if not folder_item:
+            return False
+        item = self.item(folder_item.row(), 2)
+        self._update_state(name, mtime=mtime)
+        if item.data(Qt.UserRole) == mtime:
+            return False
+        item.setData(mtime, Qt.UserRole)
         item.setText(
-            naturaltime(datetime.now() - datetime.fromtimestamp(time)))
+            naturaltime(datetime.now() - datetime.fromtimestamp(mtime)))
+        return True
 
     @pyqtSlot(str, int)
     def set_size(self, name, size):
-        item = self.item(self.findItems(name)[0].row(), 3)
+        folder_item = self.find_item(name)
+        if not folder_item:
+            return False
+        item = self.item(folder_item.row(), 3)
+        self._update_state(name, size=size)
+        if item.data(Qt.UserRole) == size:
+            return False
         item.setText(naturalsize(size))
         item.setData(size, Qt.UserRole)
+        return True
 
     #def show_share_button(self, name):
     #    action_item = self.item(self.findItems(name)[0].row(), 4)
@@ -329,6 +606,8 @@ class Model(QStandardItemModel):
 
     @pyqtSlot()
     def update_natural_times(self):
+        if not self.visible:
+            return
         for i in range(self.rowCount()):
             item = self.item(i, 2)
             data = item.data(Qt.UserRole)
@@ -355,13 +634,17 @@ class Delegate(QStyledItemDelegate):
         self.sync_movie.setCacheMode(True)
         self.sync_movie.frameChanged.connect(self.on_frame_changed)
 
+    def suspend(self):
+        # The movies are resumed by paint() when next needed
+        self.waiting_movie.setPaused(True)
+        self.sync_movie.setPaused(True)
+
     def on_frame_changed(self):
         values = self.parent.model().status_dict.values()
-        if 0 in values or 1 in values:
+        if self.parent.isVisible() and (0 in values or 1 in values):
             self.parent.viewport().update()
         else:
-            self.waiting_movie.setPaused(True)
-            self.sync_movie.setPaused(True)
+            self.suspend()
 
     def paint(self, painter, option, index):
         column = index.column()
@@ -387,6 +670,7 @@ class View(QTreeView):
         self.gui = gui
         self.gateway = gateway
         self.share_widgets = []
+        self.transfer_widgets = {}
         self.setModel(Model(self))
         self.setItemDelegate(Delegate(self))
 
@@ -466,6 +750,11 @@ class View(QTreeView):
 
         self.model().populate()
 
+    def set_visible(self, visible):
+        self.model().set_visible(visible)
+        if not visible:
+            self.itemDelegate().suspend()
+
     def show_drop_label(self, _=None):
         if not self.model().rowCount():
             self.setHeaderHidden(True)
@@ -495,8 +784,16 @@ class View(QTreeView):
         self.share_widgets.append(share_widget)  # TODO: Remove on close
         share_widget.show()
 
+    def open_transfer_widget(self, folder_name):
+        transfer_widget = self.transfer_widgets.get(folder_name)
+        if not transfer_widget:
+            transfer_widget = TransferWidget(self.model().monitor, folder_name)
+            self.transfer_widgets[folder_name] = transfer_widget
+        transfer_widget.show()
+        transfer_widget.raise_()
+
     def select_download_location(self, folder_name):
-        data = self.model().findItems(folder_name)[0].data(Qt.UserRole)
+        data = self.model().find_item(folder_name).data(Qt.UserRole)
         join_code = "{}+{}".format(data['collective'], data['personal'])
         dest = QFileDialog.getExistingDirectory(
             self, "Select a destination for '{}'".format(folder_name),
@@ -504,7 +801,7 @@ class View(QTreeView):
         if not dest:
             return
         path = os.path.join(dest, folder_name)
-        self.gateway.create_magic_folder(path, join_code)  # XXX
+        self.gateway.join_magic_folders({path: join_code})  # XXX
 
     def confirm_remove(self, folder):
         reply = QMessageBox.question(
@@ -516,7 +813,7 @@ class View(QTreeView):
             QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         if reply == QMessageBox.Yes:
             self.gateway.remove_magic_folder(folder)
-            self.model().removeRow(self.model().findItems(folder)[0].row())
+            self.model().remove_folder(folder)
             d = self.model().monitor.scan_rootcap()
             d.addCallback(self.show_drop_label)
 
@@ -542,7 +839,21 @@ class View(QTreeView):
                 open_action.triggered.connect(
                     lambda: open_folder(folder_info['directory']))
                 menu.addAction(open_action)
+                transfers_action = QAction("Transfers...", menu)
+                transfers_action.triggered.connect(
+                    lambda: self.open_transfer_widget(folder))
+                menu.addAction(transfers_action)
                 menu.addMenu(share_menu)
+                if folder_info.get('nodedir'):
+                    if self.gateway.is_magic_folder_paused(folder):
+                        pause_action = QAction("Resume syncing", menu)
+                        pause_action.triggered.connect(
+                            lambda: self.gateway.resume_magic_folder(folder))
+                    else:
+                        pause_action = QAction("Pause syncing", menu)
+                        pause_action.triggered.connect(
+                            lambda: self.gateway.pause_magic_folder(folder))
+                    menu.addAction(pause_action)
             else:
                 download_action = QAction(
                     QIcon(resource('download.png')), 'Download...', self)
@@ -556,10 +867,14 @@ class View(QTreeView):
             menu.addAction(remove_action)
             menu.exec_(self.viewport().mapToGlobal(position))
 
-    def add_new_folder(self, path):
+    def add_new_folders(self, paths):
         self.hide_drop_label()
-        self.model().add_folder(path)
-        self.gateway.create_magic_folder(path)
+        for path in paths:
+            self.model().add_folder(path)
+        self.gateway.create_magic_folders(paths)
+
+    def add_new_folder(self, path):
+        self.add_new_folders([path])
 
     def select_folder(self):
         dialog = QFileDialog(self, "Please select a folder")
@@ -567,8 +882,7 @@ class View(QTreeView):
         dialog.setFileMode(QFileDialog.Directory)
         dialog.setOption(QFileDialog.ShowDirsOnly)
         if dialog.exec_():
-            for folder in dialog.selectedFiles():
-                self.add_new_folder(folder)
+            self.add_new_folders(dialog.selectedFiles())
 
     def dragEnterEvent(self, event):  # pylint: disable=no-self-use
         logging.debug(event)
@@ -588,16 +902,19 @@ class View(QTreeView):
         logging.debug(event)
         if event.mimeData().hasUrls:
             event.accept()
+            paths = []
             for url in event.mimeData().urls():
                 path = url.toLocalFile()
                 if os.path.isdir(path):
-                    self.add_new_folder(path)
+                    paths.append(path)
                 else:
                     QMessageBox.critical(
                         self, "Cannot add {}.".format(path),
                         "Cannot add '{}'.\n\n{} currently only supports "
                         "uploading and syncing folders, and not individual "
                         "files. Please try again.".format(path, APP_NAME))
+            if paths:
+                self.add_new_folders(paths)
 
     def eventFilter(self, obj, event):  # pylint: disable=unused-argument
         if event.type() == QEvent.DragEnter:
@@ -747,12 +1064,16 @@ class MainWindow(QMainWindow):
         self.status_bar = self.statusBar()
         self.status_bar_label = QLabel('Initializing...')
         self.status_bar.addPermanentWidget(self.status_bar_label)
+        self.sparkline = Sparkline(self)
+        self.sparkline.setToolTip("Connected storage nodes (last hour)")
+        self.status_bar.addPermanentWidget(self.sparkline)
 
         self.preferences_widget = PreferencesWidget()
         self.preferences_widget.accepted.connect(self.show_selected_grid_view)
 
         self.active_pair_widgets = []
         self.active_invite_receivers = []
+        self.diagnostics_widgets = {}
 
     def populate(self, gateways):
         for gateway in gateways:
@@ -772,13 +1093,42 @@ class MainWindow(QMainWindow):
             return
         view.select_folder()
 
+    def show_diagnostics(self):
+        try:
+            monitor = self.current_view().model().monitor
+        except AttributeError:
+            return
+        widget = self.diagnostics_widgets.get(monitor.gateway.name)
+        if widget:
+            widget.populate()
+        else:
+            widget = DiagnosticsWidget(monitor)
+            self.diagnostics_widgets[monitor.gateway.name] = widget
+        widget.show()
+        widget.raise_()
+
+    def save_snapshots(self):
+        for view in self.central_widget.views:
+            view.model().save_snapshot(final=True)
+
     def set_current_grid_status(self):
         if self.central_widget.currentWidget() == self.preferences_widget:
             return
         self.status_bar_label.setText(
             self.current_view().model().grid_status)
+        self.update_sparkline()
         self.gui.systray.update()
 
+    def update_sparkline(self):
+        if not self.isVisible() or \
+                self.central_widget.currentWidget() == self.preferences_widget:
+            return
+        try:
+            history = self.current_view().model().monitor.history
+        except AttributeError:
+            return
+        self.sparkline.set_values(history.connected.get(60)[-60:])
+
     def on_grid_selected(self, index):
         if index == self.combo_box.count() - 1:
             self.gui.show_setup_form()
@@ -934,6 +1284,19 @@ class MainWindow(QMainWindow):
         if key == Qt.Key_Escape and self.gui.systray.isSystemTrayAvailable():
             self.hide()
 
+    def set_views_visible(self, visible):
+        for view in self.central_widget.views:
+            view.set_visible(visible)
+
+    def showEvent(self, event):
+        super(MainWindow, self).showEvent(event)
+        self.set_views_visible(True)
+        self.update_sparkline()
+
+    def hideEvent(self, event):
+        super(MainWindow, self).hideEvent(event)
+        self.set_views_visible(False)
+
     def closeEvent(self, event):
         if self.gui.systray.isSystemTrayAvailable():
             event.accept()
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+import math
+
+from PyQt5.QtCore import QPointF, QSize
+from PyQt5.QtGui import QPainter, QPen, QPolygonF
+from PyQt5.QtWidgets import QSizePolicy, QWidget
+
+
+class Sparkline(QWidget):
+    # A small, axis-less line chart of a series of values; gaps (NaNs) in
+    # the series break the line
+    def __init__(self, parent=None, width=60, height=16):
+        super(Sparkline, self).__init__(parent)
+        self.values = []
+        self._size = QSize(width, height)
+        self.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
+
+    def sizeHint(self):
+        return self._size
+
+    def set_values(self, values):
+        if values != self.values:
+            self.values = values
+            self.update()
+
+    def get_segments(self, width, height):
+        # Returns the polylines (as lists of points) to draw, scaled to fit
+        # within 'width' by 'height', with the minimum at the bottom
+        known = [v for v in self.values if not math.isnan(v)]
+        if not known:
+            return []
+        low = min(0, min(known))
+        span = (max(known) - low) or 1
+        x_step = width / float(max(len(self.values) - 1, 1))
+        segments = [[]]
+        for i, value in enumerate(self.values):
+            if math.isnan(value):
+                if segments[-1]:
+                    segments.append([])
+                continue
+            y = height - (value - low) / span * height
+            segments[-1].append(QPointF(i * x_step, y))
+        return [segment for segment in segments if segment]
+
+    def paintEvent(self, _):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(QPen(self.palette().text().color(), 1))
+        rect = self.rect().adjusted(1, 1, -1, -1)
+        for segment in self.get_segments(rect.width(), rect.height()):
+            segment = [p + QPointF(rect.x(), rect.y()) for p in segment]
+            if len(segment) == 1:
+                painter.drawPoint(segment[0])
+            else:
+                painter.drawPolyline(QPolygonF(segment))
+        painter.end()
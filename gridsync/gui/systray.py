@@ -4,6 +4,8 @@ import logging
 import sys
 import webbrowser
 
+from humanize import naturaldelta
+
 from PyQt5.QtGui import QIcon, QMovie
 from PyQt5.QtWidgets import QAction, QMenu, QSystemTrayIcon
 
@@ -42,10 +44,15 @@ class Menu(QMenu):
         #about_action = QAction(QIcon(''), "About {}...".format(APP_NAME), self)
         #about_action.setEnabled(False)
 
+        diagnostics_action = QAction(QIcon(''), "Diagnostics...", self)
+        diagnostics_action.triggered.connect(
+            self.gui.main_window.show_diagnostics)
+
         help_menu = QMenu(self)
         help_menu.setTitle("Help")
         help_menu.addAction(documentation_action)
         help_menu.addAction(issue_action)
+        help_menu.addAction(diagnostics_action)
         #help_menu.addSeparator()
         #help_menu.addAction(about_action)
 
@@ -76,6 +83,7 @@ class SystemTrayIcon(QSystemTrayIcon):
             resource(settings['application']['tray_icon_sync']))
         self.animation.updated.connect(self.update)
         self.animation.setCacheMode(True)
+        self.etas = {}
 
     def update(self):
         if self.parent.core.operations:
@@ -85,6 +93,18 @@ class SystemTrayIcon(QSystemTrayIcon):
             self.animation.setPaused(True)
             self.setIcon(self.icon)
 
+    def set_eta(self, gateway_name, eta):
+        # Gateways sync concurrently so the longest estimate is shown
+        if eta is None:
+            self.etas.pop(gateway_name, None)
+        else:
+            self.etas[gateway_name] = eta
+        if self.etas:
+            self.setToolTip("{} - Syncing ({} left)".format(
+                APP_NAME, naturaldelta(max(self.etas.values()))))
+        else:
+            self.setToolTip(APP_NAME)
+
     def on_click(self, value):
         if value == QSystemTrayIcon.Trigger and sys.platform != 'darwin':
             self.parent.show_main_window()
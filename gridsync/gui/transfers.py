@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+from PyQt5.QtCore import (
+    pyqtSlot, QAbstractTableModel, QModelIndex, Qt, QTimer, QVariant)
+from PyQt5.QtWidgets import (
+    QAbstractItemView, QGridLayout, QHeaderView, QTableView, QWidget)
+
+from gridsync import APP_NAME
+
+
+def get_ranges(rows):
+    # Collapses row numbers into a list of contiguous [first, last] ranges
+    ranges = []
+    for row in sorted(rows):
+        if ranges and row == ranges[-1][1] + 1:
+            ranges[-1][1] = row
+        else:
+            ranges.append([row, row])
+    return ranges
+
+
+class TransferModel(QAbstractTableModel):
+    # The files of a magic-folder that are queued or being transferred.
+    # Updates (i.e., the task indexes emitted by Monitor.tasks_updated) are
+    # applied at most once every 'interval' milliseconds, and only the rows
+    # that actually changed are inserted, removed, or signalled as changed,
+    # so that views only ever repaint (the visible parts of) those rows.
+    headers = ["Name", "Direction", "Status", "Progress"]
+    statuses = {'queued': "Queued", 'started': "In progress"}
+
+    def __init__(self, folder_name, interval=500):
+        super(TransferModel, self).__init__()
+        self.folder_name = folder_name
+        self.keys = []  # The (path, kind) of the task in each row
+        self.rows = {}
+        self.tasks = {}  # (path, kind) -> (status, percent_done)
+        self.pending = None
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.apply_pending)
+
+    def rowCount(self, parent=QModelIndex()):  # pylint: disable=no-self-use
+        if parent.isValid():
+            return 0
+        return len(self.keys)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return QVariant()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.UserRole):
+            return QVariant()
+        path, kind = self.keys[index.row()]
+        status, percent_done = self.tasks[(path, kind)]
+        column = index.column()
+        if role == Qt.UserRole:
+            return percent_done if column == 3 else QVariant()
+        if column == 0:
+            return path
+        elif column == 1:
+            return kind.capitalize()
+        elif column == 2:
+            return self.statuses.get(status, status)
+        elif percent_done is not None:
+            return "{}%".format(int(percent_done))
+        return QVariant()
+
+    @staticmethod
+    def get_active_tasks(tasks):
+        active = {}
+        for key, task in tasks.items():
+            if task['status'] in ('queued', 'started') and \
+                    not task['path'].endswith('/'):
+                active[key] = (task['status'], task.get('percent_done'))
+        return active
+
+    def _remove_rows(self, rows):
+        for first, last in reversed(get_ranges(rows)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self.keys[first:last + 1]
+            self.endRemoveRows()
+        self.rows = {key: row for row, key in enumerate(self.keys)}
+
+    def _insert_rows(self, keys):
+        first = len(self.keys)
+        self.beginInsertRows(QModelIndex(), first, first + len(keys) - 1)
+        for row, key in enumerate(keys, first):
+            self.keys.append(key)
+            self.rows[key] = row
+        self.endInsertRows()
+
+    def set_tasks(self, tasks):
+        active = self.get_active_tasks(tasks)
+        removed = [self.rows[key] for key in self.tasks if key not in active]
+        if removed:
+            self._remove_rows(removed)
+        changed = []
+        added = []
+        for key, value in active.items():
+            if key not in self.rows:
+                added.append(key)
+            elif self.tasks[key] != value:
+                changed.append(self.rows[key])
+        self.tasks = active
+        for first, last in get_ranges(changed):
+            self.dataChanged.emit(self.index(first, 2), self.index(last, 3))
+        if added:
+            self._insert_rows(added)
+
+    def apply_pending(self):
+        tasks, self.pending = self.pending, None
+        if tasks is not None:
+            self.set_tasks(tasks)
+
+    @pyqtSlot(str, object)
+    def on_tasks_updated(self, folder_name, tasks):
+        if folder_name != self.folder_name:
+            return
+        self.pending = tasks
+        if not self.timer.isActive():
+            self.timer.start()
+
+
+class TransferWidget(QWidget):
+    def __init__(self, monitor, folder_name):
+        super(TransferWidget, self).__init__()
+        self.monitor = monitor
+        self.folder_name = folder_name
+        self.setWindowTitle("{} - {} - Transfers".format(
+            APP_NAME, folder_name))
+        self.resize(600, 400)
+
+        self.model = TransferModel(folder_name)
+        self.receiving = False
+
+        self.view = QTableView(self)
+        self.view.setModel(self.model)
+        self.view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.view.setSelectionMode(QAbstractItemView.NoSelection)
+        self.view.setShowGrid(False)
+        self.view.verticalHeader().hide()
+        # Fixed row heights spare the view from measuring every row
+        self.view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.view.horizontalHeader().setSectionResizeMode(
+            0, QHeaderView.Stretch)
+
+        layout = QGridLayout(self)
+        layout.addWidget(self.view)
+
+    def showEvent(self, event):
+        # Updates are only received while the widget is shown
+        if not self.receiving:
+            self.model.set_tasks(
+                self.monitor.status[self.folder_name].get('tasks', {}))
+            self.monitor.tasks_updated.connect(self.model.on_tasks_updated)
+            self.receiving = True
+        super(TransferWidget, self).showEvent(event)
+
+    def closeEvent(self, event):
+        if self.receiving:
+            self.monitor.tasks_updated.disconnect(self.model.on_tasks_updated)
+            self.receiving = False
+        super(TransferWidget, self).closeEvent(event)
@@ -824,16 +824,10 @@ class InviteReceiver(QWidget):
             collective, personal = message['magic-folder-code'].split('+')
             basename = message['magic-folder-name']
             self.update_progress(4, 'Joining folder "{}"...'.format(basename))
-            yield tahoe.link(
-                tahoe.get_rootcap(),
-                basename + ' (collective)',
-                collective
-            )
-            yield tahoe.link(
-                tahoe.get_rootcap(),
-                basename + ' (personal)',
-                personal
-            )
+            yield tahoe.link_to_rootcap({
+                basename + ' (collective)': collective,
+                basename + ' (personal)': personal
+            })
             self.update_progress(
                 5, 'Successfully joined folder "{}"!\n"{}" is now available '
                 'for download'.format(basename, basename))
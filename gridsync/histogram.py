@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+from bisect import bisect_left
+
+
+# The upper bounds (in seconds) of each bucket; values greater than the last
+# bound are counted in an additional overflow bucket
+DEFAULT_BOUNDS = (
+    0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+
+
+class Histogram(object):
+    # Counts values (i.e., durations) in fixed buckets so that memory use
+    # stays constant no matter how many are recorded; percentiles are thus
+    # approximate (reported as the upper bound of the bucket they fall in)
+    def __init__(self, bounds=DEFAULT_BOUNDS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def get_mean(self):
+        if not self.count:
+            return None
+        return self.total / float(self.count)
+
+    def get_percentile(self, percentile):
+        if not self.count:
+            return None
+        target = self.count * percentile / 100.0
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target and count:
+                if i < len(self.bounds):
+                    return min(self.bounds[i], self.max)
+                return self.max
+        return self.max
+
+    def to_dict(self):
+        return {
+            'bounds': list(self.bounds),
+            'counts': list(self.counts),
+            'count': self.count,
+            'total': self.total,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.get_percentile(50),
+            'p90': self.get_percentile(90),
+            'p99': self.get_percentile(99)
+        }
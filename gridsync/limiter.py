@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+import heapq
+import itertools
+import logging
+
+from twisted.internet.defer import Deferred, maybeDeferred
+
+
+INTERACTIVE = 0  # Operations a user is actively waiting on
+NORMAL = 1
+BACKGROUND = 2  # Operations nobody is waiting on (scans, subclients, etc.)
+
+
+class Limiter(object):
+    # Runs callables with at most 'limit' of them in progress at once; calls
+    # over the limit are queued and dispatched in order of priority (lower
+    # values first) and then in the order in which they were made.
+    def __init__(self, limit=4, name='limiter'):
+        self.limit = limit
+        self.name = name
+        self.active = 0
+        self.queue = []
+        self.counter = itertools.count()
+        self.completed = 0
+        self.max_queue_depth = 0
+
+    def get_queue_depth(self):
+        return sum(1 for _, _, d in self.queue if not d.called)
+
+    def get_metrics(self):
+        return {
+            'limit': self.limit,
+            'active': self.active,
+            'queued': self.get_queue_depth(),
+            'max_queue_depth': self.max_queue_depth,
+            'completed': self.completed
+        }
+
+    def acquire(self, priority=NORMAL):
+        d = Deferred()
+        if self.active < self.limit:
+            self.active += 1
+            d.callback(None)
+        else:
+            heapq.heappush(self.queue, (priority, next(self.counter), d))
+            depth = self.get_queue_depth()
+            if depth > self.max_queue_depth:
+                self.max_queue_depth = depth
+            logging.debug("%s: %i active; %i queued", self.name, self.active,
+                          depth)
+        return d
+
+    def escalate(self, d, priority):
+        # Raises the priority of the waiter 'd' (as returned by 'acquire' or
+        # 'run') to 'priority' if it is still queued at a lower one
+        for i, (queued_priority, count, waiter) in enumerate(self.queue):
+            if waiter is d:
+                if priority < queued_priority:
+                    self.queue[i] = (priority, count, waiter)
+                    heapq.heapify(self.queue)
+                return
+
+    def release(self):
+        self.completed += 1
+        while self.queue:
+            _, _, d = heapq.heappop(self.queue)
+            if not d.called:  # Skip waiters that have been cancelled
+                d.callback(None)  # Hand the slot over to the next waiter
+                return
+        self.active -= 1
+
+    def run(self, priority, f, *args, **kwargs):
+        def _release(result):
+            self.release()
+            return result
+
+        def _run(_):
+            d = maybeDeferred(f, *args, **kwargs)
+            d.addBoth(_release)
+            return d
+
+        return self.acquire(priority).addCallback(_run)
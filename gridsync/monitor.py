@@ -1,52 +1,102 @@
 # -*- coding: utf-8 -*-
 
 import logging
+import os
+import time
 from collections import defaultdict
 
 from PyQt5.QtCore import pyqtSignal, QObject
-from twisted.internet.defer import inlineCallbacks
+from twisted.internet import reactor
+from twisted.internet.defer import inlineCallbacks, maybeDeferred
 from twisted.internet.task import LoopingCall
 
+from gridsync.failures import FailureTracker
+from gridsync.histogram import Histogram
+from gridsync.preferences import get_preference
+from gridsync.scheduler import get_scheduler
+from gridsync.throughput import ThroughputEstimator
+from gridsync.timeseries import GridHistory
+from gridsync.watcher import Watcher
+
+
+# Maps the status of a magic-folder task to the event emitted (by
+# Monitor.file_events) when a file's task enters that status
+FILE_EVENTS = {
+    'queued': 'queued',
+    'started': 'started',
+    'success': 'succeeded',
+    'failure': 'failed'
+}
+
 
 class Monitor(QObject):
 
     connected = pyqtSignal(str)
     disconnected = pyqtSignal(str)
+    unresponsive = pyqtSignal(str)
+    responsive = pyqtSignal(str)
     nodes_updated = pyqtSignal(int, int)
     space_updated = pyqtSignal(object)
     data_updated = pyqtSignal(str, object)
-    status_updated = pyqtSignal(str, int)
-    mtime_updated = pyqtSignal(str, int)
-    size_updated = pyqtSignal(str, int)
     member_added = pyqtSignal(str, str)
     first_sync_started = pyqtSignal(str)
     sync_started = pyqtSignal(str)
     sync_finished = pyqtSignal(str)
     files_updated = pyqtSignal(str, list)
+    batch_updated = pyqtSignal(object)
+    file_events = pyqtSignal(str, list)
+    failures_updated = pyqtSignal(str, int)
+    conflicts_updated = pyqtSignal(str, list)
+    eta_updated = pyqtSignal(str, object)
+    tasks_updated = pyqtSignal(str, object)
     check_finished = pyqtSignal()
     remote_folder_added = pyqtSignal(str, dict, str)
+    remote_folder_removed = pyqtSignal(str)
 
     def __init__(self, gateway):
         super(Monitor, self).__init__()
         self.gateway = gateway
         self.status = defaultdict(dict)
+        self.failures = {}
+        self.throughput = ThroughputEstimator()
+        self.folder_throughput = {}
+        self.remaining = {}
+        self.etas = {}
+        self.latency = {}
         self.members = []
-        self.timer = LoopingCall(self.check_status)
         self.num_connected = 0
         self.num_happy = 0
         self.is_connected = False
+        self.is_responsive = True
         self.available_space = 0
-        self.known_folders = []
+        self.history = GridHistory()
+        self.known_folders = set()
+        self.rootcap_folders = {}
+        self.rootcap_timer = LoopingCall(self.refresh_rootcap)
+        self.last_activity = {}
+        self.suspended = set()
+        self.starting = set()
+        self.watcher = Watcher()
+        self.watcher.folder_changed.connect(self.on_local_change)
+        self.clock = reactor
+        self.check_delay = 0.5
+        self.pending_checks = {}
+        self.updates = {}
+        self.in_check = False
+        self.last_full_check = 0
 
     def add_updated_file(self, folder_name, path):
-        if 'updated_files' not in self.status[folder_name]:
-            self.status[folder_name]['updated_files'] = []
-        if path in self.status[folder_name]['updated_files']:
+        status = self.status[folder_name]
+        if 'updated_files' not in status:
+            status['updated_files'] = []
+            status['updated_paths'] = set()
+        if path in status['updated_paths']:
             return
         elif path.endswith('/') or path.endswith('~') or path.isdigit():
             return
         else:
-            self.status[folder_name]['updated_files'].append(path)
+            status['updated_files'].append(path)
+            status['updated_paths'].add(path)
             logging.debug("Added %s to updated_files list", path)
 
     def notify_updated_files(self, folder_name):
@@ -54,9 +104,37 @@ class Monitor(QObject):
             updated_files = self.status[folder_name]['updated_files']
             if updated_files:
                 self.status[folder_name]['updated_files'] = []
+                self.status[folder_name]['updated_paths'] = set()
                 logging.debug("Cleared updated_files list")
                 self.files_updated.emit(folder_name, updated_files)
 
+    @staticmethod
+    def index_tasks(status):
+        # Keys each of a magic-folder's tasks by (path, kind) so that
+        # successive statuses can be compared in linear time
+        if not status:
+            return {}
+        return {(task['path'], task['kind']): task for task in status}
+
+    @staticmethod
+    def diff_tasks(prev_tasks, tasks):
+        # Returns the tasks (in 'tasks') that are new or have changed since
+        # 'prev_tasks' along with a (path, kind, event) tuple for each one
+        # whose status is new, where 'event' is one of FILE_EVENTS' values
+        changed = []
+        events = []
+        for key, task in tasks.items():
+            prev_task = prev_tasks.get(key)
+            if prev_task == task:
+                continue
+            changed.append(task)
+            event = FILE_EVENTS.get(task['status'])
+            if not event:
+                continue
+            if not prev_task or prev_task['status'] != task['status']:
+                events.append((task['path'], task['kind'], event))
+        return changed, events
+
     @staticmethod
     def parse_status(status):
         state = 0
@@ -82,69 +160,278 @@ class Monitor(QObject):
     def process_magic_folder_status(self, name, status):
         remote_scan_needed = False
         prev = self.status[name]
-        state, kind, filepath, _ = self.parse_status(status)
+        if status is None and 'state' in prev:
+            # The poll failed (timeout, open circuit, stopped subclient);
+            # keep the last known state and tasks so that the next
+            # successful poll isn't compared against "Initializing" and an
+            # empty index (re-emitting sync_started and every task)
+            return remote_scan_needed
+        state = self.parse_status(status)[0]
+        prev_tasks = prev.get('tasks', {})
+        tasks = self.index_tasks(status)
+        changed, events = self.diff_tasks(prev_tasks, tasks)
         if status and prev:
-            if state == 1:  # "Syncing"
-                if prev['state'] == 0:  # First sync after restoring
-                    self.first_sync_started.emit(name)
-                if prev['state'] != 1:  # Sync just started
-                    logging.debug("Sync started (%s)", name)
-                    self.sync_started.emit(name)
-                elif prev['state'] == 1:  # Sync started earlier; still going
-                    logging.debug("Sync in progress (%s)", name)
-                    logging.debug("%sing %s...", kind, filepath)
-                    for item in status:
-                        if item not in prev['status']:
-                            self.add_updated_file(name, item['path'])
-            elif state == 2 and prev['state'] == 1:  # Sync just finished
-                logging.debug("Sync complete (%s)", name)
-                self.sync_finished.emit(name)
-                self.notify_updated_files(name)
-            if state in (1, 2) and prev['state'] != 2:
-                remote_scan_needed = True
+            remote_scan_needed = self.emit_sync_changes(
+                name, state, prev['state'], changed, events)
+        self.emit_task_changes(name, tasks, prev_tasks, changed, events)
         self.status[name]['status'] = status
+        self.status[name]['tasks'] = tasks
         self.status[name]['state'] = state
-        self.status_updated.emit(name, state)
-        # TODO: Notify failures/conflicts
+        self.queue_update(name, 'status', state)
+        self.update_eta(name, tasks, events)
         return remote_scan_needed
 
+    def emit_sync_changes(self, name, state, prev_state, changed, events):
+        # Returns True if the folder's remote contents need to be rescanned
+        if state == 1:  # "Syncing"
+            if prev_state == 0:  # First sync after restoring
+                self.first_sync_started.emit(name)
+            if prev_state != 1:  # Sync just started
+                logging.debug("Sync started (%s)", name)
+                self.get_throughput_estimator(name).reset()
+                self.sync_started.emit(name)
+            else:  # Sync started earlier; still going
+                logging.debug("Sync in progress (%s)", name)
+                for task in changed:
+                    self.add_updated_file(name, task['path'])
+        elif state == 2 and prev_state == 1:  # Sync just finished
+            logging.debug("Sync complete (%s)", name)
+            self.sync_finished.emit(name)
+            self.notify_updated_files(name)
+        elif state == 2 and self.has_succeeded(events):
+            self.on_missed_sync(name, changed)
+            return True
+        return state in (1, 2) and prev_state != 2
+
+    @staticmethod
+    def has_succeeded(events):
+        return any(event == 'succeeded' for _, _, event in events)
+
+    def on_missed_sync(self, name, changed):
+        # Transfers can start and finish between two checks (particularly
+        # while folders are idle; see is_idle) so that the folder is never
+        # seen "Syncing"; they're reported as a sync all the same
+        logging.debug("Sync started and completed between checks (%s)", name)
+        self.sync_started.emit(name)
+        for task in changed:
+            if task['status'] == 'success':
+                self.add_updated_file(name, task['path'])
+        self.sync_finished.emit(name)
+        self.notify_updated_files(name)
+
+    def emit_task_changes(self, name, tasks, prev_tasks, changed, events):
+        if changed or len(tasks) != len(prev_tasks):
+            self.tasks_updated.emit(name, tasks)
+        if events:
+            self.file_events.emit(name, events)
+            self.track_failures(name, events)
+            self.record_latency(name, tasks, events)
+        self.track_conflicts(name, events)
+
+    def get_failure_tracker(self, name):
+        if name not in self.failures:
+            self.failures[name] = FailureTracker(name)
+        return self.failures[name]
+
+    def track_failures(self, name, events):
+        # Since only changes in a task's status produce events, a failure
+        # that is still listed in subsequent polls is only counted once
+        tracker = self.get_failure_tracker(name)
+        changed = False
+        for path, _, event in events:
+            if event == 'failed':
+                changed = tracker.add(path) or changed
+            elif event == 'succeeded':
+                changed = tracker.resolve(path) or changed
+        if changed:
+            self.failures_updated.emit(name, len(tracker))
+            self.queue_update(name, 'failures', len(tracker))
+
+    def get_conflict_path(self, name, path):
+        # Tahoe-LAFS writes a download that conflicts with a local change to
+        # "<path>.conflict", leaving the local file itself untouched
+        directory = self.gateway.get_magic_folder_directory(name)
+        if not directory:
+            return None
+        return os.path.join(directory, path + '.conflict')
+
+    def is_conflicted(self, name, path):
+        conflict_path = self.get_conflict_path(name, path)
+        return bool(conflict_path) and os.path.exists(conflict_path)
+
+    def track_conflicts(self, name, events):
+        # A conflict is resolved once its ".conflict" file is (re)moved
+        tracker = self.get_failure_tracker(name)
+        changed = False
+        for path in tracker.get_conflicts():
+            if not self.is_conflicted(name, path):
+                changed = tracker.resolve_conflict(path) or changed
+        for path, kind, event in events:
+            if kind == 'download' and event == 'succeeded' \
+                    and self.is_conflicted(name, path):
+                changed = tracker.add_conflict(path) or changed
+        if changed:
+            conflicts = tracker.get_conflicts()
+            self.conflicts_updated.emit(name, conflicts)
+            self.queue_update(name, 'conflicts', len(conflicts))
+
+    def get_latency_histogram(self, name, kind, metric):
+        key = (name, kind, metric)
+        if key not in self.latency:
+            self.latency[key] = Histogram()
+        return self.latency[key]
+
+    def record_latency(self, name, tasks, events):
+        # Records, for each completed task, how long it waited in the queue
+        # ('queue_wait') and how long the transfer itself took ('transfer')
+        for path, kind, event in events:
+            if event != 'succeeded':
+                continue
+            task = tasks[(path, kind)]
+            queued_at = task.get('queued_at')
+            started_at = task.get('started_at')
+            success_at = task.get('success_at')
+            if queued_at and started_at:
+                self.get_latency_histogram(name, kind, 'queue_wait').add(
+                    max(started_at - queued_at, 0))
+            if started_at and success_at:
+                self.get_latency_histogram(name, kind, 'transfer').add(
+                    max(success_at - started_at, 0))
+
+    def get_latency_stats(self):
+        stats = {}
+        for (name, kind, metric), histogram in self.latency.items():
+            folder_stats = stats.setdefault(name, {})
+            folder_stats.setdefault(kind, {})[metric] = histogram.to_dict()
+        return stats
+
+    def get_throughput_estimator(self, name):
+        if name not in self.folder_throughput:
+            self.folder_throughput[name] = ThroughputEstimator()
+        return self.folder_throughput[name]
+
+    @staticmethod
+    def get_remaining(tasks):
+        # Returns the number of bytes (where known) and files still to be
+        # transferred; older nodes don't report sizes or 'percent_done'
+        remaining_size = 0
+        remaining_files = 0
+        for task in tasks.values():
+            if task['status'] not in ('queued', 'started') or \
+                    task['path'].endswith('/'):
+                continue
+            remaining_files += 1
+            size = task.get('size') or 0
+            percent_done = task.get('percent_done') or 0
+            remaining_size += int(size * (100 - percent_done) / 100)
+        return remaining_size, remaining_files
+
+    def update_eta(self, name, tasks, events):
+        estimator = self.get_throughput_estimator(name)
+        for path, kind, event in events:
+            if event == 'succeeded' and not path.endswith('/'):
+                task = tasks[(path, kind)]
+                estimator.add(task.get('size'), task.get('success_at'))
+                self.throughput.add(task.get('size'), task.get('success_at'))
+        self.remaining[name] = self.get_remaining(tasks)
+        eta = estimator.get_eta(*self.remaining[name])
+        if eta != self.etas.get(name):
+            self.etas[name] = eta
+            self.eta_updated.emit(name, eta)
+            self.queue_update(name, 'eta', eta)
+
+    def get_eta(self):
+        # The estimated number of seconds until all of the gateway's
+        # folders are in sync, or None
+        remaining_size = sum(r[0] for r in self.remaining.values())
+        remaining_files = sum(r[1] for r in self.remaining.values())
+        return self.throughput.get_eta(remaining_size, remaining_files)
+
+    def update_catalog(self, name, members, files):
+        catalog = self.gateway.get_catalog()
+        for member, member_files in files.items():
+            catalog.update_member(name, member, member_files)
+        if members:
+            names = [member[0] for member in members]
+            for member in catalog.get_members(name):
+                if member not in names:
+                    catalog.remove_member(name, member)
+        size = catalog.get_total_size(name)
+        mtime = catalog.get_latest_mtime(name)
+        self.queue_update(name, 'size', size)
+        self.queue_update(name, 'mtime', mtime)
+
     @inlineCallbacks
     def do_remote_scan(self, name, members=None):
-        mems, size, t, _ = yield self.gateway.get_magic_folder_info(
+        mems, _, _, files = yield self.gateway.get_magic_folder_info(
             name, members)
         if mems and len(mems) > 1:
             for member in mems:
                 if member not in self.members:
                     self.member_added.emit(name, member[0])
                     self.members.append(member)
-        self.size_updated.emit(name, size)
-        self.mtime_updated.emit(name, t)
+        self.update_catalog(name, mems, files)
 
     @inlineCallbacks
     def scan_rootcap(self, overlay_file=None):
         logging.debug("Scanning %s rootcap...", self.gateway.name)
         folders = yield self.gateway.get_magic_folders_from_rootcap()
-        if not folders:
+        if folders is None:
             return
-        known = list(self.gateway.magic_folders.keys()) + self.known_folders
-        for name, caps in folders.items():
-            if name not in known:
+        local = self.gateway.magic_folders
+        removed = set(self.rootcap_folders) - set(folders)
+        self.rootcap_folders = folders
+        for name in removed & self.known_folders:
+            if name not in local:
                 logging.debug(
-                    "Found new folder '%s' in rootcap; adding...", name)
-                self.known_folders.append(name)
-                self.remote_folder_added.emit(name, caps, overlay_file)
-                c = yield self.gateway.get_json(caps['collective'])
-                members = yield self.gateway.get_magic_folder_members(name, c)
-                yield self.do_remote_scan(name, members)
+                    "Folder '%s' was removed from rootcap; removing...", name)
+                self.known_folders.discard(name)
+                self.gateway.get_catalog().remove_folder(name)
+                self.remote_folder_removed.emit(name)
+        # Only folders that haven't been seen before need their collectives
+        # fetched and scanned
+        for name in set(folders) - set(local) - self.known_folders:
+            caps = folders[name]
+            logging.debug("Found new folder '%s' in rootcap; adding...", name)
+            self.known_folders.add(name)
+            self.remote_folder_added.emit(name, caps, overlay_file)
+            c = yield self.gateway.get_json(caps['collective'])
+            members = yield self.gateway.get_magic_folder_members(name, c)
+            yield self.do_remote_scan(name, members)
+
+    @staticmethod
+    def get_rootcap_interval():
+        # Number of seconds between periodic rescans of the rootcap (for
+        # folders that were added or removed from another device) and of
+        # suspended folders (for changes made by other members)
+        try:
+            return int(get_preference('magic_folders', 'rootcap_interval'))
+        except (TypeError, ValueError):
+            return 60
+
+    def refresh_rootcap(self):
+        # Errors must not propagate to 'rootcap_timer'; an unhandled error
+        # would stop the LoopingCall for the rest of the session
+        if not self.is_connected:
+            return None
+        d = maybeDeferred(self.scan_rootcap)
+        d.addCallback(lambda _: self.check_suspended_folders())
+        d.addErrback(lambda f: logging.error(
+            "Error scanning %s rootcap: %s", self.gateway.name, f.value))
+        return d
 
     @inlineCallbacks
     def check_grid_status(self):
         results = yield self.gateway.get_grid_status()
         if results:
             num_connected, _, available_space = results
+            server_states = self.gateway.server_states
         else:
             num_connected = 0
             available_space = 0
+            server_states = {}
+        self.history.add(
+            num_connected, available_space, server_states, time.time())
         if available_space != self.available_space:
             self.available_space = available_space
             self.space_updated.emit(available_space)
@@ -164,16 +451,195 @@ class Monitor(QObject):
                     self.disconnected.emit(self.gateway.name)
             self.num_connected = num_connected
             self.num_happy = num_happy
+        self.check_responsiveness()
+
+    def check_responsiveness(self):
+        is_responsive = not self.gateway.breaker.is_open()
+        if is_responsive != self.is_responsive:
+            self.is_responsive = is_responsive
+            if is_responsive:
+                self.responsive.emit(self.gateway.name)
+            else:
+                self.unresponsive.emit(self.gateway.name)
+
+    @staticmethod
+    def get_idle_timeout():
+        # Number of seconds after which the subclient of a folder that has
+        # not seen any activity will be stopped; 0 (the default) disables
+        try:
+            return int(get_preference('magic_folders', 'idle_timeout'))
+        except (TypeError, ValueError):
+            return 0
+
+    @staticmethod
+    def get_idle_poll_interval():
+        # Number of seconds between status checks of folders while all of
+        # them are up to date; local changes are checked for immediately
+        try:
+            return int(get_preference('magic_folders', 'idle_poll_interval'))
+        except (TypeError, ValueError):
+            return 10
+
+    def watch_folder(self, name):
+        if not self.watcher.is_watching(name):
+            self.watcher.add_folder(
+                name, self.gateway.get_magic_folder_directory(name))
+
+    def wake_folder(self, name):
+        if name in self.suspended:
+            logging.debug("Waking suspended folder (%s)", name)
+            self.suspended.discard(name)
+        if not self.gateway.is_magic_folder_running(name) and \
+                name not in self.starting:
+            self._start_subclient(name)
+
+    def on_local_change(self, name):
+        self.last_activity[name] = time.time()
+        self.wake_folder(name)
+        self.schedule_folder_check(name)
+
+    def schedule_folder_check(self, name):
+        # Changes tend to arrive in bursts (e.g., a file being written or a
+        # directory being copied) so the check is put off until none have
+        # been seen for 'check_delay' seconds
+        delayed_call = self.pending_checks.get(name)
+        if delayed_call and delayed_call.active():
+            delayed_call.reset(self.check_delay)
+        else:
+            self.pending_checks[name] = self.clock.callLater(
+                self.check_delay, self.check_folder, name)
+
+    @inlineCallbacks
+    def check_folder(self, name):
+        self.pending_checks.pop(name, None)
+        if name not in self.gateway.magic_folders or \
+                not self.is_folder_active(name):
+            return
+        logging.debug("Checking %s after local change", name)
+        status = yield self.gateway.get_magic_folder_status(name)
+        if self.process_magic_folder_status(name, status):
+            yield self.do_remote_scan(name)
+
+    @inlineCallbacks
+    def suspend_folder(self, name):
+        logging.debug("Suspending idle folder (%s)", name)
+        self.suspended.add(name)
+        self.watch_folder(name)
+        yield self.gateway.stop_magic_folder_subclient(name)
+
+    def _start_subclient(self, name):
+        self.starting.add(name)
+        d = maybeDeferred(self.gateway.start_magic_folder_subclient, name)
+        d.addCallback(lambda _: self.schedule_folder_check(name))
+        d.addErrback(
+            lambda f: logging.error("Error starting %s: %s", name, f.value))
+        d.addBoth(lambda _: self.starting.discard(name))
+
+    @inlineCallbacks
+    def check_suspended_folders(self):
+        # Suspended folders (and those whose subclients haven't been started
+        # yet) are woken if another member has changed them since they were
+        # last scanned; the scan only needs the gateway, not the subclient
+        catalog = self.gateway.get_catalog()
+        for name in sorted(self.suspended):
+            if name not in self.gateway.magic_folders:
+                self.suspended.discard(name)
+                continue
+            latest_mtime = catalog.get_latest_mtime(name)
+            yield self.do_remote_scan(name)
+            if catalog.get_latest_mtime(name) > latest_mtime:
+                logging.debug("Remote change detected in %s", name)
+                self.wake_folder(name)
+
+    def is_folder_active(self, name):
+        if self.gateway.is_magic_folder_paused(name):
+            self.suspended.discard(name)
+            self.watcher.remove_folder(name)
+            if self.status[name].get('state') != 4:
+                self.status[name]['state'] = 4  # "Paused"
+                self.queue_update(name, 'status', 4)
+            return False
+        self.watch_folder(name)
+        if name in self.suspended or name in self.starting:
+            return False
+        if not self.gateway.is_magic_folder_running(name):
+            # Subclients are only started when they're needed (see
+            # wake_folder); until then their folders count as suspended
+            self.suspended.add(name)
+            return False
+        return True
+
+    def check_idle(self, name, idle_timeout):
+        now = time.time()
+        if self.status[name].get('state') == 1 or \
+                name not in self.last_activity:
+            self.last_activity[name] = now
+        elif idle_timeout and self.status[name].get('state') == 2 \
+                and self.gateway.get_magic_folder_client(name) \
+                and now - self.last_activity[name] > idle_timeout:
+            d = self.suspend_folder(name)
+            d.addErrback(lambda f: logging.error(
+                "Error suspending %s: %s", name, f.value))
+
+    def is_idle(self, folders):
+        # Folders that are up to date (and in whose local directories every
+        # change is reported as it happens) only need to be checked every so
+        # often, for remote changes. Polled directories (see Watcher) don't
+        # qualify since their changes are only noticed 'poll_interval' later
+        if time.time() - self.last_full_check >= \
+                self.get_idle_poll_interval():
+            return False
+        for folder in folders:
+            if self.status[folder].get('state') != 2 or \
+                    not self.watcher.is_watching(folder) or \
+                    self.watcher.is_polling(folder):
+                return False
+        return True
+
+    def queue_update(self, name, key, value):
+        # Changes to folders' status, size, etc. are delivered together (by
+        # batch_updated) at the end of each status check -- or, for changes
+        # made outside of one, on the next turn of the event loop -- so that
+        # the Model can apply them all in a single pass
+        if not self.updates and not self.in_check:
+            self.clock.callLater(0, self.flush_updates)
+        self.updates.setdefault(name, {})[key] = value
+
+    def flush_updates(self):
+        if self.updates:
+            updates, self.updates = self.updates, {}
+            self.batch_updated.emit(updates)
 
     @inlineCallbacks
     def check_status(self):
+        self.in_check = True
+        try:
+            yield self._check_status()
+        finally:
+            self.in_check = False
+            self.flush_updates()
+        self.check_finished.emit()
+
+    @inlineCallbacks
+    def _check_status(self):
         yield self.check_grid_status()
-        for folder in list(self.gateway.magic_folders.keys()):
-            status = yield self.gateway.get_magic_folder_status(folder)
+        idle_timeout = self.get_idle_timeout()
+        folders = [f for f in list(self.gateway.magic_folders.keys())
+                   if self.is_folder_active(f)]
+        if self.is_idle(folders):
+            return
+        self.last_full_check = time.time()
+        statuses = yield self.gateway.get_magic_folders_status(folders)
+        for folder in folders:
+            status = statuses.get(folder)
             scan_needed = self.process_magic_folder_status(folder, status)
             if scan_needed:
                 yield self.do_remote_scan(folder)
-        self.check_finished.emit()
+            self.check_idle(folder, idle_timeout)
 
-    def start(self, interval=2):
-        self.timer.start(interval, now=True)
+    def start(self, scheduler=None):
+        # Status checks are run by the (shared) MonitorScheduler
+        (scheduler or get_scheduler()).add(self)
+        rootcap_interval = self.get_rootcap_interval()
+        if rootcap_interval:
+            self.rootcap_timer.start(rootcap_interval, now=False)
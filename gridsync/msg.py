@@ -22,3 +22,14 @@ def error(parent, title, text, detailed_text=None):
     msg.setDetailedText(detailed_text)
     logging.error(text)
     return msg.exec_()
+
+
+def question(parent, title, text, detailed_text=None):
+    msg = QMessageBox(parent)
+    msg.setIcon(QMessageBox.Question)
+    msg.setWindowTitle(title)
+    msg.setText(text)
+    msg.setDetailedText(detailed_text)
+    msg.setStandardButtons(QMessageBox.Yes | QMessageBox.No)
+    msg.setDefaultButton(QMessageBox.Yes)
+    return msg.exec_() == QMessageBox.Yes
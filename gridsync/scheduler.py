@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+from twisted.internet import reactor
+from twisted.internet.task import LoopingCall
+
+from gridsync import settings as app_settings
+from gridsync.limiter import Limiter, NORMAL
+
+
+def get_check_limit():
+    try:
+        return int(app_settings['tahoe']['max_concurrent_checks'])
+    except (KeyError, TypeError, ValueError):
+        return 2
+
+
+class MonitorScheduler(object):
+    # Runs the periodic status checks of every gateway's Monitor from a single
+    # timer. Each Monitor is still checked once every 'interval' seconds but
+    # the checks are staggered evenly across that interval (rather than all
+    # firing at once), no more than 'limit' of them are run at a time, and a
+    # Monitor whose previous check hasn't finished yet is skipped.
+    def __init__(self, interval=2, limit=2, clock=None):
+        self.interval = interval
+        self.limiter = Limiter(limit, 'monitor checks')
+        self.clock = clock or reactor
+        self.monitors = []
+        self.checking = set()
+        self.next_index = 0
+        self.skipped = 0
+        self.timer = None
+
+    def _restart_timer(self):
+        if self.timer and self.timer.running:
+            self.timer.stop()
+        self.timer = None
+        if self.monitors:
+            self.timer = LoopingCall(self.tick)
+            self.timer.clock = self.clock
+            self.timer.start(self.interval / float(len(self.monitors)),
+                             now=False)
+
+    def add(self, monitor):
+        if monitor in self.monitors:
+            return
+        self.monitors.append(monitor)
+        self._restart_timer()
+        self.check(monitor)  # Don't wait for the new Monitor's first turn
+
+    def remove(self, monitor):
+        if monitor not in self.monitors:
+            return
+        self.monitors.remove(monitor)
+        self.next_index = 0
+        self._restart_timer()
+
+    def check(self, monitor):
+        if monitor in self.checking:
+            self.skipped += 1
+            logging.debug("Previous check of %s still running; skipping",
+                          monitor.gateway.name)
+            return None
+        self.checking.add(monitor)
+        d = self.limiter.run(NORMAL, monitor.check_status)
+        d.addErrback(lambda f: logging.error(
+            "Error checking %s: %s", monitor.gateway.name, f.value))
+        d.addBoth(lambda _: self.checking.discard(monitor))
+        return d
+
+    def tick(self):
+        if not self.monitors:
+            return
+        self.next_index %= len(self.monitors)
+        monitor = self.monitors[self.next_index]
+        self.next_index += 1
+        self.check(monitor)
+
+
+_scheduler = None
+
+
+def get_scheduler():
+    global _scheduler  # pylint: disable=global-statement
+    if _scheduler is None:
+        _scheduler = MonitorScheduler(limit=get_check_limit())
+    return _scheduler
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+import os
+
+
+class Snapshot(object):
+    # The last-known state of a gateway's folders (as shown in the main
+    # window) saved to disk so that the window can be populated from it
+    # immediately on the next launch, long before the first poll completes
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            if os.path.exists(self.path):
+                logging.warning("Error loading snapshot: %s", str(e))
+            return {}
+
+    def save(self, state):
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.path)  # So that a crash can't corrupt it
+        except OSError as e:
+            logging.warning("Error saving snapshot: %s", str(e))
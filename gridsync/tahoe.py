@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import errno
+import hashlib
 import json
 import logging as log
 import os
@@ -14,19 +15,67 @@ from io import BytesIO
 import treq
 from twisted.internet import reactor
 from twisted.internet.defer import (
-    Deferred, DeferredLock, gatherResults, inlineCallbacks, returnValue)
+    Deferred, DeferredList, DeferredLock, gatherResults, inlineCallbacks, maybeDeferred,
+    returnValue, TimeoutError)
+from twisted.internet.endpoints import UNIXClientEndpoint
 from twisted.internet.error import ConnectError, ProcessDone
 from twisted.internet.protocol import ProcessProtocol
 from twisted.internet.task import deferLater
 from twisted.python.procutils import which
+from twisted.web.client import Agent, HTTPConnectionPool
+from twisted.web.iweb import IAgentEndpointFactory
+from zope.interface import implementer
 import yaml
 
-from gridsync import pkgdir
+from gridsync import decoder, pkgdir, settings as app_settings
+from gridsync.breaker import CircuitBreaker, CircuitOpenError
+from gridsync.catalog import Catalog
 from gridsync.config import Config
 from gridsync.errors import NodedirExistsError
+from gridsync.limiter import Limiter, BACKGROUND, INTERACTIVE, NORMAL
 from gridsync.util import dehumanized_size
 
 
+def get_spawn_limit():
+    try:
+        return int(app_settings['tahoe']['max_concurrent_commands'])
+    except (KeyError, TypeError, ValueError):
+        return os.cpu_count() or 2
+
+
+def get_sun_path_max():
+    # The size of sockaddr_un.sun_path; a UNIX socket path (along with its
+    # terminating NUL byte) has to fit within it
+    if sys.platform.startswith('linux'):
+        return 108
+    return 104  # macOS and the BSDs
+
+
+def get_rootcap_layout():
+    # 'sharded' spreads the rootcap's folder entries across 16 subdirectories
+    # (by the first hex digit of the SHA-256 hash of each folder's name) so
+    # that linking a folder only rewrites a directory 1/16th the size
+    try:
+        return app_settings['tahoe']['rootcap_layout'] or 'flat'
+    except KeyError:
+        return 'flat'
+
+
+# Every tahoe subprocess is spawned through this limiter so that starting or
+# stopping dozens of nodes at once can't turn into a fork-and-import storm
+spawn_limiter = Limiter(get_spawn_limit(), 'spawn_limiter')
+
+
+@implementer(IAgentEndpointFactory)
+class UNIXSocketEndpointFactory(object):
+    # Connects every request to the socket at 'path', whatever its URL
+    def __init__(self, path):
+        self.path = path
+
+    def endpointForURI(self, _):
+        return UNIXClientEndpoint(reactor, self.path)
+
+
 def is_valid_furl(furl):
     return re.match(r'^pb://[a-z2-7]+@[a-zA-Z0-9\.:,-]+:\d+/[a-z2-7]+$', furl)
 
@@ -57,6 +106,10 @@ class TahoeWebError(TahoeError):
     pass
 
 
+class TahoeUnresponsiveError(TahoeWebError):
+    pass
+
+
 class CommandProtocol(ProcessProtocol):
     def __init__(self, parent, callback_trigger=None):
         self.parent = parent
@@ -105,6 +158,29 @@ class Tahoe(object):  # pylint: disable=too-many-public-methods
         self.lock = DeferredLock()
         self.rootcap = None
         self.magic_folders = defaultdict(dict)
+        self.multi_folder_support = None
+        self.command_priority = NORMAL
+        self.request_timeout = 30
+        self.breaker = CircuitBreaker(self.name)
+        self.request_limiter = Limiter(4, self.name + ' requests')
+        self.pool = HTTPConnectionPool(reactor, persistent=True)
+        self.pool.maxPersistentPerHost = self.request_limiter.limit
+        self.agent = None
+        self.in_flight = {}
+        self.flight_requests = {}  # key -> requests made for that flight
+        self.current_flight = None
+        self.coalesced_requests = 0
+        self.streaming_grid_status = True
+        self.server_states = {}  # nodeid -> connected, as of the last poll
+        self.catalog = None
+        self.rootcap_shards = None
+
+    def get_catalog(self):
+        if not self.catalog:
+            private_dir = os.path.join(self.nodedir, 'private')
+            os.makedirs(private_dir, exist_ok=True)
+            self.catalog = Catalog(os.path.join(private_dir, 'catalog.sqlite'))
+        return self.catalog
 
     def config_set(self, section, option, value):
         self.config.set(section, option, value)
@@ -172,6 +248,7 @@ class Tahoe(object):  # pylint: disable=too-many-public-methods
         except OSError:
             pass
         if data:
+            data = data.get('magic-folders', data)
             for key, value in data.items():  # to preserve defaultdict
                 self.magic_folders[key] = value
         for nodedir in get_nodedirs(self.magic_folders_dir):
@@ -182,6 +259,10 @@ class Tahoe(object):  # pylint: disable=too-many-public-methods
                     'nodedir': nodedir,
                     'directory': config.get('magic_folder', 'local.directory')
                 }
+            if 'client' not in self.magic_folders[folder_name]:
+                client = Tahoe(nodedir, executable=self.executable)
+                client.command_priority = BACKGROUND
+                self.magic_folders[folder_name]['client'] = client
         return self.magic_folders
 
     def line_received(self, line):
@@ -212,8 +293,14 @@ class Tahoe(object):  # pylint: disable=too-many-public-methods
         else:
             return str(output.getvalue()).strip()
 
+    def command(self, args, callback_trigger=None, priority=None):
+        if priority is None:
+            priority = self.command_priority
+        return spawn_limiter.run(
+            priority, self._command, args, callback_trigger)
+
     @inlineCallbacks
-    def command(self, args, callback_trigger=None):
+    def _command(self, args, callback_trigger=None):
         exe = (self.executable if self.executable else which('tahoe')[0])
         args = [exe] + ['-d', self.nodedir] + args
         env = os.environ
@@ -234,13 +321,33 @@ class Tahoe(object):  # pylint: disable=too-many-public-methods
         output = yield self.command(['--version'])
         returnValue((self.executable, output.split()[1]))
 
+    def get_webport(self, webport=None):
+        # 'unix' makes the node listen on a socket in its private directory
+        # (so that only its owner can reach the web API) rather than on a
+        # loopback TCP port. Twisted doesn't support UNIX sockets on Windows.
+        if webport is None:
+            webport = app_settings.get('tahoe', {}).get('webport')
+        if webport == 'unix':
+            path = os.path.join(self.nodedir, 'private', 'web.sock')
+            if sys.platform == 'win32':
+                return 'tcp:0:interface=127.0.0.1'
+            if len(os.fsencode(os.path.abspath(path))) >= get_sun_path_max():
+                # The node would fail to bind a socket at this path (as can
+                # happen with subclient nodedirs nested under, e.g.,
+                # "~/Library/Application Support") so use TCP instead
+                log.warning("Socket path too long; using TCP: %s", path)
+                return 'tcp:0:interface=127.0.0.1'
+            return 'unix:{}:mode=600'.format(path)
+        return webport or 'tcp:0:interface=127.0.0.1'
+
     @inlineCallbacks
     def create_client(self, **kwargs):
         if os.path.exists(self.nodedir):
             raise NodedirExistsError
         valid_kwargs = ('nickname', 'introducer', 'shares-needed',
                         'shares-happy', 'shares-total')
-        args = ['create-client', '--webport=tcp:0:interface=127.0.0.1']
+        args = ['create-client', '--webport={}'.format(
+            self.get_webport(kwargs.get('webport')))]
         for key, value in kwargs.items():
             if key in valid_kwargs:
                 args.extend(['--{}'.format(key), str(value)])
@@ -254,7 +361,14 @@ class Tahoe(object):  # pylint: disable=too-many-public-methods
         # provides support for multiple magic-folders on older tahoe clients
         tasks = []
         for nodedir in get_nodedirs(self.magic_folders_dir):
-            tasks.append(Tahoe(nodedir, executable=self.executable).stop())
+            client = self.get_magic_folder_client(os.path.basename(nodedir))
+            if client:
+                client.nodeurl = None
+            else:
+                client = Tahoe(nodedir, executable=self.executable)
+                client.command_priority = BACKGROUND
+            if os.path.isfile(client.pidfile):  # Otherwise never started
+                tasks.append(client.stop())
         yield gatherResults(tasks)
 
     @inlineCallbacks
@@ -279,19 +393,7 @@ class Tahoe(object):  # pylint: disable=too-many-public-methods
             except TahoeCommandError:  # Process already dead/not running
                 pass
         yield self._stop_magic_folder_subclients()
-
-    @inlineCallbacks
-    def _start_magic_folder_subclients(self):
-        # For magic-folders created by '_create_magic_folder_subclient' below;
-        # provides support for multiple magic-folders on older tahoe clients
-        tasks = []
-        for folder, settings in self.magic_folders.items():
-            nodedir = settings.get('nodedir')
-            if nodedir:
-                client = Tahoe(nodedir, executable=self.executable)
-                self.magic_folders[folder]['client'] = client
-                tasks.append(client.start())
-        yield gatherResults(tasks)
+        yield self.pool.closeCachedConnections()
 
     @inlineCallbacks
     def start(self):
@@ -302,14 +404,28 @@ class Tahoe(object):  # pylint: disable=too-many-public-methods
         if sys.platform == 'win32' and pid.isdigit():
             with open(self.pidfile, 'w') as f:
                 f.write(pid)
-        with open(os.path.join(self.nodedir, 'node.url')) as f:
-            self.nodeurl = f.read().strip()
+        self.load_nodeurl()
         token_file = os.path.join(self.nodedir, 'private', 'api_auth_token')
         with open(token_file) as f:
             self.api_token = f.read().strip()
         self.shares_happy = int(self.config_get('client', 'shares.happy'))
+        # Subclients are started on demand; see start_magic_folder_subclient
         self.load_magic_folders()
-        yield self._start_magic_folder_subclients()
+
+    def load_nodeurl(self):
+        webport = self.config_get('node', 'web.port')
+        if webport and webport.startswith('unix:'):
+            # Tahoe-LAFS doesn't write a 'node.url' file for UNIX sockets;
+            # requests are routed to the socket by the agent instead, so
+            # the host part of the URL is never used.
+            path = webport.split(':')[1]
+            self.agent = Agent.usingEndpointFactory(
+                reactor, UNIXSocketEndpointFactory(path), pool=self.pool)
+            self.nodeurl = 'http://localhost/'
+        else:
+            self.agent = None
+            with open(os.path.join(self.nodedir, 'node.url')) as f:
+                self.nodeurl = f.read().strip()
 
     @staticmethod
     def _parse_welcome_page(html):
@@ -329,50 +445,153 @@ class Tahoe(object):  # pylint: disable=too-many-public-methods
             available_space += size
         return servers_connected, servers_known, available_space
 
-    @inlineCallbacks  # noqa: max-complexity=11 XXX
+    def _on_timeout(self, failure):
+        failure.trap(TimeoutError, CircuitOpenError)
+        raise TahoeUnresponsiveError(
+            "{} did not respond: {}".format(self.name, failure.value))
+
+    def _single_flight(self, key, f, *args, **kwargs):
+        # Concurrent callers of the same read share a single outstanding
+        # request instead of each issuing their own. A caller that passes a
+        # higher 'priority' than that of a request still queued in
+        # 'request_limiter' raises the request's priority to its own so
+        # that, e.g., an interactive read doesn't wait behind scans.
+        if key in self.in_flight:
+            self.coalesced_requests += 1
+            priority = kwargs.get('priority')
+            if priority is not None:
+                for request in self.flight_requests.get(key, []):
+                    self.request_limiter.escalate(request, priority)
+            d = Deferred()
+            self.in_flight[key].append(d)
+            return d
+        waiters = []
+        self.in_flight[key] = waiters
+        self.flight_requests[key] = []
+
+        def _done(result):
+            del self.in_flight[key]
+            self.flight_requests.pop(key, None)
+            for waiter in waiters:
+                waiter.callback(result)
+            return result
+        # Requests made (by '_request') before 'f' first yields are recorded
+        # in 'flight_requests' so that they can be escalated (see above)
+        outer_flight = self.current_flight
+        self.current_flight = key
+        try:
+            d = maybeDeferred(f, *args, **kwargs)
+        finally:
+            self.current_flight = outer_flight
+        return d.addBoth(_done)
+
+    def _request(self, method, url, *args, **kwargs):
+        # All web API requests go through here so that a hung node can't
+        # stall callers forever; requests time out after 'request_timeout'
+        # seconds and fail immediately while the node's circuit is open.
+        # At most 'request_limiter.limit' requests are sent at once; the rest
+        # are queued by priority so that requests made on behalf of the user
+        # don't wait behind background scans.
+        timeout = kwargs.pop('timeout', self.request_timeout)
+        priority = kwargs.pop('priority', NORMAL)
+        if self.agent:
+            kwargs.setdefault('agent', self.agent)
+        else:
+            kwargs.setdefault('pool', self.pool)
+
+        def request():
+            d = maybeDeferred(getattr(treq, method), url, *args, **kwargs)
+            if timeout:
+                d.addTimeout(timeout, reactor)
+            return d
+        d = self.request_limiter.run(priority, self.breaker.call, request)
+        if self.current_flight in self.flight_requests:
+            self.flight_requests[self.current_flight].append(d)
+        return d.addErrback(self._on_timeout)
+
+    def _read(self, resp, timeout=None, collector=None):
+        # Reads the body of 'resp' or, if 'collector' is given, passes it to
+        # 'collector' chunk by chunk as it arrives
+        def read():
+            if collector:
+                d = maybeDeferred(treq.collect, resp, collector)
+            else:
+                d = maybeDeferred(treq.content, resp)
+            d.addTimeout(timeout or self.request_timeout, reactor)
+            return d
+        return self.breaker.call(read).addErrback(self._on_timeout)
+
     def get_grid_status(self):
-        if not self.nodeurl:
-            return
+        return self._single_flight('grid_status', self._get_grid_status)
+
+    @inlineCallbacks
+    def _get_summary(self, uri, summary, priority=NORMAL):
+        # Feeds the JSON body of the response to 'summary' (see, e.g.,
+        # gridsync.decoder.ServersSummary) as it arrives
         try:
-            resp = yield treq.get(self.nodeurl + '?t=json')  # not yet released
-        except ConnectError:
+            resp = yield self._request('get', uri, priority=priority)
+            if resp.code != 200:
+                return
+            parser = decoder.ijson.parse_coro(summary)
+            yield self._read(resp, collector=parser.send)
+            parser.close()
+        except (ConnectError, TahoeUnresponsiveError):
             return
-        if resp.code == 200:
-            content = yield treq.content(resp)
-            content = content.decode('utf-8')
+        returnValue(summary.result())
+
+    @inlineCallbacks
+    def _get_streaming_grid_status(self):
+        summary = decoder.ServersSummary()
+        status = yield self._get_summary(self.nodeurl + '?t=json', summary)
+        if status:
+            self.server_states = summary.server_states
+        returnValue(status)
+
+    @inlineCallbacks
+    def _get_grid_status(self):
+        if not self.nodeurl:
+            return
+        if decoder.ijson and self.streaming_grid_status:
             try:
-                content = json.loads(content)
-            except json.decoder.JSONDecodeError:
+                status = yield self._get_streaming_grid_status()
+            except decoder.ijson.JSONError:
                 # See: https://tahoe-lafs.org/trac/tahoe-lafs/ticket/2476
-                connected, known, space = self._parse_welcome_page(content)
-                returnValue((connected, known, space))
-            servers_connected = 0
-            servers_known = 0
-            available_space = 0
-            if 'servers' in content:
-                servers = content['servers']
-                servers_known = len(servers)
-                for server in servers:
-                    if server['connection_status'].startswith('Connected'):
-                        servers_connected += 1
-                        if server['available_space']:
-                            available_space += server['available_space']
-            returnValue((servers_connected, servers_known, available_space))
+                self.streaming_grid_status = False
+            else:
+                returnValue(status)
+        try:
+            resp = yield self._request('get', self.nodeurl + '?t=json')
+            if resp.code != 200:
+                return
+            content = yield self._read(resp)
+        except (ConnectError, TahoeUnresponsiveError):
+            return
+        try:
+            status = yield decoder.run(decoder.load_grid_status, content)
+        except json.decoder.JSONDecodeError:
+            # See: https://tahoe-lafs.org/trac/tahoe-lafs/ticket/2476
+            connected, known, space = self._parse_welcome_page(
+                content.decode('utf-8'))
+            self.server_states = {}
+            returnValue((connected, known, space))
+        self.server_states = status[3]
+        returnValue(status[:3])
 
     @inlineCallbacks
     def get_connected_servers(self):
         if not self.nodeurl:
             return
         try:
-            resp = yield treq.get(self.nodeurl)
-        except ConnectError:
+            resp = yield self._request('get', self.nodeurl)
+            if resp.code != 200:
+                return
+            html = yield self._read(resp)
+        except (ConnectError, TahoeUnresponsiveError):
             return
-        if resp.code == 200:
-            html = yield treq.content(resp)
-            match = re.search(
-                'Connected to <span>(.+?)</span>', html.decode('utf-8'))
-            if match:
-                returnValue(int(match.group(1)))
+        match = re.search(
+            'Connected to <span>(.+?)</span>', html.decode('utf-8'))
+        if match:
+            returnValue(int(match.group(1)))
 
     @inlineCallbacks
     def is_ready(self):
@@ -397,9 +616,11 @@ class Tahoe(object):  # pylint: disable=too-many-public-methods
 
     @inlineCallbacks
     def mkdir(self):
-        resp = yield treq.post(self.nodeurl + 'uri', params={'t': 'mkdir'})
+        resp = yield self._request(
+            'post', self.nodeurl + 'uri', params={'t': 'mkdir'},
+            priority=INTERACTIVE)
         if resp.code == 200:
-            content = yield treq.content(resp)
+            content = yield self._read(resp)
             returnValue(content.decode('utf-8').strip())
         else:
             raise TahoeWebError(
@@ -415,57 +636,166 @@ class Tahoe(object):  # pylint: disable=too-many-public-methods
         with open(self.rootcap_path, 'w') as f:
             f.write(self.rootcap)
         log.debug("Rootcap saved to file: %s", self.rootcap_path)
+        if get_rootcap_layout() == 'sharded':
+            yield self._create_rootcap_shards()
         returnValue(self.rootcap)
 
+    @staticmethod
+    def get_shard_name(folder_name):
+        digest = hashlib.sha256(folder_name.encode('utf-8')).hexdigest()
+        return digest[0] + ' (shard)'
+
+    @staticmethod
+    def _get_childcap(entry):
+        return entry[1].get('rw_uri', entry[1].get('ro_uri'))
+
+    @staticmethod
+    def _get_folder_name(childname):
+        # "Photos (collective)" -> "Photos"
+        return childname[:childname.rindex(' (')]
+
+    @inlineCallbacks
+    def _create_rootcap_shards(self):
+        names = ['{:x} (shard)'.format(i) for i in range(16)]
+        dircaps = yield gatherResults([self.mkdir() for _ in names])
+        shards = dict(zip(names, dircaps))
+        yield self.link_many(self.get_rootcap(), shards)
+        self.rootcap_shards = shards
+        returnValue(shards)
+
+    @inlineCallbacks
+    def get_rootcap_shards(self, priority=INTERACTIVE):
+        # Returns the shard subdirectories of the rootcap (or {} if it uses
+        # the flat layout); cached after the first successful lookup. Raises
+        # TahoeWebError if the rootcap can't be listed since its layout is
+        # then unknown (and a sharded rootcap mustn't be written to as flat)
+        if self.rootcap_shards is None:
+            content = yield self.get_json(self.get_rootcap(), priority)
+            if not content:
+                raise TahoeWebError("Could not list rootcap")
+            shards = {}
+            for name, data in content[1]['children'].items():
+                if name.endswith(' (shard)'):
+                    shards[name] = self._get_childcap(data)
+            self.rootcap_shards = shards
+        returnValue(self.rootcap_shards)
+
+    @inlineCallbacks
+    def link_to_rootcap(self, children):
+        # Links folder entries ("X (collective)", "X (personal)") into the
+        # rootcap or, if it is sharded, into the appropriate shards
+        shards = yield self.get_rootcap_shards()
+        if not shards:
+            yield self.link_many(self.get_rootcap(), children)
+            return
+        by_shard = defaultdict(dict)
+        for childname, childcap in children.items():
+            shard = self.get_shard_name(self._get_folder_name(childname))
+            by_shard[shards[shard]][childname] = childcap
+        yield gatherResults(
+            [self.link_many(dircap, c) for dircap, c in by_shard.items()])
+
+    @inlineCallbacks
+    def shard_rootcap(self):
+        # Converts a rootcap with the flat layout to the sharded one. Entries
+        # are unlinked from the top-level directory only after they've been
+        # linked into their shards so that an interruption can't lose any.
+        shards = yield self.get_rootcap_shards(BACKGROUND)
+        if shards:
+            return
+        content = yield self.get_json(self.get_rootcap())
+        if not content:
+            log.warning("Could not list rootcap; not sharding")
+            return
+        log.debug("Sharding rootcap...")
+        children = {}
+        for name, data in content[1]['children'].items():
+            if name.endswith((' (collective)', ' (personal)')):
+                children[name] = self._get_childcap(data)
+        yield self._create_rootcap_shards()
+        yield self.link_to_rootcap(children)
+        for childname in children:
+            yield self.unlink(self.get_rootcap(), childname)
+        log.debug("Sharded %i rootcap entries", len(children))
+
     @inlineCallbacks
     def upload(self, local_path):
         log.debug("Uploading %s...", local_path)
         with open(local_path, 'rb') as f:
-            resp = yield treq.put('{}uri'.format(self.nodeurl), f)
+            resp = yield self._request(
+                'put', '{}uri'.format(self.nodeurl), f, timeout=None)
         if resp.code == 200:
-            content = yield treq.content(resp)
+            content = yield self._read(resp)
             log.debug("Successfully uploaded %s", local_path)
             returnValue(content.decode('utf-8'))
         else:
-            content = yield treq.content(resp)
+            content = yield self._read(resp)
             raise TahoeWebError(content.decode('utf-8'))
 
     @inlineCallbacks
     def download(self, cap, local_path):
         log.debug("Downloading %s...", local_path)
-        resp = yield treq.get('{}uri/{}'.format(self.nodeurl, cap))
+        resp = yield self._request(
+            'get', '{}uri/{}'.format(self.nodeurl, cap), timeout=None)
         if resp.code == 200:
             with open(local_path, 'wb') as f:
                 yield treq.collect(resp, f.write)
             log.debug("Successfully downloaded %s", local_path)
         else:
-            content = yield treq.content(resp)
+            content = yield self._read(resp)
             raise TahoeWebError(content.decode('utf-8'))
 
     @inlineCallbacks
     def link(self, dircap, childname, childcap):
         lock = yield self.lock.acquire()
         try:
-            resp = yield treq.post(
-                '{}uri/{}/?t=uri&name={}&uri={}'.format(
-                    self.nodeurl, dircap, childname, childcap))
+            resp = yield self._request(
+                'post', '{}uri/{}/?t=uri&name={}&uri={}'.format(
+                    self.nodeurl, dircap, childname, childcap),
+                priority=INTERACTIVE)
         finally:
             yield lock.release()
         if resp.code != 200:
-            content = yield treq.content(resp)
+            content = yield self._read(resp)
+            raise TahoeWebError(content.decode('utf-8'))
+
+    @staticmethod
+    def _child_entry(childcap):
+        kind = ('dirnode' if childcap.startswith('URI:DIR2') else 'filenode')
+        if childcap.startswith(('URI:DIR2:', 'URI:SSK:', 'URI:MDMF:')):
+            return [kind, {'rw_uri': childcap}]
+        return [kind, {'ro_uri': childcap}]
+
+    @inlineCallbacks
+    def link_many(self, dircap, children):
+        # Link several children with a single 't=set_children' request so
+        # that the (mutable) directory only needs to be rewritten once
+        body = {}
+        for childname, childcap in children.items():
+            body[childname] = self._child_entry(childcap)
+        lock = yield self.lock.acquire()
+        try:
+            resp = yield self._request(
+                'post', '{}uri/{}/?t=set_children'.format(self.nodeurl, dircap),
+                json.dumps(body).encode('utf-8'), priority=INTERACTIVE)
+        finally:
+            yield lock.release()
+        if resp.code != 200:
+            content = yield self._read(resp)
             raise TahoeWebError(content.decode('utf-8'))
 
     @inlineCallbacks
     def unlink(self, dircap, childname):
         lock = yield self.lock.acquire()
         try:
-            resp = yield treq.post(
-                '{}uri/{}/?t=unlink&name={}'.format(
-                    self.nodeurl, dircap, childname))
+            resp = yield self._request(
+                'post', '{}uri/{}/?t=unlink&name={}'.format(
+                    self.nodeurl, dircap, childname),
+                priority=INTERACTIVE)
         finally:
             yield lock.release()
         if resp.code != 200:
-            content = yield treq.content(resp)
+            content = yield self._read(resp)
             raise TahoeWebError(content.decode('utf-8'))
 
     @inlineCallbacks
@@ -475,10 +805,10 @@ class Tahoe(object):  # pylint: disable=too-many-public-methods
         # a new nodedir using the current nodedir's connection settings.
         # See https://tahoe-lafs.org/trac/tahoe-lafs/ticket/2792
         basename = os.path.basename(path)
-        subclient = Tahoe(
-            os.path.join(self.magic_folders_dir, basename),
-            executable=self.executable)
+        nodedir = os.path.join(self.magic_folders_dir, basename)
+        subclient = Tahoe(nodedir, executable=self.executable)
         self.magic_folders[basename] = {
+            'nodedir': nodedir,
             'directory': path,
             'client': subclient
         }
@@ -496,73 +826,309 @@ class Tahoe(object):  # pylint: disable=too-many-public-methods
             collective_cap, personal_cap = join_code.split('+')
             if collective_cap.startswith('URI:DIR2:'):  # is admin
                 subclient.command(['add-alias', 'magic:', collective_cap])
-                data = yield self.get_json(collective_cap)
+                data = yield self.get_json(collective_cap, INTERACTIVE)
                 collective_cap_ro = data[1]['ro_uri']  # diminish to readcap
                 join_code = "{}+{}".format(collective_cap_ro, personal_cap)
             yield subclient.command(
                 ['magic-folder', 'join', join_code, path])
-            yield subclient.stop()
-            yield subclient.start()
-            returnValue(subclient)
-        yield subclient.command(
-            ['magic-folder', 'create', 'magic:', 'admin', path])
+        else:
+            yield subclient.command(
+                ['magic-folder', 'create', 'magic:', 'admin', path])
         yield subclient.stop()
         yield subclient.start()
+        returnValue(subclient)
 
-        rootcap = self.read_cap_from_file(self.rootcap_path)
-        yield self.link(rootcap, basename + ' (collective)',
-                        subclient.get_alias('magic'))
-        yield self.link(rootcap, basename + ' (personal)',
-                        subclient.get_magic_folder_dircap())
-
-    @inlineCallbacks
-    def create_magic_folder(self, path, join_code=None):
+    def _prepare_magic_folder_paths(self, paths):
         try:
             os.makedirs(self.magic_folders_dir)
         except OSError:
             pass
-        path = os.path.realpath(os.path.expanduser(path))
+        prepared = []
+        for path in paths:
+            path = os.path.realpath(os.path.expanduser(path))
+            try:
+                os.makedirs(path)
+            except OSError:
+                pass
+            prepared.append(path)
+        return prepared
+
+    @inlineCallbacks
+    def create_magic_folders(self, paths):
+        # Run every 'magic-folder create' command first so that the node
+        # only needs to be restarted -- and the rootcap only needs to be
+        # rewritten -- once for the whole batch.
+        created = []
+        subclient_paths = []
+        for path in self._prepare_magic_folder_paths(paths):
+            name = os.path.basename(path)
+            if subclient_paths:  # multiple magic-folders are not supported
+                subclient_paths.append(path)
+                continue
+            try:
+                yield self.command(['magic-folder', 'create', '-n', name,
+                                    name + ':', 'admin', path],
+                                   priority=INTERACTIVE)
+            except TahoeCommandError as err:
+                if str(err).endswith('not recognized'):
+                    subclient_paths.append(path)
+                else:
+                    log.error("Error creating magic-folder '%s': %s",
+                              name, str(err))
+                continue
+            created.append(name)
+        if created:
+            yield self.stop()
+            yield self.start()
+        subclients = yield self._create_magic_folder_subclients(
+            [(path, None) for path in subclient_paths])
+        yield self._link_magic_folders(created, subclients)
+
+    @inlineCallbacks
+    def _create_magic_folder_subclients(self, folders):
+        # Returns the subclients that were created (from the given (path,
+        # join_code) pairs); a failure only affects its own folder
+        if not folders:
+            returnValue([])
+        results = yield DeferredList([
+            self._create_magic_folder_subclient(path, join_code)
+            for path, join_code in folders], consumeErrors=True)
+        subclients = []
+        for (path, _), (success, result) in zip(folders, results):
+            if success:
+                subclients.append(result)
+            else:
+                log.error("Error creating magic-folder subclient for %s: %s",
+                          path, result.value)
+        returnValue(subclients)
+
+    @inlineCallbacks
+    def _link_magic_folders(self, names, subclients):
+        children = {}
+        for name in names:
+            children[name + ' (collective)'] = self.get_alias(name)
+            children[name + ' (personal)'] = self.get_magic_folder_dircap(name)
+        for subclient in subclients:
+            name = os.path.basename(subclient.nodedir)
+            children[name + ' (collective)'] = subclient.get_alias('magic')
+            children[name + ' (personal)'] = subclient.get_magic_folder_dircap()
+        if children:
+            yield self.link_to_rootcap(children)
+
+    @inlineCallbacks
+    def join_magic_folders(self, folders):
+        # 'folders' maps each local path to its magic-folder join code. The
+        # folders' caps are already linked into the rootcap, so (unlike
+        # 'create_magic_folders') no linking is needed after joining.
+        joined = []
+        subclient_folders = []
+        paths = self._prepare_magic_folder_paths(list(folders.keys()))
+        for path, join_code in zip(paths, folders.values()):
+            if subclient_folders:
+                subclient_folders.append((path, join_code))
+                continue
+            name = os.path.basename(path)
+            collective_cap, personal_cap = join_code.split('+')
+            code = join_code
+            if collective_cap.startswith('URI:DIR2:'):  # is admin
+                data = yield self.get_json(collective_cap, INTERACTIVE)
+                code = "{}+{}".format(data[1]['ro_uri'], personal_cap)
+            try:
+                yield self.command(
+                    ['magic-folder', 'join', '-n', name, code, path],
+                    priority=INTERACTIVE)
+            except TahoeCommandError as err:
+                if str(err).endswith('not recognized'):
+                    subclient_folders.append((path, join_code))
+                else:
+                    log.error("Error joining magic-folder '%s': %s",
+                              name, str(err))
+                continue
+            if collective_cap.startswith('URI:DIR2:'):
+                yield self.command(['add-alias', name + ':', collective_cap])
+            joined.append(name)
+        if joined:
+            yield self.stop()
+            yield self.start()
+        yield self._create_magic_folder_subclients(subclient_folders)
+
+    @inlineCallbacks
+    def create_magic_folder(self, path, join_code=None):
+        if join_code:
+            yield self.join_magic_folders({path: join_code})
+        else:
+            yield self.create_magic_folders([path])
+
+    @inlineCallbacks
+    def supports_multiple_magic_folders(self):
+        # Tahoe-LAFS 1.13 added the '--name' option to the 'magic-folder'
+        # subcommands, allowing a single node to host multiple folders.
+        # See https://tahoe-lafs.org/trac/tahoe-lafs/ticket/2792
+        if self.multi_folder_support is None:
+            try:
+                output = yield self.command(
+                    ['magic-folder', 'create', '--help'])
+            except TahoeCommandError:
+                output = ''
+            self.multi_folder_support = '--name' in str(output)
+        returnValue(self.multi_folder_support)
+
+    def get_magic_folder_subclients(self):
+        subclients = []
+        for folder, settings in self.magic_folders.items():
+            if settings.get('nodedir'):
+                subclients.append(folder)
+        return sorted(subclients)
+
+    def _migrate_magic_folder_subclient(self, name, folders, aliases):
+        # Returns True if the subclient's magic-folder was migrated
+        log.debug("Migrating magic-folder '%s' from subclient", name)
+        nodedir = self.magic_folders[name]['nodedir']
+        private_dir = os.path.join(nodedir, 'private')
+        subclient = Tahoe(nodedir, executable=self.executable)
+        settings = {
+            'directory': subclient.config_get(
+                'magic_folder', 'local.directory'),
+            'collective_dircap': self.read_cap_from_file(
+                os.path.join(private_dir, 'collective_dircap')),
+            'upload_dircap': self.read_cap_from_file(
+                os.path.join(private_dir, 'magic_folder_dircap'))
+        }
+        if not all(settings.values()):
+            # The subclient was written out but its magic-folder was never
+            # created (e.g., because the creation was interrupted); Tahoe-LAFS
+            # would refuse to start with it in magic_folders.yaml
+            log.warning(
+                "Not migrating magic-folder '%s'; its subclient is incomplete",
+                name)
+            return False
+        # Tahoe-LAFS rejects magic_folders.yaml entries without an (int)
+        # 'poll_interval'; 60 seconds is its default for tahoe.cfg as well
         try:
-            os.makedirs(path)
+            settings['poll_interval'] = int(
+                subclient.config_get('magic_folder', 'poll_interval'))
+        except (TypeError, ValueError):
+            settings['poll_interval'] = 60
+        folders[name] = settings
+        db = os.path.join(private_dir, 'magicfolderdb.sqlite')
+        if os.path.isfile(db):
+            shutil.move(db, os.path.join(
+                self.nodedir, 'private', 'magicfolder_{}.sqlite'.format(name)))
+        admin_cap = subclient.get_alias('magic')
+        if admin_cap:
+            aliases.write('{}: {}\n'.format(name, admin_cap))
+        self.magic_folders[name] = dict(settings)
+        return True
+
+    @inlineCallbacks
+    def migrate_magic_folder_subclients(self):
+        # Fold the magic-folders of per-folder subclients (created by
+        # '_create_magic_folder_subclient' above) into this node so that N
+        # folders cost one tahoe process instead of N+1. Requires a tahoe
+        # executable for which 'supports_multiple_magic_folders' is True.
+        names = self.get_magic_folder_subclients()
+        if not names:
+            returnValue(names)
+        yield self._stop_magic_folder_subclients()
+        yaml_path = os.path.join(self.nodedir, 'private', 'magic_folders.yaml')
+        data = None
+        try:
+            with open(yaml_path) as f:
+                data = yaml.safe_load(f)
         except OSError:
             pass
-        name = os.path.basename(path)
-        try:
-            yield self.command(['magic-folder', 'create', '-n', name,
-                                name + ':', 'admin', path])
-        except TahoeCommandError as err:
-            if str(err).endswith('not recognized'):
-                yield self._create_magic_folder_subclient(path, join_code)
-                return
+        folders = data.get('magic-folders', data) if data else {}
+        aliases_file = os.path.join(self.nodedir, 'private', 'aliases')
+        with open(aliases_file, 'a') as aliases:
+            names = [
+                name for name in names
+                if self._migrate_magic_folder_subclient(name, folders, aliases)
+            ]
+        if not names:
+            returnValue(names)
+        with open(yaml_path, 'w') as f:
+            f.write(yaml.safe_dump({'magic-folders': folders}))
+        self.config_set('magic_folder', 'enabled', 'True')
+        for name in names:
+            shutil.rmtree(
+                os.path.join(self.magic_folders_dir, name), ignore_errors=True)
         yield self.stop()
         yield self.start()
-
-        rootcap = self.read_cap_from_file(self.rootcap_path)
-        yield self.link(rootcap, name + ' (collective)',
-                        self.get_alias(name))
-        yield self.link(rootcap, name + ' (personal)',
-                        self.get_magic_folder_dircap(name))
+        log.debug("Migrated %i magic-folder(s): %s", len(names), names)
+        returnValue(names)
 
     def get_magic_folder_client(self, name):
         for folder, settings in self.magic_folders.items():
             if folder == name:
                 return settings.get('client')
 
+    def is_magic_folder_running(self, name):
+        client = self.get_magic_folder_client(name)
+        if client:
+            return bool(client.nodeurl)
+        return bool(self.nodeurl)  # Folder is hosted by this node
+
+    @inlineCallbacks
+    def start_magic_folder_subclient(self, name):
+        client = self.get_magic_folder_client(name)
+        if client and not client.nodeurl:
+            log.debug("Starting magic-folder subclient '%s'...", name)
+            yield client.start()
+
+    @inlineCallbacks
+    def stop_magic_folder_subclient(self, name):
+        client = self.get_magic_folder_client(name)
+        if client and client.nodeurl:
+            log.debug("Stopping magic-folder subclient '%s'...", name)
+            client.nodeurl = None
+            yield client.stop()
+
+    def _get_paused_marker(self, name):
+        if name not in self.magic_folders:
+            return None
+        nodedir = self.magic_folders[name].get('nodedir')
+        if nodedir:
+            return os.path.join(nodedir, 'paused')
+        return None
+
+    def is_magic_folder_paused(self, name):
+        marker = self._get_paused_marker(name)
+        return bool(marker) and os.path.exists(marker)
+
+    @inlineCallbacks
+    def pause_magic_folder(self, name):
+        # Only folders hosted by their own subclient can be paused (doing so
+        # stops the subclient's tahoe process until the folder is resumed)
+        marker = self._get_paused_marker(name)
+        if not marker:
+            return
+        with open(marker, 'w'):
+            pass
+        yield self.stop_magic_folder_subclient(name)
+
+    def resume_magic_folder(self, name):
+        if self.is_magic_folder_paused(name):
+            os.remove(self._get_paused_marker(name))
+
     @inlineCallbacks
     def magic_folder_invite(self, name, nickname):
         client = self.get_magic_folder_client(name)
         if client:
+            yield self.start_magic_folder_subclient(name)
             code = yield client.command(
-                ['magic-folder', 'invite', 'magic:', nickname])
+                ['magic-folder', 'invite', 'magic:', nickname],
+                priority=INTERACTIVE)
         else:
             code = yield self.command(
-                ['magic-folder', 'invite', '-n', name, name + ':', nickname])
+                ['magic-folder', 'invite', '-n', name, name + ':', nickname],
+                priority=INTERACTIVE)
         returnValue(code.strip())
 
     @inlineCallbacks
     def magic_folder_uninvite(self, name, nickname):
         client = self.get_magic_folder_client(name)
         if client:
+            yield self.start_magic_folder_subclient(name)
             yield client.unlink(client.get_alias('magic'), nickname)
         else:
             yield self.unlink(self.get_alias(name), nickname)
@@ -578,43 +1144,97 @@ class Tahoe(object):  # pylint: disable=too-many-public-methods
                 shutil.rmtree(client.nodedir, ignore_errors=True)
             else:
                 yield self.command(['magic-folder', 'leave', '-n', name])
+            self.get_catalog().remove_folder(name)
 
-    @inlineCallbacks
     def get_magic_folder_status(self, name=None):
-        nodeurl = self.nodeurl
-        token = self.api_token
+        return self._single_flight(
+            ('magic_folder_status', name), self._get_magic_folder_status, name)
+
+    @inlineCallbacks
+    def _get_magic_folder_status(self, name=None):
+        client = self
+        data = {'token': self.api_token, 't': 'json'}
         if name:
             gateway = self.get_magic_folder_client(name)
             if gateway:
-                nodeurl = gateway.nodeurl
-                token = gateway.api_token
-                data = {'token': token, 't': 'json'}
+                client = gateway
+                data = {'token': gateway.api_token, 't': 'json'}
             else:
-                data = {'token': token, 'name': name, 't': 'json'}
-        else:
-            data = {'token': token, 't': 'json'}
-        if not nodeurl or not token:
+                data['name'] = name
+        if not client.nodeurl or not data['token']:
             return
         try:
-            resp = yield treq.post(nodeurl + 'magic_folder', data)
-        except ConnectError:
+            resp = yield client._request(
+                'post', client.nodeurl + 'magic_folder', data)
+            if resp.code != 200:
+                return
+            content = yield client._read(resp)
+        except (ConnectError, TahoeUnresponsiveError):
             return
-        if resp.code == 200:
-            content = yield treq.content(resp)
-            returnValue(json.loads(content.decode('utf-8')))
+        returnValue(decoder.loads(content))  # Not reduced; see decoder.run
 
     @inlineCallbacks
-    def get_json(self, cap):
+    def get_magic_folders_status(self, names=None):
+        # Tahoe-LAFS has no endpoint that reports the status of every magic
+        # folder at once, so the per-folder requests are sent together
+        # instead, reusing the persistent connections in each node's pool
+        if names is None:
+            names = list(self.magic_folders.keys())
+        results = yield gatherResults(
+            [self._get_magic_folder_status_or_none(name) for name in names])
+        returnValue(dict(zip(names, results)))
+
+    def _get_magic_folder_status_or_none(self, name):
+        # A failure for one folder must not discard the others' results
+        d = maybeDeferred(self.get_magic_folder_status, name)
+
+        def on_failure(failure):
+            log.warning(
+                'Error getting status of folder "%s": %s', name, failure.value)
+        d.addErrback(on_failure)
+        return d
+
+    def get_json(self, cap, priority=BACKGROUND):
+        return self._single_flight(
+            ('json', cap), self._get_json, cap, priority=priority)
+
+    @inlineCallbacks
+    def _get_listing(self, cap, priority=BACKGROUND):
         if not cap or not self.nodeurl:
             return
         uri = '{}uri/{}/?t=json'.format(self.nodeurl, cap)
         try:
-            resp = yield treq.get(uri)
-        except ConnectError:
+            resp = yield self._request('get', uri, priority=priority)
+            if resp.code != 200:
+                return
+            content = yield self._read(resp)
+        except (ConnectError, TahoeUnresponsiveError):
             return
-        if resp.code == 200:
-            content = yield treq.content(resp)
-            returnValue(json.loads(content.decode('utf-8')))
+        returnValue(content)
+
+    @inlineCallbacks
+    def _get_json(self, cap, priority=BACKGROUND):
+        content = yield self._get_listing(cap, priority)
+        if content:
+            returnValue(decoder.loads(content))  # Not reduced; see decoder.run
+
+    def get_listing_summary(self, cap):
+        return self._single_flight(
+            ('listing_summary', cap), self._get_listing_summary, cap)
+
+    @inlineCallbacks
+    def _get_listing_summary(self, cap):
+        if decoder.ijson:
+            if not cap or not self.nodeurl:
+                return
+            summary = yield self._get_summary(
+                '{}uri/{}/?t=json'.format(self.nodeurl, cap),
+                decoder.ListingSummary(), BACKGROUND)
+            returnValue(summary)
+        content = yield self._get_listing(cap)
+        if content:
+            # Decoded inline; see decoder.load_listing_summary
+            returnValue(decoder.load_listing_summary(content))
 
     @staticmethod
     def read_cap_from_file(filepath):
@@ -679,13 +1299,32 @@ class Tahoe(object):  # pylint: disable=too-many-public-methods
         self.magic_folders[name]['directory'] = directory
         return directory
 
+    @inlineCallbacks
+    def _expand_rootcap_shards(self, children):
+        # Merges the children of any rootcap shards into 'children'
+        shards = [n for n in children if n.endswith(' (shard)')]
+        if not shards:
+            returnValue(children)
+        listings = yield gatherResults(
+            [self.get_json(self._get_childcap(children[n])) for n in shards])
+        if not all(listings):
+            return
+        children = dict(children)
+        for listing in listings:
+            children.update(listing[1]['children'])
+        returnValue(children)
+
     @inlineCallbacks
     def get_magic_folders_from_rootcap(self, content=None):
         if not content:
             content = yield self.get_json(self.get_rootcap())
         if content:
             folders = defaultdict(dict)
-            for name, data in content[1]['children'].items():
+            children = yield self._expand_rootcap_shards(
+                content[1]['children'])
+            if children is None:
+                return  # Better no result than an incomplete one
+            for name, data in children.items():
                 data_dict = data[1]
                 if name.endswith(' (collective)'):
                     prefix = name.split(' (collective)')[0]
@@ -741,31 +1380,23 @@ class Tahoe(object):  # pylint: disable=too-many-public-methods
     @inlineCallbacks
     def get_magic_folder_info(self, name=None, members=None):
         total_size = 0
-        sizes_dict = {}
+        files_dict = {}
         latest_mtime = 0
         if not members:
             members = yield self.get_magic_folder_members(name)
         if members:
             for member, dircap in reversed(members):
-                sizes_dict[member] = {}
-                json_data = yield self.get_json(dircap)
-                children = json_data[1]['children']
-                for filenode, data in children.items():
-                    filepath = filenode.replace('@_', os.path.sep)
-                    metadata = data[1]
-                    try:
-                        size = int(metadata['size'])
-                    except KeyError:  # if linked manually
-                        continue
-                    sizes_dict[member][filepath] = size
-                    total_size += size
-                    try:
-                        mt = int(metadata['metadata']['tahoe']['linkmotime'])
-                    except KeyError:
-                        continue
-                    if mt > latest_mtime:
-                        latest_mtime = mt
-        returnValue((members, total_size, latest_mtime, sizes_dict))
+                # Listings are summarized while they are received if ijson
+                # is available; see gridsync.decoder.ListingSummary
+                summary = yield self.get_listing_summary(dircap)
+                if not summary:
+                    continue
+                files, size, mtime = summary
+                files_dict[member] = files
+                total_size += size
+                if mtime > latest_mtime:
+                    latest_mtime = mtime
+        returnValue((members, total_size, latest_mtime, files_dict))
 
 
 @inlineCallbacks
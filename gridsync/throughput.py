@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+import time
+from collections import deque
+
+
+class ThroughputEstimator(object):
+    # Estimates transfer rates (in bytes and files per second) from the
+    # transfers completed over the last 'window' seconds, and from those, the
+    # time remaining to transfer what is still queued. Samples are timestamped
+    # with their completion times so that transfers that finished long ago
+    # (e.g., those reported on the first poll after launch) are not counted.
+    def __init__(self, window=60):
+        self.window = window
+        self.samples = deque()
+        self.started = time.time()
+
+    def reset(self, now=None):
+        self.samples.clear()
+        self.started = now or time.time()
+
+    def _prune(self, now):
+        while self.samples and self.samples[0][0] < now - self.window:
+            self.samples.popleft()
+
+    def add(self, size, completed_at=None, now=None):
+        now = now or time.time()
+        completed_at = completed_at or now
+        if completed_at < now - self.window:
+            return
+        self.samples.append((completed_at, size or 0))
+        self._prune(now)
+
+    def get_rates(self, now=None):
+        now = now or time.time()
+        self._prune(now)
+        if not self.samples:
+            return 0, 0
+        span = max(min(now - self.started, self.window), 1)
+        size = sum(sample[1] for sample in self.samples)
+        return size / float(span), len(self.samples) / float(span)
+
+    def get_eta(self, remaining_size, remaining_files, now=None):
+        # Returns the estimated number of seconds until 'remaining_size'
+        # bytes in 'remaining_files' files are transferred or None if there
+        # is too little to go on
+        if not remaining_files:
+            return None
+        byte_rate, file_rate = self.get_rates(now)
+        if remaining_size and byte_rate:
+            return int(remaining_size / byte_rate)
+        if file_rate:
+            return int(remaining_files / file_rate)
+        return None
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+
+import base64
+from array import array
+
+
+# The (step, size) of each resolution at which values are kept: one-minute
+# averages for a day, hourly averages for a month, and daily ones for a year
+RESOLUTIONS = ((60, 1440), (3600, 720), (86400, 365))
+
+# Per-server series beyond this many are not kept (so that memory use stays
+# bounded even if a grid's servers come and go)
+MAX_SERVERS = 100
+
+NAN = float('nan')
+
+
+class RingBuffer(object):
+    # A fixed-size, array-backed buffer of floats that overwrites its oldest
+    # values once full
+    def __init__(self, size):
+        self.size = size
+        self.data = array('f', [NAN]) * size
+        self.index = 0  # Where the next value will be written
+        self.count = 0
+
+    def append(self, value):
+        self.data[self.index] = value
+        self.index = (self.index + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def values(self):
+        if self.count < self.size:
+            return self.data[:self.count].tolist()
+        return (self.data[self.index:] + self.data[:self.index]).tolist()
+
+    def to_dict(self):
+        return {
+            'data': base64.b64encode(self.data.tobytes()).decode('ascii'),
+            'index': self.index,
+            'count': self.count
+        }
+
+    def restore(self, state):
+        data = array('f')
+        data.frombytes(base64.b64decode(state['data']))
+        if len(data) != self.size:
+            raise ValueError("Size mismatch")
+        self.data = data
+        self.index = state['index']
+        self.count = state['count']
+
+
+class TimeSeries(object):
+    # Averages of a sampled value over consecutive intervals, kept at each
+    # of several resolutions. Intervals in which no samples were taken are
+    # recorded as NaN.
+    def __init__(self, resolutions=RESOLUTIONS):
+        self.buffers = {step: RingBuffer(size) for step, size in resolutions}
+        self.intervals = {step: None for step, _ in resolutions}
+        self.sums = {step: 0.0 for step, _ in resolutions}
+        self.counts = {step: 0 for step, _ in resolutions}
+
+    def _flush(self, step, interval):
+        buf = self.buffers[step]
+        if self.counts[step]:
+            buf.append(self.sums[step] / self.counts[step])
+        for _ in range(min(interval - self.intervals[step] - 1, buf.size)):
+            buf.append(NAN)
+        self.sums[step] = 0.0
+        self.counts[step] = 0
+
+    def add(self, value, now):
+        for step in self.buffers:
+            interval = int(now // step)
+            current = self.intervals[step]
+            if current is not None and interval > current:
+                self._flush(step, interval)
+            if current is None or interval > current:
+                self.intervals[step] = interval
+            self.sums[step] += value
+            self.counts[step] += 1
+
+    def get(self, step):
+        # Returns the averages at the given resolution (oldest first),
+        # including that of the interval still in progress
+        values = self.buffers[step].values()
+        if self.counts[step]:
+            values.append(self.sums[step] / self.counts[step])
+        return values
+
+    def to_dict(self, steps=None):
+        # Only the resolutions in 'steps' (all, if None) are included
+        return {
+            str(step): {
+                'buffer': self.buffers[step].to_dict(),
+                'interval': self.intervals[step],
+                'sum': self.sums[step],
+                'count': self.counts[step]
+            } for step in self.buffers if steps is None or step in steps
+        }
+
+    def restore(self, state):
+        for step in self.buffers:
+            level = state.get(str(step))
+            if not level:
+                continue
+            self.buffers[step].restore(level['buffer'])
+            self.intervals[step] = level['interval']
+            self.sums[step] = level['sum']
+            self.counts[step] = level['count']
+
+
+class GridHistory(object):
+    # The connected servers and available space of a grid over time, along
+    # with the connection state of each server (as the fraction of samples
+    # in which it was connected)
+    def __init__(self, resolutions=RESOLUTIONS):
+        self.resolutions = resolutions
+        self.connected = TimeSeries(resolutions)
+        self.available_space = TimeSeries(resolutions)
+        self.servers = {}
+
+    def add(self, num_connected, available_space, server_states, now):
+        self.connected.add(num_connected, now)
+        self.available_space.add(available_space, now)
+        for server, is_connected in server_states.items():
+            if server not in self.servers:
+                if len(self.servers) >= MAX_SERVERS:
+                    continue
+                self.servers[server] = TimeSeries(self.resolutions)
+            self.servers[server].add(1 if is_connected else 0, now)
+
+    def get_interval(self, step):
+        # The interval (of 'step' seconds) that is currently being averaged;
+        # when it changes, the previous one has been added to the history
+        return self.connected.intervals[step]
+
+    def to_dict(self, steps=None):
+        # Only the resolutions in 'steps' (all, if None) are included, so
+        # that each can be saved separately -- and only as often as it
+        # changes
+        return {
+            'connected': self.connected.to_dict(steps),
+            'available_space': self.available_space.to_dict(steps),
+            'servers': {k: v.to_dict(steps) for k, v in self.servers.items()}
+        }
+
+    def restore(self, state):
+        # Restores the state (or the resolutions of it) saved with to_dict(),
+        # returning False (and leaving the history empty) if it could not be
+        try:
+            self.connected.restore(state.get('connected', {}))
+            self.available_space.restore(state.get('available_space', {}))
+            for server, series_state in state.get('servers', {}).items():
+                series = self.servers.get(server) or \
+                    TimeSeries(self.resolutions)
+                series.restore(series_state)
+                self.servers[server] = series
+        except (KeyError, TypeError, ValueError):
+            self.__init__(self.resolutions)
+            return False
+        return True
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import os
+import weakref
+
+from PyQt5.QtCore import pyqtSignal, QFileSystemWatcher, QObject, QTimer
+from twisted.internet.threads import deferToThread
+
+
+def get_signature(path):
+    # A cheap summary of a directory tree that changes whenever an entry
+    # anywhere in it is added, removed, or modified
+    count = 0
+    latest_mtime = 0
+    for root, dirs, files in os.walk(path):
+        for name in dirs + files:
+            try:
+                mtime = os.stat(os.path.join(root, name)).st_mtime
+            except OSError:  # Removed during the walk
+                continue
+            count += 1
+            if mtime > latest_mtime:
+                latest_mtime = mtime
+    return count, latest_mtime
+
+
+def get_signatures(paths):
+    return [get_signature(path) for path in paths]
+
+
+def list_tree(path, limit):
+    # Returns 'path' and every directory and file beneath it -- or None if
+    # there are more than 'limit' of them
+    paths = [path]
+    for root, dirs, files in os.walk(path):
+        paths.extend(os.path.join(root, name) for name in dirs + files)
+        if len(paths) > limit:
+            return None
+    return paths
+
+
+def list_new_entries(path, known):
+    # Returns the entries of the directory 'path' that aren't in 'known'
+    # along with, for those that are directories, everything beneath them
+    try:
+        names = os.listdir(path)
+    except OSError:
+        return []
+    entries = []
+    for name in names:
+        entry = os.path.join(path, name)
+        if entry in known:
+            continue
+        entries.append(entry)
+        for root, dirs, files in os.walk(entry):
+            entries.extend(os.path.join(root, n) for n in dirs + files)
+    return entries
+
+
+def get_max_watches():
+    # The number of watches that all Watchers (i.e., every gateway's Monitor)
+    # may use between them. On Linux, watches count against a per-user
+    # limit that Tahoe-LAFS' own magic-folder watcher (and other programs)
+    # need as well, so only half of it is used
+    try:
+        with open('/proc/sys/fs/inotify/max_user_watches') as f:
+            return int(f.read()) // 2
+    except (OSError, ValueError):
+        return 4096
+
+
+MAX_WATCHES = get_max_watches()
+
+_watchers = weakref.WeakSet()
+
+
+def get_num_watches():
+    return sum(len(watcher.folders) for watcher in _watchers)
+
+
+class Watcher(QObject):
+    # Watches each folder's directories and files (with inotify, FSEvents,
+    # etc., via QFileSystemWatcher) and emits folder_changed when anything
+    # in it is added, removed, or modified. Trees that can't be watched --
+    # because they have more entries than there are watches left (see
+    # MAX_WATCHES or, if given, 'max_watches') or the OS' limit on watches
+    # has been reached -- are polled (every 'poll_interval' seconds)
+    # instead. Walking a tree is done in a thread ('run_in_thread') so that
+    # large trees don't block the event loop.
+    folder_changed = pyqtSignal(str)
+
+    def __init__(self, max_watches=None, poll_interval=10):
+        super(Watcher, self).__init__()
+        self.max_watches = max_watches  # None to share MAX_WATCHES
+        self.fs_watcher = QFileSystemWatcher()
+        self.fs_watcher.directoryChanged.connect(self.on_directory_changed)
+        self.fs_watcher.fileChanged.connect(self.on_file_changed)
+        self.run_in_thread = deferToThread
+        self.folders = {}  # Watched directory or file -> folder name
+        self.roots = {}  # Folder name -> top-level directory
+        self.pending = {}  # Folder name -> top-level directory being listed
+        self.missing = set()  # Folders whose directories couldn't be found
+        self.polled = {}  # Folder name -> (top-level directory, signature)
+        self.polling = False
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(poll_interval * 1000)
+        self.poll_timer.timeout.connect(self.poll)
+        _watchers.add(self)
+
+    def get_available_watches(self):
+        if self.max_watches is None:
+            return MAX_WATCHES - get_num_watches()
+        return self.max_watches - len(self.folders)
+
+    def add_folder(self, name, path):
+        if not path or self.is_watching(name) or name in self.pending:
+            return None
+        if not os.path.isdir(path):
+            if name not in self.missing:  # Only warn once
+                logging.warning("Could not watch %s for changes", path)
+                self.missing.add(name)
+            return None
+        self.missing.discard(name)
+        self.pending[name] = path
+        d = self.run_in_thread(list_tree, path, self.get_available_watches())
+        d.addCallback(self._watch_tree, name, path)
+        d.addErrback(lambda f: logging.error(
+            "Error watching %s for changes: %s", path, f.value))
+        return d
+
+    def _watch_tree(self, paths, name, path):
+        if self.pending.get(name) != path:
+            return None  # Removed while its tree was being listed
+        del self.pending[name]
+        if paths is not None and len(paths) <= self.get_available_watches():
+            failed = self.fs_watcher.addPaths(paths)
+            for p in paths:
+                if p not in failed:
+                    self.folders[p] = name
+            if not failed:
+                self.roots[name] = path
+                logging.debug("Watching %s for changes (%s)", path, name)
+                return None
+            self.remove_folder(name)
+        return self._poll_folder(name, path)
+
+    def _poll_folder(self, name, path):
+        logging.debug("Polling %s for changes (%s)", path, name)
+        self.polled[name] = (path, None)  # Signature set by the next poll
+        if not self.poll_timer.isActive():
+            self.poll_timer.start()
+        return self.poll()
+
+    def remove_folder(self, name):
+        paths = [p for p, folder_name in self.folders.items()
+                 if folder_name == name]
+        if paths:
+            self.fs_watcher.removePaths(paths)
+            for path in paths:
+                del self.folders[path]
+        self.pending.pop(name, None)
+        self.missing.discard(name)
+        if self.roots.pop(name, None) or self.polled.pop(name, None):
+            logging.debug("Stopped watching %s", name)
+        if not self.polled:
+            self.poll_timer.stop()
+
+    def is_watching(self, name):
+        return name in self.roots or name in self.polled
+
+    def is_polling(self, name):
+        return name in self.polled
+
+    def _watch_new_entries(self, paths, name):
+        # Entries created (or moved) into a watched tree need watches of
+        # their own; if there are too many, the tree is polled instead
+        root = self.roots.get(name)
+        if not root:
+            return None
+        for path in paths:
+            if path in self.folders:
+                continue
+            if self.get_available_watches() <= 0 or \
+                    not self.fs_watcher.addPath(path):
+                if os.path.exists(path):
+                    self.remove_folder(name)
+                    return self._poll_folder(name, root)
+                continue  # Removed again in the meantime
+            self.folders[path] = name
+        return None
+
+    def on_directory_changed(self, path):
+        name = self.folders.get(path)
+        if not name:
+            return
+        logging.debug("Local change detected in %s (%s)", path, name)
+        self.folder_changed.emit(name)
+        if not os.path.isdir(path):
+            del self.folders[path]  # Qt drops the watches of removed paths
+            return
+        d = self.run_in_thread(
+            list_new_entries, path, frozenset(self.folders))
+        d.addCallback(self._watch_new_entries, name)
+        d.addErrback(lambda f: logging.error(
+            "Error watching %s for changes: %s", path, f.value))
+
+    def on_file_changed(self, path):
+        name = self.folders.get(path)
+        if not name:
+            return
+        logging.debug("Local change detected in %s (%s)", path, name)
+        if not os.path.exists(path):
+            del self.folders[path]  # Qt drops the watches of removed paths
+        else:
+            # Files saved by replacing them (as many editors do) lose their
+            # watch too; re-adding a watched path does nothing
+            self.fs_watcher.addPath(path)
+        self.folder_changed.emit(name)
+
+    def poll(self):
+        if self.polling or not self.polled:
+            return None  # The previous poll hasn't finished yet
+        folders = [(name, path) for name, (path, _) in self.polled.items()]
+        self.polling = True
+        d = self.run_in_thread(get_signatures, [p for _, p in folders])
+        d.addCallback(self._on_polled, folders)
+        d.addErrback(lambda f: logging.error("Error polling: %s", f.value))
+
+        def _done(_):
+            self.polling = False
+        d.addBoth(_done)
+        return d
+
+    def _on_polled(self, signatures, folders):
+        for (name, path), new_signature in zip(folders, signatures):
+            if name not in self.polled or self.polled[name][0] != path:
+                continue  # Removed while being polled
+            signature = self.polled[name][1]
+            self.polled[name] = (path, new_signature)
+            if signature is not None and new_signature != signature:
+                logging.debug("Local change detected in %s (%s)", path, name)
+                self.folder_changed.emit(name)
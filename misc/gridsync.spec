@@ -42,7 +42,11 @@ a = Analysis(['../gridsync/cli.py'],
              pathex=paths,
              binaries=None,
              datas=[('../gridsync/resources/*', 'resources')],
-             hiddenimports=['cffi'],
+             hiddenimports=[
+                 'cffi',
+                 # ijson imports its backends dynamically
+                 'ijson.backends.python',
+                 'ijson.backends.yajl2_c'],
              hookspath=[],
              runtime_hooks=[],
              excludes=[],
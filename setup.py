@@ -32,6 +32,7 @@ class Tox(TestCommand):
 
 requirements = [
     'humanize',
+    'ijson',
     'magic-wormhole',
     'PyNaCl',
     'pyyaml',
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+try:
+    from unittest.mock import MagicMock
+except ImportError:
+    from mock import MagicMock
+
+import pytest
+
+from gridsync.gui.diagnostics import DiagnosticsWidget, format_seconds
+from gridsync.histogram import Histogram
+
+
+@pytest.fixture()
+def monitor():
+    monitor = MagicMock()
+    monitor.gateway.name = 'TestGrid'
+    histogram = Histogram()
+    histogram.add(3)
+    monitor.get_latency_stats.return_value = {
+        'TestFolder': {'upload': {'transfer': histogram.to_dict()}}}
+    return monitor
+
+
+def test_format_seconds():
+    assert format_seconds(1.234) == '1.23 s'
+    assert format_seconds(123.4) == '123 s'
+    assert format_seconds(None) == ''
+
+
+def test_populate(monitor):
+    widget = DiagnosticsWidget(monitor)
+    item = widget.tree.topLevelItem(0)
+    assert [item.text(i) for i in range(4)] == [
+        'TestFolder', 'upload', 'transfer', '1']
+
+
+def test_export(monitor, tmpdir):
+    path = str(tmpdir.join('diagnostics.json'))
+    DiagnosticsWidget(monitor).export(path)
+    with open(path) as f:
+        exported = json.load(f)
+    assert exported['gateway'] == 'TestGrid'
+    assert exported['latency']['TestFolder']['upload']['transfer']['max'] == 3
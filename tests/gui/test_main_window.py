@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+try:
+    from unittest.mock import MagicMock
+except ImportError:
+    from mock import MagicMock
+
+from PyQt5.QtCore import Qt
+import pytest
+
+from gridsync.gui.main_window import Model
+
+
+@pytest.fixture()
+def model(tmpdir):
+    view = MagicMock()
+    view.gateway.nodedir = str(tmpdir)
+    model = Model(view)
+    for name in ('A', 'B', 'C', 'D'):
+        model.add_folder(name)
+    return model
+
+
+def status_text(model, name):
+    return model.item(model.find_item(name).row(), 1).text()
+
+
+def test_find_item(model):
+    assert model.find_item('C').text() == 'C'
+    assert model.find_item('Z') is None
+
+
+def test_find_item_after_removing_row(model):
+    model.remove_folder('B')
+    assert model.find_item('B') is None
+    assert model.find_item('C').row() == 1
+
+
+def test_find_item_after_sorting(model):
+    model.sort(0, Qt.DescendingOrder)
+    assert model.find_item('A').row() == 3
+
+
+def test_apply_updates(model):
+    model.apply_updates({
+        'A': {'status': 2, 'size': 1024},
+        'C': {'status': 1, 'eta': 120}})
+    assert status_text(model, 'A') == 'Up to date'
+    assert model.item(model.find_item('A').row(), 3).data(Qt.UserRole) == 1024
+    assert status_text(model, 'C') == 'Syncing (2 minutes left)'
+
+
+def test_apply_updates_emits_data_changed_per_row_range(model, qtbot):
+    ranges = []
+    model.dataChanged.connect(
+        lambda first, last: ranges.append((first.row(), last.row())))
+    model.apply_updates({
+        'A': {'status': 2}, 'B': {'status': 2}, 'D': {'status': 2}})
+    assert sorted(ranges) == [(0, 1), (3, 3)]
+
+
+def test_apply_updates_skips_unchanged_rows(model):
+    model.apply_updates({'A': {'status': 2}})
+    ranges = []
+    model.dataChanged.connect(
+        lambda first, last: ranges.append((first.row(), last.row())))
+    model.apply_updates({'A': {'status': 2}, 'Z': {'status': 2}})
+    assert ranges == []
+
+
+def test_apply_updates_while_hidden_only_stores_them(model):
+    model.set_visible(False)
+    model.apply_updates({'A': {'status': 2, 'size': 1024}})
+    assert status_text(model, 'A') == 'Initializing...'
+    assert model.folder_state['A']['size'] == 1024
+    assert model.pending_updates == {'A': {'status': 2, 'size': 1024}}
+
+
+def test_set_visible_applies_pending_updates(model):
+    model.set_visible(False)
+    model.apply_updates({'A': {'status': 1}, 'B': {'status': 2}})
+    model.apply_updates({'A': {'status': 2}})
+    ranges = []
+    model.dataChanged.connect(
+        lambda first, last: ranges.append((first.row(), last.row())))
+    model.set_visible(True)
+    assert status_text(model, 'A') == 'Up to date'
+    assert status_text(model, 'B') == 'Up to date'
+    assert ranges == [(0, 1)]
+    assert model.pending_updates == {}
+
+
+def test_update_natural_times_skipped_while_hidden(model):
+    model.set_mtime('A', 1500000000)
+    item = model.item(model.find_item('A').row(), 2)
+    item.setText('')
+    model.set_visible(False)
+    model.update_natural_times()
+    assert item.text() == ''
+    model.set_visible(True)
+    assert item.text()
+
+
+def test_apply_updates_lists_issues_in_status_tooltip(model):
+    model.apply_updates({'A': {'failures': 2}})
+    model.apply_updates({'A': {'conflicts': 1}})
+    assert model.item(model.find_item('A').row(), 1).toolTip() == \
+        "2 file(s) failed to sync\n1 file(s) in conflict"
+
+
+def test_on_failures_updated_notifies_new_failures_only(model, monkeypatch):
+    monkeypatch.setattr(
+        'gridsync.gui.main_window.get_preference', lambda *_: 'true')
+    model.on_failures_updated('A', 2)
+    model.on_failures_updated('A', 1)
+    assert model.gui.show_message.call_count == 1
+
+
+def test_on_conflicts_updated_notifies_new_conflicts(model, monkeypatch):
+    monkeypatch.setattr(
+        'gridsync.gui.main_window.get_preference', lambda *_: 'true')
+    model.on_conflicts_updated('A', ['a.txt'])
+    model.on_conflicts_updated('A', ['a.txt', 'b.txt'])
+    assert 'b.txt' in model.gui.show_message.call_args[0][1]
+    assert 'a.txt' not in model.gui.show_message.call_args[0][1]
+
+
+def test_save_history_skips_resolutions_without_new_intervals(
+        model, monkeypatch):
+    history = model.monitor.history
+    saved = []
+    for step, snapshot in model.history_snapshots.items():
+        monkeypatch.setattr(
+            snapshot, 'save', lambda _, step=step: saved.append(step))
+    history.add(1, 0, {}, 0)
+    model.save_history()
+    assert sorted(saved) == [60, 3600, 86400]
+    del saved[:]
+    history.add(1, 0, {}, 60)
+    model.save_history()
+    assert saved == [60]
+    del saved[:]
+    model.save_history(final=True)
+    assert sorted(saved) == [60, 3600, 86400]
+
+
+def test_restore_snapshot_restores_each_history_resolution(model, tmpdir):
+    tmpdir.mkdir('private')
+    model.monitor.history.add(3, 0, {}, 0)
+    model.save_history(final=True)
+    restored = Model(model.view)
+    restored.restore_snapshot()
+    assert restored.monitor.history.connected.get(3600) == [3]
+    assert tmpdir.join('private', 'history_3600.json').check()
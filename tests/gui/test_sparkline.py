@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+
+from gridsync.gui.sparkline import Sparkline
+
+
+def points(segment):
+    return [(p.x(), p.y()) for p in segment]
+
+
+def test_get_segments_scales_values():
+    sparkline = Sparkline()
+    sparkline.set_values([0, 5, 10])
+    segments = sparkline.get_segments(100, 10)
+    assert [points(s) for s in segments] == [[(0, 10), (50, 5), (100, 0)]]
+
+
+def test_get_segments_breaks_at_gaps():
+    sparkline = Sparkline()
+    sparkline.set_values([1, float('nan'), 1, 1])
+    segments = sparkline.get_segments(30, 10)
+    assert [points(s) for s in segments] == [
+        [(0, 0)], [(20, 0), (30, 0)]]
+
+
+def test_get_segments_no_values():
+    sparkline = Sparkline()
+    sparkline.set_values([float('nan')])
+    assert sparkline.get_segments(30, 10) == []
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+from PyQt5.QtCore import Qt
+import pytest
+
+from gridsync.gui.transfers import get_ranges, TransferModel
+
+
+def tasks(*args):
+    tasks_ = {}
+    for path, status, percent_done in args:
+        tasks_[(path, 'upload')] = {
+            'path': path, 'kind': 'upload', 'status': status,
+            'percent_done': percent_done}
+    return tasks_
+
+
+@pytest.fixture()
+def model():
+    return TransferModel('TestFolder', interval=0)
+
+
+def rows(model):
+    return [[model.data(model.index(row, column))
+             for column in range(model.columnCount())]
+            for row in range(model.rowCount())]
+
+
+def test_get_ranges():
+    assert get_ranges([5, 1, 2, 3, 7, 8]) == [[1, 3], [5, 5], [7, 8]]
+
+
+def test_set_tasks_shows_only_active_tasks(model):
+    model.set_tasks(tasks(
+        ('a', 'started', 50), ('b', 'queued', None), ('c', 'success', 100),
+        ('dir/', 'queued', None)))
+    assert rows(model) == [
+        ['a', 'Upload', 'In progress', '50%'],
+        ['b', 'Upload', 'Queued', None]]
+
+
+def test_set_tasks_emits_data_changed_for_changed_rows_only(model, qtbot):
+    model.set_tasks(tasks(
+        ('a', 'started', 10), ('b', 'queued', None), ('c', 'queued', None)))
+    with qtbot.wait_signal(model.dataChanged) as blocker:
+        model.set_tasks(tasks(
+            ('a', 'started', 10), ('b', 'started', 0), ('c', 'queued', None)))
+    first, last = blocker.args[:2]
+    assert (first.row(), last.row()) == (1, 1)
+
+
+def test_set_tasks_removes_completed_rows(model, qtbot):
+    model.set_tasks(tasks(
+        ('a', 'started', 10), ('b', 'queued', None), ('c', 'queued', None),
+        ('d', 'queued', None)))
+    with qtbot.wait_signals([model.rowsRemoved, model.rowsRemoved]):
+        model.set_tasks(tasks(('b', 'started', 0), ('d', 'queued', None)))
+    assert [row[0] for row in rows(model)] == ['b', 'd']
+    assert model.rows == {('b', 'upload'): 0, ('d', 'upload'): 1}
+
+
+def test_set_tasks_appends_new_rows(model, qtbot):
+    model.set_tasks(tasks(('a', 'started', 10)))
+    with qtbot.wait_signal(model.rowsInserted) as blocker:
+        model.set_tasks(tasks(
+            ('a', 'started', 10), ('b', 'queued', None),
+            ('c', 'queued', None)))
+    assert blocker.args[1:] == [1, 2]
+    assert model.data(model.index(0, 3), Qt.UserRole) == 10
+
+
+def test_on_tasks_updated_applies_latest_update_only(model, qtbot):
+    model.on_tasks_updated('TestFolder', tasks(('a', 'queued', None)))
+    model.on_tasks_updated('TestFolder', tasks(('b', 'queued', None)))
+    model.on_tasks_updated('OtherFolder', tasks(('c', 'queued', None)))
+    qtbot.wait_until(lambda: model.rowCount() == 1)
+    assert model.keys == [('b', 'upload')]
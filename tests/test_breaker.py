@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from twisted.internet.defer import fail, succeed, TimeoutError
+from twisted.internet.task import Clock
+
+from gridsync.breaker import (
+    CircuitBreaker, CircuitOpenError, CLOSED, HALF_OPEN, OPEN)
+
+
+@pytest.fixture()
+def clock():
+    return Clock()
+
+
+@pytest.fixture()
+def breaker(clock):
+    return CircuitBreaker('TestBreaker', threshold=2, reset_timeout=10,
+                          clock=clock)
+
+
+def test_breaker_starts_closed(breaker):
+    assert breaker.state == CLOSED
+
+
+def test_breaker_opens_after_threshold_failures(breaker):
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+
+def test_breaker_success_resets_failures(breaker):
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_breaker_half_open_after_reset_timeout(breaker, clock):
+    breaker.record_failure()
+    breaker.record_failure()
+    assert not breaker.allow_request()
+    clock.advance(10)
+    assert breaker.allow_request()
+    assert breaker.state == HALF_OPEN
+
+
+def test_breaker_reopens_on_failed_probe(breaker, clock):
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.advance(10)
+    breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+
+
+def test_breaker_call_fails_fast_while_open(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    d = breaker.call(lambda: succeed('result'))
+    failures = []
+    d.addErrback(failures.append)
+    assert failures[0].check(CircuitOpenError)
+
+
+def test_breaker_call_counts_only_failure_types(breaker):
+    breaker.call(lambda: fail(ValueError())).addErrback(lambda _: None)
+    breaker.call(lambda: fail(ValueError())).addErrback(lambda _: None)
+    assert breaker.state == CLOSED
+    breaker.call(lambda: fail(TimeoutError())).addErrback(lambda _: None)
+    breaker.call(lambda: fail(TimeoutError())).addErrback(lambda _: None)
+    assert breaker.state == OPEN
+
+
+def test_breaker_call_success_closes_half_open_circuit(breaker, clock):
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.advance(10)
+    results = []
+    breaker.call(lambda: succeed('result')).addCallback(results.append)
+    assert results == ['result']
+    assert breaker.state == CLOSED
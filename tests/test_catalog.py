@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from gridsync.catalog import Catalog
+
+
+FILES = {
+    'file1.txt': (1024, 'URI:CHK:aaa', 1500000000, 1),
+    'file2.txt': (2048, 'URI:CHK:bbb', 1500000002, 2)
+}
+
+
+@pytest.fixture()
+def catalog(tmpdir):
+    catalog = Catalog(str(tmpdir.join('catalog.sqlite')))
+    catalog.update_member('TestFolder', 'Alice', FILES)
+    catalog.update_member(
+        'TestFolder', 'Bob', {'file3.txt': (1, 'URI:CHK:ccc', 1500000001, 1)})
+    yield catalog
+    catalog.close()
+
+
+def test_get_files(catalog):
+    assert catalog.get_files('TestFolder', 'Alice') == FILES
+
+
+def test_update_member_returns_delta(catalog):
+    files = dict(FILES)
+    files['file1.txt'] = (4096, 'URI:CHK:ddd', 1500000003, 2)
+    del files['file2.txt']
+    files['file4.txt'] = (1, 'URI:CHK:eee', 1500000004, 1)
+    changed, removed = catalog.update_member('TestFolder', 'Alice', files)
+    assert sorted(changed) == ['file1.txt', 'file4.txt']
+    assert removed == ['file2.txt']
+    assert catalog.get_files('TestFolder', 'Alice') == files
+
+
+def test_update_member_unchanged(catalog):
+    assert catalog.update_member('TestFolder', 'Alice', FILES) == ([], [])
+
+
+def test_get_total_size(catalog):
+    assert catalog.get_total_size('TestFolder') == 3073
+
+
+def test_get_total_size_unknown_folder(catalog):
+    assert catalog.get_total_size('UnknownFolder') == 0
+
+
+def test_get_latest_mtime(catalog):
+    assert catalog.get_latest_mtime('TestFolder') == 1500000002
+
+
+def test_get_member_usage(catalog):
+    assert catalog.get_member_usage('TestFolder') == {'Alice': 3072, 'Bob': 1}
+
+
+def test_get_changed_since(catalog):
+    assert catalog.get_changed_since('TestFolder', 1500000000) == [
+        ('Bob', 'file3.txt', 1, 1500000001),
+        ('Alice', 'file2.txt', 2048, 1500000002)
+    ]
+
+
+def test_remove_member(catalog):
+    catalog.remove_member('TestFolder', 'Bob')
+    assert catalog.get_members('TestFolder') == ['Alice']
+
+
+def test_remove_folder(catalog):
+    catalog.remove_folder('TestFolder')
+    assert catalog.get_members('TestFolder') == []
+
+
+def test_catalog_persists(catalog):
+    catalog.close()
+    catalog = Catalog(catalog.path)
+    assert catalog.get_total_size('TestFolder') == 3073
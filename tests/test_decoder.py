@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+
+import pytest
+
+from gridsync import decoder
+
+
+LISTING = [
+    'dirnode',
+    {
+        'ro_uri': 'URI:DIR2-RO:aaa',
+        'children': {
+            'file1.txt': [
+                'filenode',
+                {
+                    'ro_uri': 'URI:CHK:bbb',
+                    'size': 1024,
+                    'metadata': {
+                        'version': 1,
+                        'tahoe': {'linkmotime': 1500000000.1}
+                    }
+                }
+            ],
+            'subdir@_file2.txt': [
+                'filenode',
+                {
+                    'ro_uri': 'URI:CHK:ccc',
+                    'size': 2048,
+                    'metadata': {
+                        'version': 3,
+                        'tahoe': {'linkmotime': 1500000001.5}
+                    }
+                }
+            ],
+            'no_linkmotime.txt': ['filenode', {'size': 1}],
+            'linked_manually': ['filenode', {}]
+        },
+        'mutable': True,
+        'rw_uri': 'URI:DIR2:ddd'
+    }
+]
+
+
+def events(obj, prefix=''):
+    # Yields the (prefix, event, value) tuples that ijson.parse would
+    if isinstance(obj, dict):
+        yield prefix, 'start_map', None
+        for key, value in obj.items():
+            yield prefix, 'map_key', key
+            for event in events(value, (prefix + '.' + key).lstrip('.')):
+                yield event
+        yield prefix, 'end_map', None
+    elif isinstance(obj, list):
+        yield prefix, 'start_array', None
+        for value in obj:
+            for event in events(value, (prefix + '.item').lstrip('.')):
+                yield event
+        yield prefix, 'end_array', None
+    elif obj is None:
+        yield prefix, 'null', None
+    elif isinstance(obj, str):
+        yield prefix, 'string', obj
+    else:
+        yield prefix, 'number', obj
+
+
+def test_summarize_servers():
+    content = {
+        'servers': [
+            {'connection_status': 'Connected to ...', 'available_space': 1},
+            {'connection_status': 'Connected to ...', 'available_space': 2},
+            {'connection_status': 'Trying to connect', 'available_space': 4}
+        ]
+    }
+    assert decoder.summarize_servers(content) == (2, 3, 3)
+
+
+def test_get_server_states():
+    content = {
+        'servers': [
+            {'nodeid': 'v0-aaa', 'connection_status': 'Connected to ...'},
+            {'nodeid': 'v0-bbb', 'connection_status': 'Trying to connect'}
+        ]
+    }
+    assert decoder.get_server_states(content) == {
+        'v0-aaa': True, 'v0-bbb': False}
+
+
+def test_load_grid_status_includes_server_states():
+    data = json.dumps({
+        'servers': [{'nodeid': 'v0-aaa', 'available_space': 1,
+                     'connection_status': 'Connected to ...'}]
+    }).encode('utf-8')
+    assert decoder.load_grid_status(data) == (1, 1, 1, {'v0-aaa': True})
+
+
+def test_summarize_servers_no_servers():
+    assert decoder.summarize_servers({}) == (0, 0, 0)
+
+
+def test_summarize_listing():
+    files, total_size, latest_mtime = decoder.summarize_listing(LISTING)
+    assert files == {
+        'file1.txt': (1024, 'URI:CHK:bbb', 1500000000, 1),
+        os.path.join('subdir', 'file2.txt'): (
+            2048, 'URI:CHK:ccc', 1500000001, 3),
+        'no_linkmotime.txt': (1, None, None, None)
+    }
+    assert total_size == 3073
+    assert latest_mtime == 1500000001
+
+
+@pytest.inlineCallbacks
+def test_run_decodes_small_payloads_inline(monkeypatch):
+    monkeypatch.setattr(
+        'gridsync.decoder.get_executor', lambda: pytest.fail("Used pool"))
+    output = yield decoder.run(decoder.loads, b'{"test": 1}')
+    assert output == {'test': 1}
+
+
+@pytest.inlineCallbacks
+def test_run_decodes_large_payloads_in_worker_process(monkeypatch):
+    monkeypatch.setattr('gridsync.decoder.THRESHOLD', 0)
+    data = json.dumps({
+        'servers': [{'nodeid': 'v0-aaa', 'available_space': 1,
+                     'connection_status': 'Connected to ...'}]
+    }).encode('utf-8')
+    output = yield decoder.run(decoder.load_grid_status, data)
+    decoder.shutdown()
+    assert output == (1, 1, 1, {'v0-aaa': True})
+
+
+@pytest.inlineCallbacks
+def test_run_propagates_worker_errors(monkeypatch):
+    monkeypatch.setattr('gridsync.decoder.THRESHOLD', 0)
+    with pytest.raises(ValueError):
+        yield decoder.run(decoder.loads, b'not json')
+    decoder.shutdown()
+
+
+def test_servers_summary_matches_summarize_servers():
+    summary = decoder.ServersSummary()
+    events = [
+        ('', 'start_map', None),
+        ('', 'map_key', 'servers'),
+        ('servers', 'start_array', None),
+        ('servers.item', 'start_map', None),
+        ('servers.item', 'map_key', 'connection_status'),
+        ('servers.item.connection_status', 'string', 'Connected to ...'),
+        ('servers.item', 'map_key', 'available_space'),
+        ('servers.item.available_space', 'number', 1024),
+        ('servers.item', 'end_map', None),
+        ('servers.item', 'start_map', None),
+        ('servers.item', 'map_key', 'connection_status'),
+        ('servers.item.connection_status', 'string', 'Trying to connect'),
+        ('servers.item', 'map_key', 'available_space'),
+        ('servers.item.available_space', 'number', 2048),
+        ('servers.item', 'end_map', None),
+        ('servers.item', 'start_map', None),
+        ('servers.item', 'map_key', 'connection_status'),
+        ('servers.item.connection_status', 'string', 'Connected to ...'),
+        ('servers.item', 'map_key', 'available_space'),
+        ('servers.item.available_space', 'null', None),
+        ('servers.item', 'end_map', None),
+        ('servers', 'end_array', None),
+        ('', 'end_map', None)
+    ]
+    for event in events:
+        summary.send(event)
+    assert summary.result() == (2, 3, 1024)
+
+
+def test_servers_summary_server_states():
+    content = {
+        'servers': [
+            {'nodeid': 'v0-aaa', 'connection_status': 'Connected to ...',
+             'available_space': 1},
+            {'nodeid': 'v0-bbb', 'connection_status': 'Trying to connect',
+             'available_space': None}
+        ]
+    }
+    summary = decoder.ServersSummary()
+    for event in events(content):
+        summary.send(event)
+    assert summary.server_states == decoder.get_server_states(content)
+
+
+def test_listing_summary_matches_summarize_listing():
+    summary = decoder.ListingSummary()
+    for event in events(LISTING):
+        summary.send(event)
+    assert summary.result() == decoder.summarize_listing(LISTING)
+
+
+def test_listing_summary_with_ijson_parser():
+    ijson = pytest.importorskip('ijson')
+    summary = decoder.ListingSummary()
+    parser = ijson.parse_coro(summary)
+    data = json.dumps(LISTING).encode('utf-8')
+    for i in range(0, len(data), 16):
+        parser.send(data[i:i + 16])
+    parser.close()
+    assert summary.result() == decoder.summarize_listing(LISTING)
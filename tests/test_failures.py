@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+from gridsync.failures import FailureTracker
+
+
+def test_add_records_first_failure():
+    tracker = FailureTracker()
+    assert tracker.add('file.txt', now=1) is True
+    assert tracker.get_failures() == {
+        'file.txt': {'first_failed': 1, 'last_failed': 1, 'count': 1}}
+
+
+def test_add_counts_repeated_failures():
+    tracker = FailureTracker()
+    tracker.add('file.txt', now=1)
+    assert tracker.add('file.txt', now=2) is False
+    assert tracker.get_failures() == {
+        'file.txt': {'first_failed': 1, 'last_failed': 2, 'count': 2}}
+
+
+def test_resolve_removes_failure():
+    tracker = FailureTracker()
+    tracker.add('a')
+    tracker.add('b')
+    assert tracker.resolve('a') is True
+    assert 'a' not in tracker
+    assert len(tracker) == 1
+
+
+def test_resolve_unknown_path():
+    assert FailureTracker().resolve('a') is False
+
+
+def test_add_conflict_once():
+    tracker = FailureTracker()
+    assert tracker.add_conflict('b') is True
+    assert tracker.add_conflict('a') is True
+    assert tracker.add_conflict('b') is False
+    assert tracker.get_conflicts() == ['a', 'b']
+
+
+def test_resolve_conflict():
+    tracker = FailureTracker()
+    tracker.add_conflict('a')
+    assert tracker.resolve_conflict('a') is True
+    assert tracker.resolve_conflict('a') is False
+    assert tracker.get_conflicts() == []
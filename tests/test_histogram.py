@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+from gridsync.histogram import Histogram
+
+
+def test_add_counts_values_in_buckets():
+    histogram = Histogram(bounds=(1, 10))
+    for value in (0.5, 1, 5, 10, 50):
+        histogram.add(value)
+    assert histogram.counts == [2, 2, 1]
+
+
+def test_min_max_mean():
+    histogram = Histogram()
+    for value in (2, 4, 9):
+        histogram.add(value)
+    assert (histogram.min, histogram.max, histogram.get_mean()) == (2, 9, 5)
+
+
+def test_empty_histogram():
+    histogram = Histogram()
+    assert histogram.get_mean() is None
+    assert histogram.get_percentile(50) is None
+
+
+def test_get_percentile_returns_bucket_bound():
+    histogram = Histogram(bounds=(1, 10, 100))
+    for value in [0.5] * 50 + [5] * 40 + [50] * 10:
+        histogram.add(value)
+    assert histogram.get_percentile(50) == 1
+    assert histogram.get_percentile(90) == 10
+    assert histogram.get_percentile(99) == 50  # Capped at the max value
+
+
+def test_get_percentile_overflow_bucket():
+    histogram = Histogram(bounds=(1,))
+    histogram.add(500)
+    assert histogram.get_percentile(50) == 500
+
+
+def test_to_dict():
+    histogram = Histogram(bounds=(1,))
+    histogram.add(0.5)
+    assert histogram.to_dict() == {
+        'bounds': [1], 'counts': [1, 0], 'count': 1, 'total': 0.5,
+        'min': 0.5, 'max': 0.5, 'p50': 0.5, 'p90': 0.5, 'p99': 0.5}
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+from twisted.internet.defer import Deferred
+
+from gridsync.limiter import Limiter, BACKGROUND, INTERACTIVE, NORMAL
+
+
+def test_limiter_runs_immediately_under_limit():
+    limiter = Limiter(2)
+    results = []
+    limiter.run(NORMAL, lambda: 'done').addCallback(results.append)
+    assert results == ['done']
+
+
+def test_limiter_queues_over_limit():
+    limiter = Limiter(1)
+    blocker = Deferred()
+    limiter.run(NORMAL, lambda: blocker)
+    results = []
+    limiter.run(NORMAL, lambda: 'second').addCallback(results.append)
+    assert (results, limiter.get_metrics()['queued']) == ([], 1)
+
+
+def test_limiter_runs_queued_after_release():
+    limiter = Limiter(1)
+    blocker = Deferred()
+    limiter.run(NORMAL, lambda: blocker)
+    results = []
+    limiter.run(NORMAL, lambda: 'second').addCallback(results.append)
+    blocker.callback(None)
+    assert results == ['second']
+
+
+def test_limiter_dispatches_by_priority():
+    limiter = Limiter(1)
+    blocker = Deferred()
+    limiter.run(NORMAL, lambda: blocker)
+    order = []
+    limiter.run(BACKGROUND, lambda: order.append('background'))
+    limiter.run(INTERACTIVE, lambda: order.append('interactive'))
+    blocker.callback(None)
+    assert order == ['interactive', 'background']
+
+
+def test_limiter_escalate_raises_priority_of_queued_waiter():
+    limiter = Limiter(1)
+    blocker = Deferred()
+    limiter.run(NORMAL, lambda: blocker)
+    order = []
+    limiter.run(NORMAL, lambda: order.append('normal'))
+    d = limiter.run(BACKGROUND, lambda: order.append('background'))
+    limiter.escalate(d, INTERACTIVE)
+    blocker.callback(None)
+    assert order == ['background', 'normal']
+
+
+def test_limiter_escalate_never_lowers_priority():
+    limiter = Limiter(1)
+    blocker = Deferred()
+    limiter.run(NORMAL, lambda: blocker)
+    order = []
+    d = limiter.run(INTERACTIVE, lambda: order.append('interactive'))
+    limiter.run(NORMAL, lambda: order.append('normal'))
+    limiter.escalate(d, BACKGROUND)
+    blocker.callback(None)
+    assert order == ['interactive', 'normal']
+
+
+def test_limiter_releases_slot_on_failure():
+    limiter = Limiter(1)
+    d = limiter.run(NORMAL, lambda: 1 / 0)
+    d.addErrback(lambda _: None)
+    assert limiter.active == 0
+
+
+def test_limiter_skips_cancelled_waiters():
+    limiter = Limiter(1)
+    blocker = Deferred()
+    limiter.run(NORMAL, lambda: blocker)
+    cancelled = limiter.run(NORMAL, lambda: 'cancelled')
+    cancelled.addErrback(lambda _: None)
+    cancelled.cancel()
+    blocker.callback(None)
+    assert limiter.active == 0
+
+
+def test_limiter_metrics_max_queue_depth():
+    limiter = Limiter(1)
+    blocker = Deferred()
+    limiter.run(NORMAL, lambda: blocker)
+    limiter.run(NORMAL, lambda: None)
+    limiter.run(NORMAL, lambda: None)
+    blocker.callback(None)
+    metrics = limiter.get_metrics()
+    assert (metrics['max_queue_depth'], metrics['completed']) == (2, 3)
@@ -0,0 +1,557 @@
+# -*- coding: utf-8 -*-
+
+import time
+
+try:
+    from unittest.mock import MagicMock
+except ImportError:
+    from mock import MagicMock
+
+import pytest
+from twisted.internet.defer import fail, maybeDeferred, succeed
+from twisted.internet.task import Clock
+
+from gridsync.catalog import Catalog
+from gridsync.monitor import Monitor
+
+
+@pytest.fixture()
+def monitor():
+    gateway = MagicMock()
+    gateway.is_magic_folder_paused = lambda _: False
+    gateway.is_magic_folder_running = lambda _: True
+    gateway.get_magic_folder_directory = lambda _: ''
+    return Monitor(gateway)
+
+
+def test_is_folder_active(monitor):
+    assert monitor.is_folder_active('TestFolder')
+
+
+def test_is_folder_active_false_when_paused(monitor):
+    monitor.gateway.is_magic_folder_paused = lambda _: True
+    assert not monitor.is_folder_active('TestFolder')
+
+
+def test_is_folder_active_queues_paused_status(monitor):
+    monitor.gateway.is_magic_folder_paused = lambda _: True
+    monitor.is_folder_active('TestFolder')
+    assert monitor.updates == {'TestFolder': {'status': 4}}
+    monitor.updates.clear()
+    monitor.is_folder_active('TestFolder')
+    assert monitor.updates == {}
+
+
+def test_is_folder_active_does_not_start_subclient(monitor):
+    monitor.gateway.is_magic_folder_running = lambda _: False
+    assert not monitor.is_folder_active('TestFolder')
+    assert not monitor.gateway.start_magic_folder_subclient.called
+    assert 'TestFolder' in monitor.suspended
+
+
+def test_on_local_change_starts_subclient(monitor):
+    monitor.gateway.is_magic_folder_running = lambda _: False
+    monitor.clock = Clock()
+    monitor.suspended.add('TestFolder')
+    monitor.on_local_change('TestFolder')
+    monitor.gateway.start_magic_folder_subclient.assert_called_once_with(
+        'TestFolder')
+
+
+@pytest.inlineCallbacks
+def test_check_suspended_folders_wakes_on_remote_change(monitor, tmpdir):
+    catalog = Catalog(str(tmpdir.join('catalog.sqlite')))
+    monitor.gateway.get_catalog = lambda: catalog
+    monitor.gateway.magic_folders = {'Changed': {}, 'Unchanged': {}}
+    monitor.gateway.is_magic_folder_running = lambda _: False
+    monitor.suspended.update(['Changed', 'Unchanged'])
+
+    def do_remote_scan(name):
+        if name == 'Changed':
+            catalog.update_member(name, 'Bob', {'file': (1, None, 1, 1)})
+    monitor.do_remote_scan = do_remote_scan
+    monitor.clock = Clock()
+    yield monitor.check_suspended_folders()
+    assert monitor.suspended == {'Unchanged'}
+    monitor.gateway.start_magic_folder_subclient.assert_called_once_with(
+        'Changed')
+
+
+def test_check_idle_suspends_folder(monitor):
+    monitor.status['TestFolder']['state'] = 2
+    monitor.last_activity['TestFolder'] = 0
+    monitor.check_idle('TestFolder', 60)
+    assert 'TestFolder' in monitor.suspended
+
+
+def test_check_idle_handles_suspend_errors(monitor):
+    monitor.gateway.stop_magic_folder_subclient = lambda _: fail(OSError())
+    monitor.status['TestFolder']['state'] = 2
+    monitor.last_activity['TestFolder'] = 0
+    monitor.check_idle('TestFolder', 60)  # Must not raise or leave a failure
+    assert 'TestFolder' in monitor.suspended
+
+
+def test_check_idle_no_timeout(monitor):
+    monitor.status['TestFolder']['state'] = 2
+    monitor.last_activity['TestFolder'] = 0
+    monitor.check_idle('TestFolder', 0)
+    assert 'TestFolder' not in monitor.suspended
+
+
+def test_on_local_change_wakes_suspended_folder(monitor):
+    monitor.suspended.add('TestFolder')
+    monitor.on_local_change('TestFolder')
+    assert 'TestFolder' not in monitor.suspended
+
+
+def test_check_responsiveness_emits_unresponsive(monitor):
+    monitor.gateway.name = 'TestGrid'
+    monitor.gateway.breaker.is_open = lambda: True
+    names = []
+    monitor.unresponsive.connect(names.append)
+    monitor.check_responsiveness()
+    monitor.check_responsiveness()
+    assert names == ['TestGrid']
+
+
+def test_check_responsiveness_emits_responsive_after_recovery(monitor):
+    monitor.gateway.name = 'TestGrid'
+    monitor.gateway.breaker.is_open = lambda: True
+    monitor.check_responsiveness()
+    monitor.gateway.breaker.is_open = lambda: False
+    names = []
+    monitor.responsive.connect(names.append)
+    monitor.check_responsiveness()
+    assert names == ['TestGrid']
+
+
+@pytest.inlineCallbacks
+def test_check_status_requests_all_folder_statuses_at_once(monitor):
+    monitor.gateway.magic_folders = {'Folder1': {}, 'Folder2': {}}
+    monitor.gateway.get_grid_status = lambda: None
+    monitor.gateway.shares_happy = 0
+    monitor.gateway.breaker.is_open = lambda: False
+    monitor.gateway.get_magic_folders_status = MagicMock(
+        return_value={'Folder1': ['status1'], 'Folder2': ['status2']})
+    monitor.process_magic_folder_status = MagicMock(return_value=False)
+    yield monitor.check_status()
+    monitor.gateway.get_magic_folders_status.assert_called_once_with(
+        ['Folder1', 'Folder2'])
+    monitor.process_magic_folder_status.assert_any_call(
+        'Folder1', ['status1'])
+    monitor.process_magic_folder_status.assert_any_call(
+        'Folder2', ['status2'])
+
+
+def test_update_catalog_queues_size_and_mtime(monitor, tmpdir):
+    catalog = Catalog(str(tmpdir.join('catalog.sqlite')))
+    monitor.gateway.get_catalog = lambda: catalog
+    files = {
+        'Alice': {'file1.txt': (1024, 'URI:CHK:aaa', 1500000000, 1)},
+        'Bob': {'file2.txt': (2048, 'URI:CHK:bbb', 1500000001, 1)}
+    }
+    monitor.update_catalog(
+        'TestFolder', [('Alice', 'URI:1'), ('Bob', 'URI:2')], files)
+    assert monitor.updates['TestFolder'] == {
+        'size': 3072, 'mtime': 1500000001}
+
+
+def test_update_catalog_removes_departed_members(monitor, tmpdir):
+    catalog = Catalog(str(tmpdir.join('catalog.sqlite')))
+    catalog.update_member('TestFolder', 'Bob', {'file': (1, None, 1, 1)})
+    monitor.gateway.get_catalog = lambda: catalog
+    monitor.update_catalog('TestFolder', [('Alice', 'URI:1')], {})
+    assert catalog.get_members('TestFolder') == []
+
+
+@pytest.fixture()
+def rootcap_monitor(monitor):
+    monitor.gateway.magic_folders = {'LocalFolder': {}}
+    monitor.gateway.get_json = MagicMock()
+    monitor.gateway.get_magic_folder_members = MagicMock(return_value=[])
+    monitor.do_remote_scan = MagicMock()
+    return monitor
+
+
+def set_rootcap(monitor, names):
+    folders = {name: {'collective': 'URI:' + name} for name in names}
+    monitor.gateway.get_magic_folders_from_rootcap = lambda: folders
+
+
+@pytest.inlineCallbacks
+def test_scan_rootcap_emits_new_remote_folders(rootcap_monitor):
+    set_rootcap(rootcap_monitor, ['LocalFolder', 'RemoteFolder'])
+    added = []
+    rootcap_monitor.remote_folder_added.connect(
+        lambda name, caps, overlay: added.append(name))
+    yield rootcap_monitor.scan_rootcap()
+    assert added == ['RemoteFolder']
+
+
+@pytest.inlineCallbacks
+def test_scan_rootcap_fetches_only_new_collectives(rootcap_monitor):
+    set_rootcap(rootcap_monitor, ['RemoteFolder'])
+    yield rootcap_monitor.scan_rootcap()
+    set_rootcap(rootcap_monitor, ['RemoteFolder', 'NewFolder'])
+    yield rootcap_monitor.scan_rootcap()
+    assert [c[0][0] for c in rootcap_monitor.gateway.get_json.call_args_list] \
+        == ['URI:RemoteFolder', 'URI:NewFolder']
+
+
+@pytest.inlineCallbacks
+def test_scan_rootcap_emits_removed_remote_folders(rootcap_monitor):
+    set_rootcap(rootcap_monitor, ['LocalFolder', 'RemoteFolder'])
+    yield rootcap_monitor.scan_rootcap()
+    removed = []
+    rootcap_monitor.remote_folder_removed.connect(removed.append)
+    set_rootcap(rootcap_monitor, [])
+    yield rootcap_monitor.scan_rootcap()
+    assert removed == ['RemoteFolder']
+
+
+@pytest.inlineCallbacks
+def test_scan_rootcap_ignores_failed_listing(rootcap_monitor):
+    set_rootcap(rootcap_monitor, ['RemoteFolder'])
+    yield rootcap_monitor.scan_rootcap()
+    rootcap_monitor.gateway.get_magic_folders_from_rootcap = lambda: None
+    removed = []
+    rootcap_monitor.remote_folder_removed.connect(removed.append)
+    yield rootcap_monitor.scan_rootcap()
+    assert removed == []
+
+
+def test_refresh_rootcap_skipped_while_disconnected(rootcap_monitor):
+    rootcap_monitor.scan_rootcap = MagicMock()
+    rootcap_monitor.is_connected = False
+    rootcap_monitor.refresh_rootcap()
+    assert not rootcap_monitor.scan_rootcap.called
+
+
+def test_refresh_rootcap_keeps_rootcap_timer_running_on_error(
+        rootcap_monitor):
+    rootcap_monitor.gateway.get_magic_folders_from_rootcap = lambda: {
+        'RemoteFolder': {}}  # No 'collective' entry; raises KeyError
+    rootcap_monitor.is_connected = True
+    clock = Clock()
+    rootcap_monitor.rootcap_timer.clock = clock
+    rootcap_monitor.rootcap_timer.start(60)
+    clock.advance(60)
+    assert rootcap_monitor.rootcap_timer.running
+    rootcap_monitor.rootcap_timer.stop()
+
+
+def task(path, status, kind='upload'):
+    return {'path': path, 'kind': kind, 'status': status}
+
+
+def test_diff_tasks_emits_event_for_each_status_change():
+    prev = Monitor.index_tasks([task('a', 'queued'), task('b', 'started')])
+    tasks = Monitor.index_tasks([
+        task('a', 'started'), task('b', 'success'), task('c', 'queued'),
+        task('c', 'failure', kind='download')])
+    _, events = Monitor.diff_tasks(prev, tasks)
+    assert sorted(events) == [
+        ('a', 'upload', 'started'),
+        ('b', 'upload', 'succeeded'),
+        ('c', 'download', 'failed'),
+        ('c', 'upload', 'queued')]
+
+
+def test_diff_tasks_ignores_unchanged_tasks():
+    status = [task('a', 'started'), task('b', 'queued')]
+    changed, events = Monitor.diff_tasks(
+        Monitor.index_tasks(status), Monitor.index_tasks(status))
+    assert (changed, events) == ([], [])
+
+
+def test_process_magic_folder_status_emits_file_events(monitor, qtbot):
+    monitor.process_magic_folder_status('TestFolder', [task('a', 'queued')])
+    with qtbot.wait_signal(monitor.file_events) as blocker:
+        monitor.process_magic_folder_status(
+            'TestFolder', [task('a', 'started')])
+    assert blocker.args == ['TestFolder', [('a', 'upload', 'started')]]
+
+
+def test_process_magic_folder_status_notifies_updated_files(monitor, qtbot):
+    monitor.process_magic_folder_status('TestFolder', [task('a', 'queued')])
+    monitor.process_magic_folder_status('TestFolder', [
+        task('a', 'started'), task('b', 'queued'), task('dir/', 'queued')])
+    monitor.process_magic_folder_status('TestFolder', [
+        task('a', 'success'), task('b', 'started'), task('dir/', 'success')])
+    with qtbot.wait_signal(monitor.files_updated) as blocker:
+        monitor.process_magic_folder_status('TestFolder', [
+            task('a', 'success'), task('b', 'success'),
+            task('dir/', 'success')])
+    assert blocker.args == ['TestFolder', ['a', 'b']]
+
+
+def test_process_magic_folder_status_reports_sync_between_checks(
+        monitor, qtbot):
+    monitor.process_magic_folder_status('TestFolder', [task('a', 'success')])
+    finished = []
+    monitor.sync_finished.connect(finished.append)
+    with qtbot.wait_signal(monitor.files_updated) as blocker:
+        scan_needed = monitor.process_magic_folder_status(
+            'TestFolder', [task('a', 'success'), task('b', 'success')])
+    assert blocker.args == ['TestFolder', ['b']]
+    assert finished == ['TestFolder']
+    assert scan_needed
+
+
+def test_process_magic_folder_status_no_scan_without_changes(monitor):
+    monitor.process_magic_folder_status('TestFolder', [task('a', 'success')])
+    monitor.process_magic_folder_status('TestFolder', [task('a', 'success')])
+    assert not monitor.process_magic_folder_status(
+        'TestFolder', [task('a', 'success')])
+
+
+def test_track_failures_emits_failures_updated(monitor, qtbot):
+    monitor.process_magic_folder_status('TestFolder', [task('a', 'started')])
+    with qtbot.wait_signal(monitor.failures_updated) as blocker:
+        monitor.process_magic_folder_status(
+            'TestFolder', [task('a', 'failure')])
+    assert blocker.args == ['TestFolder', 1]
+    assert 'a' in monitor.get_failure_tracker('TestFolder')
+
+
+def test_track_failures_counts_persisting_failure_once(monitor, qtbot):
+    monitor.process_magic_folder_status('TestFolder', [task('a', 'failure')])
+    with qtbot.assert_not_emitted(monitor.failures_updated):
+        monitor.process_magic_folder_status(
+            'TestFolder', [task('a', 'failure')])
+    failures = monitor.get_failure_tracker('TestFolder').get_failures()
+    assert failures['a']['count'] == 1
+
+
+def test_failed_poll_does_not_repeat_task_events(monitor, qtbot):
+    monitor.process_magic_folder_status('TestFolder', [task('a', 'failure')])
+    monitor.process_magic_folder_status('TestFolder', None)
+    with qtbot.assert_not_emitted(monitor.file_events):
+        monitor.process_magic_folder_status(
+            'TestFolder', [task('a', 'failure')])
+    failures = monitor.get_failure_tracker('TestFolder').get_failures()
+    assert failures['a']['count'] == 1
+
+
+def test_failed_poll_does_not_restart_sync(monitor):
+    signals = []
+    monitor.first_sync_started.connect(lambda _: signals.append('first'))
+    monitor.sync_started.connect(lambda _: signals.append('started'))
+    monitor.sync_finished.connect(lambda _: signals.append('finished'))
+    for status in ([task('z', 'success')], [task('a', 'queued')], None,
+                   [task('a', 'started')], [task('a', 'success')]):
+        monitor.process_magic_folder_status('TestFolder', status)
+    assert signals == ['started', 'finished']
+
+
+def test_track_failures_resolves_on_success(monitor, qtbot):
+    monitor.process_magic_folder_status('TestFolder', [task('a', 'failure')])
+    with qtbot.wait_signal(monitor.failures_updated) as blocker:
+        monitor.process_magic_folder_status(
+            'TestFolder', [task('a', 'success')])
+    assert blocker.args == ['TestFolder', 0]
+
+
+def test_track_failures_queues_failure_count(monitor):
+    monitor.process_magic_folder_status('TestFolder', [task('a', 'failure')])
+    assert monitor.updates['TestFolder']['failures'] == 1
+
+
+def test_track_conflicts_detects_conflicted_download(monitor, qtbot, tmpdir):
+    monitor.gateway.get_magic_folder_directory = lambda _: str(tmpdir)
+    tmpdir.join('a.conflict').write('theirs')
+    monitor.process_magic_folder_status(
+        'TestFolder', [task('a', 'started', 'download')])
+    with qtbot.wait_signal(monitor.conflicts_updated) as blocker:
+        monitor.process_magic_folder_status(
+            'TestFolder', [task('a', 'success', 'download')])
+    assert blocker.args == ['TestFolder', ['a']]
+
+
+def test_track_conflicts_resolves_removed_conflict(monitor, qtbot, tmpdir):
+    monitor.gateway.get_magic_folder_directory = lambda _: str(tmpdir)
+    tmpdir.join('a.conflict').write('theirs')
+    monitor.process_magic_folder_status(
+        'TestFolder', [task('a', 'success', 'download')])
+    tmpdir.join('a.conflict').remove()
+    with qtbot.wait_signal(monitor.conflicts_updated) as blocker:
+        monitor.process_magic_folder_status(
+            'TestFolder', [task('a', 'success', 'download')])
+    assert blocker.args == ['TestFolder', []]
+
+
+def test_get_remaining():
+    tasks = Monitor.index_tasks([
+        dict(task('a', 'queued'), size=1000),
+        dict(task('b', 'started'), size=1000, percent_done=25),
+        task('c', 'started'),
+        dict(task('d', 'success'), size=1000),
+        task('dir/', 'queued')])
+    assert Monitor.get_remaining(tasks) == (1750, 3)
+
+
+def test_update_eta_emits_eta_updated(monitor, qtbot):
+    now = time.time()
+    monitor.process_magic_folder_status('TestFolder', [
+        dict(task('a', 'started'), size=1000),
+        dict(task('b', 'queued'), size=3000)])
+    monitor.get_throughput_estimator('TestFolder').started = now - 10
+    with qtbot.wait_signal(monitor.eta_updated) as blocker:
+        monitor.process_magic_folder_status('TestFolder', [
+            dict(task('a', 'success'), size=1000, success_at=now),
+            dict(task('b', 'started'), size=3000)])
+    assert blocker.args[0] == 'TestFolder'
+    assert 25 <= blocker.args[1] <= 30
+
+
+def test_update_eta_none_when_up_to_date(monitor, qtbot):
+    monitor.etas['TestFolder'] = 60
+    with qtbot.wait_signal(monitor.eta_updated) as blocker:
+        monitor.process_magic_folder_status(
+            'TestFolder', [task('a', 'success')])
+    assert blocker.args == ['TestFolder', None]
+
+
+def test_get_eta_across_folders(monitor):
+    monitor.throughput.reset(now=time.time() - 10)
+    monitor.throughput.add(1000)
+    monitor.remaining = {'A': (2000, 1), 'B': (3000, 2)}
+    assert 45 <= monitor.get_eta() <= 50
+
+
+def test_tasks_updated_not_emitted_without_changes(monitor, qtbot):
+    status = [task('a', 'started')]
+    with qtbot.wait_signal(monitor.tasks_updated):
+        monitor.process_magic_folder_status('TestFolder', status)
+    with qtbot.assert_not_emitted(monitor.tasks_updated):
+        monitor.process_magic_folder_status('TestFolder', status)
+
+
+def test_record_latency(monitor):
+    monitor.process_magic_folder_status('TestFolder', [task('a', 'started')])
+    monitor.process_magic_folder_status('TestFolder', [
+        dict(task('a', 'success'), queued_at=100, started_at=102,
+             success_at=107)])
+    stats = monitor.get_latency_stats()['TestFolder']['upload']
+    assert stats['queue_wait']['count'] == 1
+    assert stats['queue_wait']['total'] == 2
+    assert stats['transfer']['total'] == 5
+
+
+def test_record_latency_skips_missing_timestamps(monitor):
+    monitor.process_magic_folder_status('TestFolder', [
+        dict(task('a', 'success'), success_at=107)])
+    assert monitor.get_latency_stats() == {}
+
+
+def test_check_grid_status_records_history(monitor):
+    monitor.gateway.get_grid_status = lambda: (2, 3, 1024)
+    monitor.gateway.server_states = {'v0-aaa': True}
+    monitor.gateway.shares_happy = 0
+    monitor.gateway.breaker.is_open = lambda: False
+    monitor.check_grid_status()
+    assert monitor.history.connected.get(60) == [2]
+    assert monitor.history.available_space.get(60) == [1024]
+    assert monitor.history.servers['v0-aaa'].get(60) == [1]
+
+
+def test_start_adds_monitor_to_scheduler(monitor, monkeypatch):
+    monkeypatch.setattr(monitor, 'get_rootcap_interval', lambda: 0)
+    scheduler = MagicMock()
+    monitor.start(scheduler=scheduler)
+    scheduler.add.assert_called_once_with(monitor)
+
+
+@pytest.fixture()
+def watching_monitor(monitor, tmpdir):
+    monitor.gateway.magic_folders = {'TestFolder': {}}
+    monitor.gateway.get_magic_folder_directory = lambda _: str(tmpdir)
+    monitor.gateway.get_magic_folder_status = MagicMock(
+        return_value=succeed([task('a', 'started')]))
+    monitor.clock = Clock()
+    monitor.watcher.run_in_thread = maybeDeferred
+    return monitor
+
+
+def test_is_folder_active_watches_folder(watching_monitor):
+    watching_monitor.is_folder_active('TestFolder')
+    assert watching_monitor.watcher.is_watching('TestFolder')
+
+
+def test_on_local_change_checks_folder_after_delay(watching_monitor):
+    watching_monitor.on_local_change('TestFolder')
+    assert not watching_monitor.gateway.get_magic_folder_status.called
+    watching_monitor.clock.advance(watching_monitor.check_delay)
+    watching_monitor.gateway.get_magic_folder_status.assert_called_once_with(
+        'TestFolder')
+    assert watching_monitor.status['TestFolder']['state'] == 1
+
+
+def test_on_local_change_debounces_checks(watching_monitor):
+    for _ in range(5):
+        watching_monitor.on_local_change('TestFolder')
+        watching_monitor.clock.advance(watching_monitor.check_delay / 2)
+    watching_monitor.clock.advance(watching_monitor.check_delay)
+    assert watching_monitor.gateway.get_magic_folder_status.call_count == 1
+
+
+def test_is_idle(watching_monitor):
+    watching_monitor.is_folder_active('TestFolder')
+    watching_monitor.status['TestFolder']['state'] = 2
+    watching_monitor.last_full_check = time.time()
+    assert watching_monitor.is_idle(['TestFolder'])
+
+
+def test_is_idle_false_while_syncing(watching_monitor):
+    watching_monitor.is_folder_active('TestFolder')
+    watching_monitor.status['TestFolder']['state'] = 1
+    watching_monitor.last_full_check = time.time()
+    assert not watching_monitor.is_idle(['TestFolder'])
+
+
+def test_is_idle_false_after_idle_poll_interval(watching_monitor):
+    watching_monitor.is_folder_active('TestFolder')
+    watching_monitor.status['TestFolder']['state'] = 2
+    watching_monitor.last_full_check = time.time() - 3600
+    assert not watching_monitor.is_idle(['TestFolder'])
+
+
+def test_is_idle_false_if_polling(watching_monitor):
+    watching_monitor.watcher.max_watches = 0
+    watching_monitor.is_folder_active('TestFolder')
+    watching_monitor.status['TestFolder']['state'] = 2
+    watching_monitor.last_full_check = time.time()
+    assert not watching_monitor.is_idle(['TestFolder'])
+    watching_monitor.watcher.remove_folder('TestFolder')
+
+
+def test_is_idle_false_if_not_watching(monitor):
+    monitor.status['TestFolder']['state'] = 2
+    monitor.last_full_check = time.time()
+    assert not monitor.is_idle(['TestFolder'])
+
+
+def test_check_status_emits_one_batch_of_updates(monitor, qtbot):
+    monitor.gateway.get_grid_status = lambda: None
+    monitor.gateway.shares_happy = 0
+    monitor.gateway.breaker.is_open = lambda: False
+    monitor.gateway.magic_folders = {'A': {}, 'B': {}}
+    monitor.gateway.get_magic_folders_status = lambda _: succeed({
+        'A': [task('a', 'started')], 'B': [task('b', 'success')]})
+    with qtbot.wait_signal(monitor.batch_updated) as blocker:
+        monitor.check_status()
+    assert blocker.args[0]['A']['status'] == 1
+    assert blocker.args[0]['B']['status'] == 2
+    assert monitor.updates == {}
+
+
+def test_queue_update_outside_check_flushes_later(monitor):
+    monitor.clock = Clock()
+    batches = []
+    monitor.batch_updated.connect(batches.append)
+    monitor.queue_update('A', 'size', 1)
+    monitor.queue_update('A', 'mtime', 2)
+    assert batches == []
+    monitor.clock.advance(0)
+    assert batches == [{'A': {'size': 1, 'mtime': 2}}]
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+try:
+    from unittest.mock import MagicMock
+except ImportError:
+    from mock import MagicMock
+
+import pytest
+from twisted.internet.defer import Deferred, succeed
+from twisted.internet.task import Clock
+
+from gridsync.scheduler import MonitorScheduler
+
+
+def fake_monitor(name):
+    monitor = MagicMock()
+    monitor.gateway.name = name
+    monitor.check_status = MagicMock(return_value=succeed(None))
+    return monitor
+
+
+@pytest.fixture()
+def clock():
+    return Clock()
+
+
+@pytest.fixture()
+def scheduler(clock):
+    return MonitorScheduler(interval=2, limit=2, clock=clock)
+
+
+def test_add_checks_monitor_immediately(scheduler):
+    monitor = fake_monitor('A')
+    scheduler.add(monitor)
+    assert monitor.check_status.call_count == 1
+
+
+def test_checks_are_staggered_across_interval(scheduler, clock):
+    monitors = [fake_monitor(name) for name in 'ABCD']
+    for monitor in monitors:
+        scheduler.add(monitor)
+    clock.advance(0.5)
+    assert [m.check_status.call_count for m in monitors] == [2, 1, 1, 1]
+    clock.advance(0.5)
+    assert [m.check_status.call_count for m in monitors] == [2, 2, 1, 1]
+    clock.pump([0.5, 0.5])
+    assert [m.check_status.call_count for m in monitors] == [2, 2, 2, 2]
+
+
+def test_each_monitor_checked_once_per_interval(scheduler, clock):
+    monitors = [fake_monitor(name) for name in 'ABC']
+    for monitor in monitors:
+        scheduler.add(monitor)
+    clock.pump([2 / 3.0] * 30)  # 10 intervals
+    assert [m.check_status.call_count for m in monitors] == [11, 11, 11]
+
+
+def test_concurrency_is_limited(scheduler):
+    monitors = [fake_monitor(name) for name in 'ABC']
+    pending = [Deferred() for _ in monitors]
+    for monitor, d in zip(monitors, pending):
+        monitor.check_status.return_value = d
+        scheduler.add(monitor)
+    assert [m.check_status.call_count for m in monitors] == [1, 1, 0]
+    pending[0].callback(None)
+    assert monitors[2].check_status.call_count == 1
+
+
+def test_slow_monitor_is_skipped(scheduler, clock):
+    monitor = fake_monitor('A')
+    monitor.check_status.return_value = Deferred()
+    scheduler.add(monitor)
+    clock.advance(2)
+    assert monitor.check_status.call_count == 1
+    assert scheduler.skipped == 1
+
+
+def test_failed_check_does_not_stop_scheduling(scheduler, clock):
+    monitor = fake_monitor('A')
+    monitor.check_status.side_effect = Exception("Boom")
+    scheduler.add(monitor)
+    clock.advance(2)
+    assert monitor.check_status.call_count == 2
+
+
+def test_remove(scheduler, clock):
+    monitor = fake_monitor('A')
+    scheduler.add(monitor)
+    scheduler.remove(monitor)
+    clock.advance(10)
+    assert monitor.check_status.call_count == 1
+    assert scheduler.timer is None
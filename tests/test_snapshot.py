@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+from gridsync.snapshot import Snapshot
+
+
+STATE = {
+    'folders': {
+        'TestFolder': {
+            'status': 2,
+            'size': 1024,
+            'mtime': 1500000000,
+            'members': ['Alice', 'Bob']
+        }
+    },
+    'available_space': 2048,
+    'num_connected': 3,
+    'num_happy': 2
+}
+
+
+def test_snapshot_save_and_load(tmpdir):
+    snapshot = Snapshot(str(tmpdir.join('snapshot.json')))
+    snapshot.save(STATE)
+    assert Snapshot(snapshot.path).load() == STATE
+
+
+def test_snapshot_save_leaves_no_temporary_file(tmpdir):
+    snapshot = Snapshot(str(tmpdir.join('snapshot.json')))
+    snapshot.save(STATE)
+    assert os.listdir(str(tmpdir)) == ['snapshot.json']
+
+
+def test_snapshot_load_missing_file(tmpdir):
+    assert Snapshot(str(tmpdir.join('snapshot.json'))).load() == {}
+
+
+def test_snapshot_load_corrupt_file(tmpdir):
+    path = tmpdir.join('snapshot.json')
+    path.write('{"folders": ')
+    assert Snapshot(str(path)).load() == {}
+
+
+def test_snapshot_save_error_is_not_raised(tmpdir):
+    snapshot = Snapshot(str(tmpdir.join('missing', 'snapshot.json')))
+    snapshot.save(STATE)
+    assert snapshot.load() == {}
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+import json
 import os
 try:
     from unittest.mock import MagicMock
@@ -7,12 +8,14 @@ except ImportError:
     from mock import MagicMock
 
 import pytest
-from twisted.internet.defer import returnValue
+from twisted.internet.defer import Deferred, fail, returnValue, succeed
 
+from gridsync.breaker import CircuitBreaker
 from gridsync.errors import NodedirExistsError
+from gridsync.limiter import Limiter, BACKGROUND, INTERACTIVE
 from gridsync.tahoe import (
     is_valid_furl, get_nodedirs, TahoeError, TahoeCommandError, TahoeWebError,
-    Tahoe)
+    TahoeUnresponsiveError, Tahoe)
 
 
 def fake_get(*args, **kwargs):
@@ -248,6 +251,25 @@ def test_tahoe_stop_linux_monkeypatch(tahoe, monkeypatch):
     assert output == ['stop']
 
 
+@pytest.inlineCallbacks
+def test_stop_magic_folder_subclients_skips_unstarted(tmpdir, monkeypatch):
+    client = Tahoe(str(tmpdir.mkdir('skip_unstarted')))
+    for name in ('Started', 'Unstarted'):
+        nodedir = os.path.join(client.magic_folders_dir, name)
+        os.makedirs(nodedir)
+        with open(os.path.join(nodedir, 'tahoe.cfg'), 'w') as f:
+            f.write('[node]\n')
+    with open(os.path.join(
+            client.magic_folders_dir, 'Started', 'twistd.pid'), 'w') as f:
+        f.write('4194305')
+    stopped = []
+    monkeypatch.setattr(
+        'gridsync.tahoe.Tahoe.stop',
+        lambda self: succeed(stopped.append(os.path.basename(self.nodedir))))
+    yield client._stop_magic_folder_subclients()
+    assert stopped == ['Started']
+
+
 def test_parse_welcome_page(tahoe):  # tahoe-lafs=<1.12.1
     html = '''
         Connected to <span>3</span>of <span>10</span> known storage servers
@@ -294,10 +316,65 @@ def test_get_grid_status(tahoe, monkeypatch):
             }
         ]
     }'''
+    monkeypatch.setattr('gridsync.decoder.ijson', None)
     monkeypatch.setattr('treq.get', fake_get)
     monkeypatch.setattr('treq.content', lambda _: json_content)
     num_connected, num_known, available_space = yield tahoe.get_grid_status()
     assert (num_connected, num_known, available_space) == (2, 3, 3072)
+    assert tahoe.server_states == {
+        'v0-aaaaaaaaaaaaaaaaaaaaaaaa': False,
+        'v0-bbbbbbbbbbbbbbbbbbbbbbbb': True,
+        'v0-cccccccccccccccccccccccc': True}
+
+
+@pytest.inlineCallbacks
+def test_get_grid_status_returns_none_on_timeout(tahoe, monkeypatch):
+    monkeypatch.setattr(tahoe, 'breaker', CircuitBreaker(tahoe.name))
+    monkeypatch.setattr('treq.get', lambda *args, **kwargs: Deferred())
+    monkeypatch.setattr(tahoe, 'request_timeout', 0.01)
+    output = yield tahoe.get_grid_status()
+    assert output is None
+
+
+@pytest.inlineCallbacks
+def test_request_timeout_raises_tahoe_unresponsive_error(tahoe, monkeypatch):
+    monkeypatch.setattr(tahoe, 'breaker', CircuitBreaker(tahoe.name))
+    monkeypatch.setattr('treq.get', lambda *args, **kwargs: Deferred())
+    monkeypatch.setattr(tahoe, 'request_timeout', 0.01)
+    with pytest.raises(TahoeUnresponsiveError):
+        yield tahoe._request('get', 'http://example.invalid/')
+
+
+@pytest.inlineCallbacks
+def test_request_opens_circuit_after_repeated_timeouts(tahoe, monkeypatch):
+    monkeypatch.setattr(tahoe, 'breaker', CircuitBreaker(tahoe.name))
+    monkeypatch.setattr('treq.get', lambda *args, **kwargs: Deferred())
+    monkeypatch.setattr(tahoe, 'request_timeout', 0.01)
+    for _ in range(tahoe.breaker.threshold):
+        yield tahoe.get_grid_status()
+    assert tahoe.breaker.is_open()
+
+
+@pytest.inlineCallbacks
+def test_request_fails_fast_while_circuit_open(tahoe, monkeypatch):
+    monkeypatch.setattr(tahoe, 'breaker', CircuitBreaker(tahoe.name))
+    fake_treq_get = MagicMock()
+    monkeypatch.setattr('treq.get', fake_treq_get)
+    tahoe.breaker.record_failure()
+    tahoe.breaker.record_failure()
+    tahoe.breaker.record_failure()
+    with pytest.raises(TahoeUnresponsiveError):
+        yield tahoe._request('get', 'http://example.invalid/')
+    assert not fake_treq_get.called
+
+
+@pytest.inlineCallbacks
+def test_read_timeout_raises_tahoe_unresponsive_error(tahoe, monkeypatch):
+    monkeypatch.setattr(tahoe, 'breaker', CircuitBreaker(tahoe.name))
+    monkeypatch.setattr('treq.content', lambda _: Deferred())
+    monkeypatch.setattr(tahoe, 'request_timeout', 0.01)
+    with pytest.raises(TahoeUnresponsiveError):
+        yield tahoe._read(MagicMock())
 
 
 @pytest.inlineCallbacks
@@ -456,7 +533,8 @@ def test_tahoe_get_magic_folder_client_none(tahoe):
 
 @pytest.inlineCallbacks
 def test_tahoe_magic_folder_invite(tahoe, monkeypatch):
-    monkeypatch.setattr('gridsync.tahoe.Tahoe.command', lambda x, y: 'code123')
+    monkeypatch.setattr(
+        'gridsync.tahoe.Tahoe.command', lambda x, y, priority: 'code123')
     output = yield tahoe.magic_folder_invite('Test Folder', 'Bob')
     assert output == 'code123'
 
@@ -464,7 +542,7 @@ def test_tahoe_magic_folder_invite(tahoe, monkeypatch):
 @pytest.inlineCallbacks
 def test_tahoe_magic_folder_invite_from_subclient(tahoe, monkeypatch):
     subclient = MagicMock()
-    subclient.command = lambda _: 'code123'
+    subclient.command = lambda _, priority: 'code123'
     tahoe.magic_folders['TestInviteFolder'] = {'client': subclient}
     output = yield tahoe.magic_folder_invite('TestInviteFolder', 'Bob')
     assert output == 'code123'
@@ -485,3 +563,625 @@ def test_tahoe_magic_folder_uninvite_from_subclient(tahoe, monkeypatch):
     monkeypatch.setattr('gridsync.tahoe.Tahoe.get_alias', lambda x, y: 'test')
     yield tahoe.magic_folder_uninvite('TestUninviteFolder', 'Bob')
     assert True
+
+
+@pytest.inlineCallbacks
+def test_tahoe_link_many_sets_children_in_one_request(tahoe, monkeypatch):
+    requests = []
+
+    def fake_set_children(url, body, **kwargs):
+        requests.append((url, json.loads(body.decode('utf-8'))))
+        return fake_post()
+    monkeypatch.setattr('treq.post', fake_set_children)
+    yield tahoe.link_many('URI:DIR2:abc:def', {
+        'Test (collective)': 'URI:DIR2-RO:ghi:jkl',
+        'Test (personal)': 'URI:DIR2:mno:pqr'
+    })
+    assert len(requests) == 1
+    assert requests[0][0].endswith('?t=set_children')
+    assert requests[0][1] == {
+        'Test (collective)': ['dirnode', {'ro_uri': 'URI:DIR2-RO:ghi:jkl'}],
+        'Test (personal)': ['dirnode', {'rw_uri': 'URI:DIR2:mno:pqr'}]
+    }
+
+
+@pytest.inlineCallbacks
+def test_tahoe_link_many_fail_code_500(tahoe, monkeypatch):
+    monkeypatch.setattr('treq.post', fake_post_code_500)
+    monkeypatch.setattr('treq.content', lambda _: b'test content')
+    with pytest.raises(TahoeWebError):
+        yield tahoe.link_many('test_dircap', {'test_childname': 'URI:DIR2:a'})
+
+
+@pytest.fixture()
+def batch_tahoe(tmpdir, monkeypatch):
+    client = Tahoe(str(tmpdir.mkdir('batch')), executable='tahoe_exe')
+    calls = []
+
+    def fake_command(_, args, callback_trigger=None, priority=None):
+        calls.append(args)
+    monkeypatch.setattr('gridsync.tahoe.Tahoe.command', fake_command)
+    monkeypatch.setattr(
+        'gridsync.tahoe.Tahoe.stop', lambda _: calls.append('stop'))
+    monkeypatch.setattr(
+        'gridsync.tahoe.Tahoe.start', lambda _: calls.append('start'))
+    monkeypatch.setattr('gridsync.tahoe.Tahoe.get_rootcap', lambda _: 'root')
+    monkeypatch.setattr(
+        'gridsync.tahoe.Tahoe.get_rootcap_shards', lambda _: succeed({}))
+    monkeypatch.setattr(
+        'gridsync.tahoe.Tahoe.get_alias', lambda _, name: name + '_c')
+    monkeypatch.setattr(
+        'gridsync.tahoe.Tahoe.get_magic_folder_dircap',
+        lambda _, name: name + '_p')
+    monkeypatch.setattr(
+        'gridsync.tahoe.Tahoe.link_many',
+        lambda _, dircap, children: calls.append(('link_many', children)))
+    return client, calls
+
+
+@pytest.inlineCallbacks
+def test_create_magic_folders_restarts_once(batch_tahoe, tmpdir):
+    client, calls = batch_tahoe
+    paths = [str(tmpdir.join('One')), str(tmpdir.join('Two'))]
+    yield client.create_magic_folders(paths)
+    assert (calls.count('stop'), calls.count('start')) == (1, 1)
+
+
+@pytest.inlineCallbacks
+def test_create_magic_folders_links_in_one_batch(batch_tahoe, tmpdir):
+    client, calls = batch_tahoe
+    paths = [str(tmpdir.join('One')), str(tmpdir.join('Two'))]
+    yield client.create_magic_folders(paths)
+    assert calls[-1] == ('link_many', {
+        'One (collective)': 'One_c',
+        'One (personal)': 'One_p',
+        'Two (collective)': 'Two_c',
+        'Two (personal)': 'Two_p'
+    })
+
+
+def test_create_magic_folder_subclient_registers_nodedir(tmpdir, monkeypatch):
+    client = Tahoe(str(tmpdir.mkdir('subclient')), executable='tahoe_exe')
+    monkeypatch.setattr('gridsync.tahoe.Tahoe.config_get', lambda *_: None)
+    monkeypatch.setattr(
+        'gridsync.tahoe.Tahoe.create_client', lambda *_, **__: Deferred())
+    client._create_magic_folder_subclient(str(tmpdir.join('One')))
+    assert client._get_paused_marker('One') == os.path.join(
+        client.magic_folders_dir, 'One', 'paused')
+
+
+@pytest.inlineCallbacks
+def test_create_magic_folders_links_subclients_that_succeeded(
+        batch_tahoe, tmpdir, monkeypatch):
+    client, calls = batch_tahoe
+
+    def fake_command(_, args, callback_trigger=None, priority=None):
+        raise TahoeCommandError('"--name" option not recognized')
+
+    def fake_create_subclient(_, path, join_code=None):
+        if path.endswith('Two'):
+            return fail(TahoeCommandError('test'))
+        subclient = MagicMock(nodedir=path)
+        subclient.get_alias.return_value = 'URI:DIR2-RO:c'
+        subclient.get_magic_folder_dircap.return_value = 'URI:DIR2:p'
+        return succeed(subclient)
+    monkeypatch.setattr('gridsync.tahoe.Tahoe.command', fake_command)
+    monkeypatch.setattr(
+        'gridsync.tahoe.Tahoe._create_magic_folder_subclient',
+        fake_create_subclient)
+    yield client.create_magic_folders(
+        [str(tmpdir.join('One')), str(tmpdir.join('Two'))])
+    assert calls[-1] == ('link_many', {
+        'One (collective)': 'URI:DIR2-RO:c',
+        'One (personal)': 'URI:DIR2:p'
+    })
+
+
+@pytest.inlineCallbacks
+def test_join_magic_folders_restarts_once(batch_tahoe, tmpdir):
+    client, calls = batch_tahoe
+    yield client.join_magic_folders({
+        str(tmpdir.join('One')): 'URI:DIR2-RO:a+URI:DIR2:b',
+        str(tmpdir.join('Two')): 'URI:DIR2-RO:c+URI:DIR2:d'
+    })
+    joins = [c for c in calls if c[:2] == ['magic-folder', 'join']]
+    assert (len(joins), calls.count('stop'), calls.count('start')) == (2, 1, 1)
+
+
+@pytest.inlineCallbacks
+def test_supports_multiple_magic_folders(tmpdir, monkeypatch):
+    client = Tahoe(str(tmpdir.mkdir('multi')), executable='tahoe_exe')
+    monkeypatch.setattr(
+        'gridsync.tahoe.Tahoe.command',
+        lambda _, args: '-n, --name=  The name of this magic-folder')
+    supported = yield client.supports_multiple_magic_folders()
+    assert supported is True
+
+
+@pytest.inlineCallbacks
+def test_supports_multiple_magic_folders_false(tmpdir, monkeypatch):
+    client = Tahoe(str(tmpdir.mkdir('single')), executable='tahoe_exe')
+    monkeypatch.setattr(
+        'gridsync.tahoe.Tahoe.command', lambda _, args: 'Usage: tahoe ...')
+    supported = yield client.supports_multiple_magic_folders()
+    assert supported is False
+
+
+@pytest.fixture()
+def migration_tahoe(tmpdir, monkeypatch):
+    client = Tahoe(str(tmpdir.mkdir('gateway')), executable='tahoe_exe')
+    os.mkdir(os.path.join(client.nodedir, 'private'))
+    with open(os.path.join(client.nodedir, 'tahoe.cfg'), 'w') as f:
+        f.write('[node]\nnickname = gateway\n')
+    subclient_private = os.path.join(
+        client.magic_folders_dir, 'Photos', 'private')
+    os.makedirs(subclient_private)
+    with open(os.path.join(subclient_private, '..', 'tahoe.cfg'), 'w') as f:
+        f.write('[magic_folder]\nlocal.directory = /Photos\n')
+    for filename, content in (('collective_dircap', 'URI:DIR2-RO:c'),
+                              ('magic_folder_dircap', 'URI:DIR2:u'),
+                              ('aliases', 'magic: URI:DIR2:admin'),
+                              ('magicfolderdb.sqlite', 'db')):
+        with open(os.path.join(subclient_private, filename), 'w') as f:
+            f.write(content)
+    monkeypatch.setattr('gridsync.tahoe.Tahoe.command', lambda _, args: '')
+    monkeypatch.setattr('gridsync.tahoe.Tahoe.stop', lambda _: None)
+    monkeypatch.setattr('gridsync.tahoe.Tahoe.start', lambda _: None)
+    monkeypatch.setattr(
+        'gridsync.tahoe.Tahoe._stop_magic_folder_subclients', lambda _: None)
+    client.load_magic_folders()
+    return client
+
+
+@pytest.inlineCallbacks
+def test_migrate_magic_folder_subclients_writes_yaml(migration_tahoe):
+    yield migration_tahoe.migrate_magic_folder_subclients()
+    migration_tahoe.magic_folders.clear()
+    migration_tahoe.load_magic_folders()
+    assert migration_tahoe.magic_folders['Photos'] == {
+        'directory': '/Photos',
+        'collective_dircap': 'URI:DIR2-RO:c',
+        'upload_dircap': 'URI:DIR2:u',
+        'poll_interval': 60
+    }
+
+
+@pytest.inlineCallbacks
+def test_migrate_magic_folder_subclients_keeps_poll_interval_as_int(
+        migration_tahoe):
+    subclient_cfg = os.path.join(
+        migration_tahoe.magic_folders_dir, 'Photos', 'tahoe.cfg')
+    with open(subclient_cfg, 'a') as f:
+        f.write('poll_interval = 5\n')
+    yield migration_tahoe.migrate_magic_folder_subclients()
+    migration_tahoe.magic_folders.clear()
+    migration_tahoe.load_magic_folders()
+    assert migration_tahoe.magic_folders['Photos']['poll_interval'] == 5
+
+
+@pytest.inlineCallbacks
+def test_migrate_magic_folder_subclients_moves_db(migration_tahoe):
+    yield migration_tahoe.migrate_magic_folder_subclients()
+    assert os.path.isfile(os.path.join(
+        migration_tahoe.nodedir, 'private', 'magicfolder_Photos.sqlite'))
+
+
+@pytest.inlineCallbacks
+def test_migrate_magic_folder_subclients_adds_alias(migration_tahoe):
+    yield migration_tahoe.migrate_magic_folder_subclients()
+    assert migration_tahoe.get_alias('Photos') == 'URI:DIR2:admin'
+
+
+@pytest.inlineCallbacks
+def test_migrate_magic_folder_subclients_removes_nodedir(migration_tahoe):
+    yield migration_tahoe.migrate_magic_folder_subclients()
+    assert not os.path.exists(
+        os.path.join(migration_tahoe.magic_folders_dir, 'Photos'))
+
+
+@pytest.inlineCallbacks
+def test_migrate_magic_folder_subclients_skips_incomplete_subclient(
+        migration_tahoe):
+    nodedir = os.path.join(migration_tahoe.magic_folders_dir, 'Unfinished')
+    os.makedirs(nodedir)
+    with open(os.path.join(nodedir, 'tahoe.cfg'), 'w') as f:
+        f.write('[magic_folder]\nlocal.directory = /Unfinished\n')
+    migration_tahoe.load_magic_folders()
+    migrated = yield migration_tahoe.migrate_magic_folder_subclients()
+    assert migrated == ['Photos']
+    assert os.path.isdir(nodedir)
+    migration_tahoe.magic_folders.clear()
+    migration_tahoe.load_magic_folders()
+    assert migration_tahoe.magic_folders['Unfinished']['nodedir'] == nodedir
+
+
+@pytest.fixture()
+def subclient_tahoe(tmpdir):
+    client = Tahoe(str(tmpdir.mkdir('pausing')), executable='tahoe_exe')
+    nodedir = os.path.join(client.magic_folders_dir, 'Archive')
+    os.makedirs(nodedir)
+    with open(os.path.join(nodedir, 'tahoe.cfg'), 'w') as f:
+        f.write('[magic_folder]\nlocal.directory = /Archive\n')
+    client.load_magic_folders()
+    return client
+
+
+def test_load_magic_folders_subclient_not_started(subclient_tahoe):
+    assert not subclient_tahoe.is_magic_folder_running('Archive')
+
+
+@pytest.inlineCallbacks
+def test_start_magic_folder_subclient(subclient_tahoe, monkeypatch):
+    def fake_start(client):
+        client.nodeurl = 'http://127.0.0.1:65537/'
+    monkeypatch.setattr('gridsync.tahoe.Tahoe.start', fake_start)
+    yield subclient_tahoe.start_magic_folder_subclient('Archive')
+    assert subclient_tahoe.is_magic_folder_running('Archive')
+
+
+@pytest.inlineCallbacks
+def test_pause_magic_folder(subclient_tahoe, monkeypatch):
+    monkeypatch.setattr('gridsync.tahoe.Tahoe.stop', lambda _: None)
+    subclient_tahoe.get_magic_folder_client('Archive').nodeurl = 'test_url'
+    yield subclient_tahoe.pause_magic_folder('Archive')
+    assert subclient_tahoe.is_magic_folder_paused('Archive')
+    assert not subclient_tahoe.is_magic_folder_running('Archive')
+
+
+@pytest.inlineCallbacks
+def test_resume_magic_folder(subclient_tahoe, monkeypatch):
+    monkeypatch.setattr('gridsync.tahoe.Tahoe.stop', lambda _: None)
+    yield subclient_tahoe.pause_magic_folder('Archive')
+    subclient_tahoe.resume_magic_folder('Archive')
+    assert not subclient_tahoe.is_magic_folder_paused('Archive')
+
+
+def test_is_magic_folder_paused_false_for_native_folder(tahoe):
+    assert not tahoe.is_magic_folder_paused('test_folder')
+
+
+def test_get_json_coalesces_concurrent_requests(tahoe, monkeypatch):
+    monkeypatch.setattr(tahoe, 'in_flight', {})
+    response = Deferred()
+    fake_treq_get = MagicMock(return_value=response)
+    monkeypatch.setattr('treq.get', fake_treq_get)
+    monkeypatch.setattr('treq.content', lambda _: b'{"test": 1}')
+    monkeypatch.setattr(tahoe, 'coalesced_requests', 0)
+    results = []
+    tahoe.get_json('URI:DIR2:abc').addCallback(results.append)
+    tahoe.get_json('URI:DIR2:abc').addCallback(results.append)
+    response.callback(fake_get())
+    assert fake_treq_get.call_count == 1
+    assert results == [{'test': 1}, {'test': 1}]
+    assert tahoe.coalesced_requests == 1
+
+
+def test_get_json_does_not_coalesce_different_caps(tahoe, monkeypatch):
+    monkeypatch.setattr(tahoe, 'in_flight', {})
+    fake_treq_get = MagicMock(return_value=Deferred())
+    monkeypatch.setattr('treq.get', fake_treq_get)
+    tahoe.get_json('URI:DIR2:abc')
+    tahoe.get_json('URI:DIR2:def')
+    assert fake_treq_get.call_count == 2
+
+
+def test_single_flight_propagates_failure_to_all_callers(tahoe):
+    response = Deferred()
+    failures = []
+    tahoe._single_flight('test', lambda: response).addErrback(failures.append)
+    tahoe._single_flight('test', lambda: response).addErrback(failures.append)
+    response.errback(TahoeWebError('test'))
+    assert len(failures) == 2
+    assert 'test' not in tahoe.in_flight
+
+
+def test_single_flight_allows_new_request_after_completion(tahoe):
+    calls = []
+    tahoe._single_flight('test', lambda: calls.append(1))
+    tahoe._single_flight('test', lambda: calls.append(1))
+    assert calls == [1, 1]
+
+
+def test_request_limiter_dispatches_interactive_requests_first(
+        tahoe, monkeypatch):
+    monkeypatch.setattr(tahoe, 'request_limiter', Limiter(1))
+    monkeypatch.setattr(tahoe, 'breaker', CircuitBreaker(tahoe.name))
+    pending = Deferred()
+    urls = []
+
+    def fake_treq_request(url, *args, **kwargs):
+        urls.append(url)
+        return pending if len(urls) == 1 else fake_get()
+    monkeypatch.setattr('treq.get', fake_treq_request)
+    monkeypatch.setattr('treq.post', fake_treq_request)
+    tahoe._request('get', 'first')
+    tahoe._request('get', 'scan', priority=BACKGROUND)
+    tahoe._request('get', 'status')
+    tahoe._request('post', 'link', priority=INTERACTIVE)
+    pending.callback(fake_get())
+    assert urls == ['first', 'link', 'status', 'scan']
+
+
+def test_get_json_escalates_queued_request_for_interactive_caller(
+        tahoe, monkeypatch):
+    monkeypatch.setattr(tahoe, 'request_limiter', Limiter(1))
+    monkeypatch.setattr(tahoe, 'breaker', CircuitBreaker(tahoe.name))
+    monkeypatch.setattr(tahoe, 'in_flight', {})
+    monkeypatch.setattr(tahoe, 'nodeurl', 'http://example.invalid/')
+    pending = Deferred()
+    urls = []
+
+    def fake_treq_get(url, *args, **kwargs):
+        urls.append(url)
+        return pending if len(urls) == 1 else Deferred()
+    monkeypatch.setattr('treq.get', fake_treq_get)
+    tahoe._request('get', 'first')
+    tahoe._request('get', 'status')
+    tahoe.get_json('URI:DIR2:abc')
+    tahoe.get_json('URI:DIR2:abc', INTERACTIVE)
+    pending.callback(fake_get())
+    assert urls[1] == 'http://example.invalid/uri/URI:DIR2:abc/?t=json'
+
+
+def test_tahoe_link_uses_interactive_priority(tahoe, monkeypatch):
+    fake_request = MagicMock(return_value=fake_post())
+    monkeypatch.setattr(tahoe, '_request', fake_request)
+    tahoe.link('test_dircap', 'test_childname', 'test_childcap')
+    assert fake_request.call_args[1]['priority'] == INTERACTIVE
+
+
+@pytest.inlineCallbacks
+def test_get_magic_folders_status(tahoe, monkeypatch):
+    monkeypatch.setattr(
+        'gridsync.tahoe.Tahoe.get_magic_folder_status',
+        lambda _, name: succeed([{'path': name}]))
+    output = yield tahoe.get_magic_folders_status(['Folder1', 'Folder2'])
+    assert output == {
+        'Folder1': [{'path': 'Folder1'}], 'Folder2': [{'path': 'Folder2'}]}
+
+
+@pytest.inlineCallbacks
+def test_get_magic_folders_status_isolates_failing_folder(tahoe, monkeypatch):
+    def fake_get_magic_folder_status(_, name):
+        if name == 'Folder1':
+            raise TahoeWebError('test')
+        return succeed([{'path': name}])
+    monkeypatch.setattr(
+        'gridsync.tahoe.Tahoe.get_magic_folder_status',
+        fake_get_magic_folder_status)
+    output = yield tahoe.get_magic_folders_status(['Folder1', 'Folder2'])
+    assert output == {'Folder1': None, 'Folder2': [{'path': 'Folder2'}]}
+
+
+def test_request_uses_persistent_connection_pool(tahoe, monkeypatch):
+    fake_treq_get = MagicMock(return_value=fake_get())
+    monkeypatch.setattr('treq.get', fake_treq_get)
+    monkeypatch.setattr(tahoe, 'breaker', CircuitBreaker(tahoe.name))
+    tahoe._request('get', 'http://example.invalid/')
+    assert fake_treq_get.call_args[1]['pool'] is tahoe.pool
+    assert tahoe.pool.persistent
+
+
+@pytest.inlineCallbacks
+def test_get_magic_folder_info_aggregates_member_summaries(tahoe, monkeypatch):
+    summaries = {
+        'URI:DIR2-RO:aaa': ({'file1': 1}, 1, 1500000000),
+        'URI:DIR2-RO:bbb': ({'file2': 2}, 2, 1500000001)
+    }
+    monkeypatch.setattr(
+        'gridsync.tahoe.Tahoe.get_listing_summary',
+        lambda _, cap: succeed(summaries[cap]))
+    members = [('Alice', 'URI:DIR2-RO:aaa'), ('Bob', 'URI:DIR2-RO:bbb')]
+    output = yield tahoe.get_magic_folder_info('TestFolder', members)
+    assert output == (members, 3, 1500000001, {
+        'Alice': {'file1': 1}, 'Bob': {'file2': 2}})
+
+
+@pytest.inlineCallbacks
+def test_get_grid_status_streaming(tahoe, monkeypatch):
+    pytest.importorskip('ijson')
+    body = json.dumps({'servers': [
+        {'connection_status': 'Connected to ...', 'available_space': 1024},
+        {'connection_status': 'Trying to connect', 'available_space': 2048}
+    ]}).encode('utf-8')
+
+    def fake_collect(_, collector):
+        for i in range(0, len(body), 8):
+            collector(body[i:i + 8])
+    monkeypatch.setattr('treq.get', fake_get)
+    monkeypatch.setattr('treq.collect', fake_collect)
+    monkeypatch.setattr(tahoe, 'breaker', CircuitBreaker(tahoe.name))
+    output = yield tahoe.get_grid_status()
+    assert output == (1, 2, 1024)
+
+
+def test_get_webport_default(tahoe, monkeypatch):
+    monkeypatch.setattr('gridsync.tahoe.app_settings', {'tahoe': {}})
+    assert tahoe.get_webport() == 'tcp:0:interface=127.0.0.1'
+
+
+def test_get_webport_unix(tahoe, monkeypatch):
+    monkeypatch.setattr('sys.platform', 'linux')
+    assert tahoe.get_webport('unix') == 'unix:{}:mode=600'.format(
+        os.path.join(tahoe.nodedir, 'private', 'web.sock'))
+
+
+def test_get_webport_unix_falls_back_to_tcp_on_windows(tahoe, monkeypatch):
+    monkeypatch.setattr('sys.platform', 'win32')
+    assert tahoe.get_webport('unix') == 'tcp:0:interface=127.0.0.1'
+
+
+@pytest.mark.parametrize('platform,limit', [('linux', 108), ('darwin', 104)])
+def test_get_webport_unix_falls_back_to_tcp_if_path_too_long(
+        tmpdir, monkeypatch, platform, limit):
+    monkeypatch.setattr('sys.platform', platform)
+    suffix = os.sep + os.path.join('private', 'web.sock')
+    padding = limit - 1 - len(str(tmpdir) + os.sep + suffix)  # Leave a NUL
+    nodedir = os.path.join(str(tmpdir), 'x' * padding)
+    assert Tahoe(nodedir).get_webport('unix').startswith('unix:')
+    assert Tahoe(nodedir + 'x').get_webport('unix') == \
+        'tcp:0:interface=127.0.0.1'
+
+
+def test_get_webport_from_settings(tahoe, monkeypatch):
+    monkeypatch.setattr('sys.platform', 'linux')
+    monkeypatch.setattr(
+        'gridsync.tahoe.app_settings', {'tahoe': {'webport': 'unix'}})
+    assert tahoe.get_webport().startswith('unix:')
+
+
+@pytest.inlineCallbacks
+def test_tahoe_create_client_args_webport(tahoe, monkeypatch):
+    monkeypatch.setattr('os.path.exists', lambda x: False)
+    monkeypatch.setattr('sys.platform', 'linux')
+
+    def return_args(_, args):
+        returnValue(args)
+    monkeypatch.setattr('gridsync.tahoe.Tahoe.command', return_args)
+    args = yield tahoe.create_client(webport='unix')
+    assert '--webport={}'.format(tahoe.get_webport('unix')) in args
+    assert 'unix' not in args
+
+
+@pytest.inlineCallbacks
+def test_request_over_unix_socket_webport(tmpdir, monkeypatch):
+    from twisted.internet import reactor
+    from twisted.web.resource import Resource
+    from twisted.web.server import Site
+
+    class Welcome(Resource):
+        isLeaf = True
+
+        def render_GET(self, request):
+            return b'{"servers": []}'
+    path = str(tmpdir.join('web.sock'))
+    port = reactor.listenUNIX(path, Site(Welcome()))
+    client = Tahoe(str(tmpdir.join('nodedir')))
+    os.makedirs(client.nodedir)
+    client.config_set('node', 'web.port', 'unix:{}:mode=600'.format(path))
+    client.load_nodeurl()
+    try:
+        resp = yield client._request('get', client.nodeurl + '?t=json')
+        content = yield client._read(resp)
+    finally:
+        yield client.pool.closeCachedConnections()
+        yield port.stopListening()
+    assert content == b'{"servers": []}'
+
+
+def test_load_nodeurl_tcp(tahoe):
+    with open(os.path.join(tahoe.nodedir, 'node.url'), 'w') as f:
+        f.write('http://127.0.0.1:65536/\n')
+    tahoe.load_nodeurl()
+    assert (tahoe.nodeurl, tahoe.agent) == ('http://127.0.0.1:65536/', None)
+
+
+class FakeGrid(object):
+    # Just enough of the web API to link, unlink and list directories
+    def __init__(self, tahoe, monkeypatch):
+        self.dirs = {'URI:DIR2:root': {}}
+        self.counter = 0
+        monkeypatch.setattr(tahoe, 'rootcap', 'URI:DIR2:root')
+        monkeypatch.setattr(tahoe, 'rootcap_shards', None)
+        monkeypatch.setattr(tahoe, 'in_flight', {})
+        monkeypatch.setattr(tahoe, 'mkdir', self.mkdir)
+        monkeypatch.setattr(tahoe, 'link_many', self.link_many)
+        monkeypatch.setattr(tahoe, 'unlink', self.unlink)
+        monkeypatch.setattr(tahoe, '_get_json', self.get_json)
+
+    def mkdir(self):
+        self.counter += 1
+        cap = 'URI:DIR2:{}'.format(self.counter)
+        self.dirs[cap] = {}
+        return succeed(cap)
+
+    def link_many(self, dircap, children):
+        self.dirs[dircap].update(children)
+        return succeed(None)
+
+    def unlink(self, dircap, childname):
+        del self.dirs[dircap][childname]
+        return succeed(None)
+
+    def get_json(self, cap, priority=None):
+        children = {}
+        for name, childcap in self.dirs[cap].items():
+            children[name] = ['dirnode', {'rw_uri': childcap}]
+        return succeed(['dirnode', {'children': children}])
+
+
+def test_get_shard_name():
+    assert Tahoe.get_shard_name('TestFolder') == Tahoe.get_shard_name(
+        'TestFolder')
+    assert Tahoe.get_shard_name('TestFolder').endswith(' (shard)')
+    assert len(Tahoe.get_shard_name('TestFolder')) == len('0 (shard)')
+
+
+@pytest.inlineCallbacks
+def test_link_to_rootcap_flat(tahoe, monkeypatch):
+    grid = FakeGrid(tahoe, monkeypatch)
+    yield tahoe.link_to_rootcap({'A (collective)': 'URI:DIR2:a'})
+    assert grid.dirs['URI:DIR2:root'] == {'A (collective)': 'URI:DIR2:a'}
+
+
+@pytest.inlineCallbacks
+def test_link_to_rootcap_raises_if_layout_unknown(tahoe, monkeypatch):
+    grid = FakeGrid(tahoe, monkeypatch)
+    yield tahoe._create_rootcap_shards()
+    monkeypatch.setattr(tahoe, 'rootcap_shards', None)
+    monkeypatch.setattr(tahoe, '_get_json', lambda *_, **__: succeed(None))
+    with pytest.raises(TahoeWebError):
+        yield tahoe.link_to_rootcap({'A (collective)': 'URI:DIR2:a'})
+    assert 'A (collective)' not in grid.dirs['URI:DIR2:root']
+
+
+@pytest.inlineCallbacks
+def test_link_to_rootcap_sharded(tahoe, monkeypatch):
+    grid = FakeGrid(tahoe, monkeypatch)
+    shards = yield tahoe._create_rootcap_shards()
+    yield tahoe.link_to_rootcap({
+        'A (collective)': 'URI:DIR2:a', 'A (personal)': 'URI:DIR2:b'})
+    shard = grid.dirs[shards[Tahoe.get_shard_name('A')]]
+    assert shard == {
+        'A (collective)': 'URI:DIR2:a', 'A (personal)': 'URI:DIR2:b'}
+    assert sorted(grid.dirs['URI:DIR2:root']) == sorted(shards)
+
+
+@pytest.inlineCallbacks
+def test_get_magic_folders_from_sharded_rootcap(tahoe, monkeypatch):
+    FakeGrid(tahoe, monkeypatch)
+    yield tahoe._create_rootcap_shards()
+    yield tahoe.link_to_rootcap({
+        'A (collective)': 'URI:DIR2:a', 'B (collective)': 'URI:DIR2:b'})
+    folders = yield tahoe.get_magic_folders_from_rootcap()
+    assert folders == {
+        'A': {'collective': 'URI:DIR2:a'}, 'B': {'collective': 'URI:DIR2:b'}}
+
+
+@pytest.inlineCallbacks
+def test_shard_rootcap_migrates_flat_rootcap(tahoe, monkeypatch):
+    grid = FakeGrid(tahoe, monkeypatch)
+    grid.dirs['URI:DIR2:root'] = {
+        'settings.json': 'URI:CHK:settings',
+        'A (collective)': 'URI:DIR2:a',
+        'A (personal)': 'URI:DIR2:b',
+        'B (collective)': 'URI:DIR2:c'
+    }
+    before = yield tahoe.get_magic_folders_from_rootcap()
+    yield tahoe.shard_rootcap()
+    root = grid.dirs['URI:DIR2:root']
+    assert 'settings.json' in root
+    assert 'A (collective)' not in root
+    assert len([name for name in root if name.endswith(' (shard)')]) == 16
+    monkeypatch.setattr(tahoe, 'in_flight', {})
+    after = yield tahoe.get_magic_folders_from_rootcap()
+    assert after == before
+
+
+@pytest.inlineCallbacks
+def test_shard_rootcap_skips_sharded_rootcap(tahoe, monkeypatch):
+    grid = FakeGrid(tahoe, monkeypatch)
+    yield tahoe._create_rootcap_shards()
+    monkeypatch.setattr(tahoe, 'rootcap_shards', None)
+    yield tahoe.shard_rootcap()
+    assert len(grid.dirs) == 17
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from gridsync.throughput import ThroughputEstimator
+
+
+@pytest.fixture()
+def estimator():
+    estimator = ThroughputEstimator(window=60)
+    estimator.reset(now=1000)
+    return estimator
+
+
+def test_get_rates_no_samples(estimator):
+    assert estimator.get_rates(now=1010) == (0, 0)
+
+
+def test_get_rates_since_started(estimator):
+    estimator.add(1000, now=1005)
+    estimator.add(3000, now=1010)
+    assert estimator.get_rates(now=1010) == (400, 0.2)
+
+
+def test_get_rates_over_window(estimator):
+    estimator.add(6000, now=1100)
+    assert estimator.get_rates(now=1100) == (100, 1 / 60.0)
+
+
+def test_old_samples_are_pruned(estimator):
+    estimator.add(6000, now=1010)
+    assert estimator.get_rates(now=1100) == (0, 0)
+
+
+def test_add_ignores_transfers_completed_before_window(estimator):
+    estimator.add(6000, completed_at=900, now=1010)
+    assert not estimator.samples
+
+
+def test_get_eta_by_size(estimator):
+    estimator.add(1000, now=1010)
+    assert estimator.get_eta(5000, 3, now=1010) == 50
+
+
+def test_get_eta_by_files_when_sizes_unknown(estimator):
+    estimator.add(None, now=1010)
+    estimator.add(None, now=1010)
+    assert estimator.get_eta(0, 10, now=1010) == 50
+
+
+def test_get_eta_nothing_remaining(estimator):
+    estimator.add(1000, now=1010)
+    assert estimator.get_eta(0, 0, now=1010) is None
+
+
+def test_get_eta_no_rate(estimator):
+    assert estimator.get_eta(1000, 1, now=1010) is None
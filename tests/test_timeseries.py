@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+import math
+
+from gridsync.timeseries import GridHistory, RingBuffer, TimeSeries
+
+
+def values(series):
+    return [None if math.isnan(v) else v for v in series]
+
+
+def test_ring_buffer_values_before_full():
+    buf = RingBuffer(3)
+    buf.append(1)
+    buf.append(2)
+    assert buf.values() == [1, 2]
+
+
+def test_ring_buffer_overwrites_oldest_values():
+    buf = RingBuffer(3)
+    for value in range(5):
+        buf.append(value)
+    assert buf.values() == [2, 3, 4]
+
+
+def test_ring_buffer_restore():
+    buf = RingBuffer(3)
+    for value in range(4):
+        buf.append(value)
+    restored = RingBuffer(3)
+    restored.restore(buf.to_dict())
+    assert restored.values() == [1, 2, 3]
+
+
+def test_time_series_averages_each_interval():
+    series = TimeSeries(resolutions=((10, 5),))
+    for now, value in ((0, 1), (5, 3), (10, 4), (15, 6), (20, 8)):
+        series.add(value, now)
+    assert series.get(10) == [2, 5, 8]
+
+
+def test_time_series_records_gaps_as_nan():
+    series = TimeSeries(resolutions=((10, 5),))
+    series.add(1, 0)
+    series.add(2, 30)
+    assert values(series.get(10)) == [1, None, None, 2]
+
+
+def test_time_series_long_gap_is_bounded():
+    series = TimeSeries(resolutions=((10, 5),))
+    series.add(1, 0)
+    series.add(2, 1000000)
+    assert values(series.get(10)) == [None, None, None, None, None, 2]
+
+
+def test_time_series_multiple_resolutions():
+    series = TimeSeries(resolutions=((10, 5), (100, 5)))
+    for now in range(0, 200, 10):
+        series.add(now, now)
+    assert series.get(100) == [45, 145]
+    assert series.get(10) == [140, 150, 160, 170, 180, 190]
+
+
+def test_time_series_restore():
+    series = TimeSeries(resolutions=((10, 5),))
+    series.add(1, 0)
+    series.add(3, 10)
+    restored = TimeSeries(resolutions=((10, 5),))
+    restored.restore(series.to_dict())
+    restored.add(5, 15)
+    assert restored.get(10) == [1, 4]
+
+
+def test_grid_history_records_server_states():
+    history = GridHistory(resolutions=((10, 5),))
+    history.add(1, 100, {'v0-aaa': True, 'v0-bbb': False}, 0)
+    history.add(2, 200, {'v0-aaa': True, 'v0-bbb': True}, 5)
+    assert history.connected.get(10) == [1.5]
+    assert history.available_space.get(10) == [150]
+    assert history.servers['v0-aaa'].get(10) == [1]
+    assert history.servers['v0-bbb'].get(10) == [0.5]
+
+
+def test_grid_history_limits_number_of_servers(monkeypatch):
+    monkeypatch.setattr('gridsync.timeseries.MAX_SERVERS', 1)
+    history = GridHistory(resolutions=((10, 5),))
+    history.add(2, 0, {'v0-aaa': True, 'v0-bbb': True}, 0)
+    assert len(history.servers) == 1
+
+
+def test_grid_history_restore():
+    history = GridHistory(resolutions=((10, 5),))
+    history.add(1, 100, {'v0-aaa': True}, 0)
+    restored = GridHistory(resolutions=((10, 5),))
+    assert restored.restore(history.to_dict()) is True
+    assert restored.servers['v0-aaa'].get(10) == [1]
+
+
+def test_grid_history_restore_resolutions_separately():
+    history = GridHistory(resolutions=((10, 5), (100, 5)))
+    history.add(1, 100, {'v0-aaa': True}, 0)
+    history.add(1, 100, {'v0-aaa': True}, 10)
+    restored = GridHistory(resolutions=((10, 5), (100, 5)))
+    for step in (10, 100):
+        assert restored.restore(history.to_dict([step])) is True
+    assert restored.servers['v0-aaa'].get(10) == [1, 1]
+    assert restored.servers['v0-aaa'].get(100) == [1]
+
+
+def test_grid_history_restore_invalid_state():
+    history = GridHistory(resolutions=((10, 5),))
+    assert history.restore({'connected': {'10': {'buffer': {}}}}) is False
+    assert history.connected.get(10) == []
+
+
+def test_grid_history_restore_empty_state():
+    assert GridHistory().restore({}) is True
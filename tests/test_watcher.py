@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+
+import weakref
+
+import pytest
+from twisted.internet.defer import maybeDeferred
+
+from gridsync.watcher import Watcher
+
+
+def make_watcher(**kwargs):
+    # Lists and polls trees synchronously instead of in a thread
+    watcher = Watcher(**kwargs)
+    watcher.run_in_thread = maybeDeferred
+    return watcher
+
+
+def test_watcher_add_folder(tmpdir):
+    watcher = make_watcher()
+    watcher.add_folder('TestFolder', str(tmpdir))
+    assert watcher.is_watching('TestFolder')
+
+
+@pytest.inlineCallbacks
+def test_watcher_add_folder_lists_tree_in_thread(tmpdir):
+    tmpdir.join('file.txt').write('test')
+    watcher = Watcher()
+    d = watcher.add_folder('TestFolder', str(tmpdir))
+    assert not watcher.is_watching('TestFolder')
+    yield d
+    assert watcher.is_watching('TestFolder')
+
+
+def test_watcher_add_folder_missing_path(tmpdir):
+    watcher = make_watcher()
+    watcher.add_folder('TestFolder', str(tmpdir.join('non-existent')))
+    assert not watcher.is_watching('TestFolder')
+
+
+def test_watcher_add_folder_missing_path_warns_once(tmpdir, caplog):
+    watcher = make_watcher()
+    for _ in range(3):
+        watcher.add_folder('TestFolder', str(tmpdir.join('non-existent')))
+    warnings = [r for r in caplog.records if r.levelname == 'WARNING']
+    assert len(warnings) == 1
+
+
+def test_watcher_add_folder_warns_again_after_path_reappears(tmpdir, caplog):
+    watcher = make_watcher()
+    path = tmpdir.join('removable')
+    watcher.add_folder('TestFolder', str(path))
+    path.mkdir()
+    watcher.add_folder('TestFolder', str(path))
+    watcher.remove_folder('TestFolder')
+    path.remove()
+    watcher.add_folder('TestFolder', str(path))
+    warnings = [r for r in caplog.records if r.levelname == 'WARNING']
+    assert len(warnings) == 2
+
+
+def test_watchers_share_max_watches(tmpdir, monkeypatch):
+    monkeypatch.setattr('gridsync.watcher.MAX_WATCHES', 3)
+    monkeypatch.setattr('gridsync.watcher._watchers', weakref.WeakSet())
+    tmpdir.mkdir('one').mkdir('subdir')
+    tmpdir.mkdir('two').mkdir('subdir')
+    watcher1 = make_watcher()
+    watcher2 = make_watcher()
+    watcher1.add_folder('One', str(tmpdir.join('one')))
+    watcher2.add_folder('Two', str(tmpdir.join('two')))
+    assert not watcher1.is_polling('One')
+    assert watcher2.is_polling('Two')
+    watcher2.remove_folder('Two')
+
+
+def test_watcher_remove_folder(tmpdir):
+    watcher = make_watcher()
+    watcher.add_folder('TestFolder', str(tmpdir))
+    watcher.remove_folder('TestFolder')
+    assert not watcher.is_watching('TestFolder')
+
+
+@pytest.inlineCallbacks
+def test_watcher_remove_folder_while_listing_tree(tmpdir):
+    watcher = Watcher()
+    d = watcher.add_folder('TestFolder', str(tmpdir))
+    watcher.remove_folder('TestFolder')
+    yield d
+    assert not watcher.is_watching('TestFolder')
+    assert watcher.folders == {}
+
+
+def test_watcher_emits_folder_changed(tmpdir):
+    watcher = make_watcher()
+    watcher.add_folder('TestFolder', str(tmpdir))
+    changed = []
+    watcher.folder_changed.connect(changed.append)
+    watcher.on_directory_changed(str(tmpdir))
+    assert changed == ['TestFolder']
+
+
+def test_watcher_watches_subdirectories(tmpdir):
+    tmpdir.mkdir('subdir').mkdir('subsubdir')
+    watcher = make_watcher()
+    watcher.add_folder('TestFolder', str(tmpdir))
+    assert str(tmpdir.join('subdir', 'subsubdir')) in watcher.folders
+
+
+def test_watcher_watches_files(tmpdir):
+    tmpdir.join('file.txt').write('test')
+    watcher = make_watcher()
+    watcher.add_folder('TestFolder', str(tmpdir))
+    changed = []
+    watcher.folder_changed.connect(changed.append)
+    watcher.on_file_changed(str(tmpdir.join('file.txt')))
+    assert changed == ['TestFolder']
+
+
+def test_watcher_forgets_removed_files(tmpdir):
+    tmpdir.join('file.txt').write('test')
+    watcher = make_watcher()
+    watcher.add_folder('TestFolder', str(tmpdir))
+    tmpdir.join('file.txt').remove()
+    watcher.on_file_changed(str(tmpdir.join('file.txt')))
+    assert str(tmpdir.join('file.txt')) not in watcher.folders
+
+
+def test_watcher_watches_new_subdirectories(tmpdir):
+    watcher = make_watcher()
+    watcher.add_folder('TestFolder', str(tmpdir))
+    tmpdir.mkdir('subdir').mkdir('subsubdir')
+    tmpdir.join('subdir', 'file.txt').write('test')
+    watcher.on_directory_changed(str(tmpdir))
+    assert watcher.folders[str(tmpdir.join('subdir', 'subsubdir'))] == \
+        'TestFolder'
+    assert watcher.folders[str(tmpdir.join('subdir', 'file.txt'))] == \
+        'TestFolder'
+
+
+def test_watcher_polls_tree_that_outgrows_max_watches(tmpdir):
+    watcher = make_watcher(max_watches=2)
+    watcher.add_folder('TestFolder', str(tmpdir))
+    tmpdir.join('file1.txt').write('test')
+    tmpdir.join('file2.txt').write('test')
+    watcher.on_directory_changed(str(tmpdir))
+    assert watcher.is_polling('TestFolder')
+    assert watcher.folders == {}
+
+
+def test_watcher_polls_trees_with_too_many_entries(tmpdir):
+    tmpdir.mkdir('subdir1')
+    tmpdir.mkdir('subdir2')
+    watcher = make_watcher(max_watches=2)
+    watcher.add_folder('TestFolder', str(tmpdir))
+    assert watcher.is_polling('TestFolder')
+    assert watcher.folders == {}
+    assert watcher.poll_timer.isActive()
+
+
+def test_watcher_poll_emits_folder_changed(tmpdir):
+    watcher = make_watcher(max_watches=0)
+    watcher.add_folder('TestFolder', str(tmpdir))
+    changed = []
+    watcher.folder_changed.connect(changed.append)
+    watcher.poll()
+    assert changed == []
+    tmpdir.join('file.txt').write('test')
+    watcher.poll()
+    assert changed == ['TestFolder']
+
+
+@pytest.inlineCallbacks
+def test_watcher_poll_in_thread(tmpdir):
+    watcher = Watcher(max_watches=0)
+    yield watcher.add_folder('TestFolder', str(tmpdir))
+    changed = []
+    watcher.folder_changed.connect(changed.append)
+    tmpdir.join('file.txt').write('test')
+    yield watcher.poll()
+    assert changed == ['TestFolder']
+    watcher.remove_folder('TestFolder')
+
+
+def test_watcher_remove_polled_folder(tmpdir):
+    watcher = make_watcher(max_watches=0)
+    watcher.add_folder('TestFolder', str(tmpdir))
+    watcher.remove_folder('TestFolder')
+    assert not watcher.is_watching('TestFolder')
+    assert not watcher.poll_timer.isActive()